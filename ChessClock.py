@@ -1,92 +1,66 @@
 import pygame
-import time
 
-class ChessClock:
-    def __init__(self, initial_time_seconds=600, increment_seconds=0):
+import chess_clock
+
+class ChessClock(chess_clock.ChessClock):
+    """
+    Ancienne interface de l'horloge (white_time, is_running, pause...), adossée à l'horloge
+    unifiée de chess_clock: même décompte monotone et même chute du drapeau à l'échéance
+    """
+    def __init__(self, initial_time_seconds=600, increment_seconds=0, scheduler=None):
         """
         Initialise une horloge d'échecs
         
         Args:
             initial_time_seconds: Temps initial en secondes (10 minutes par défaut)
             increment_seconds: Incrément de temps en secondes après chaque coup (0 par défaut)
+            scheduler: TimerQueue ou boucle asyncio qui déclenche la chute du drapeau
         """
-        self.white_time = initial_time_seconds
-        self.black_time = initial_time_seconds
-        self.increment = increment_seconds
-        self.active_color = None  # Aucune horloge active au départ
-        self.last_update = 0
-        self.is_running = False
-        self.game_over = False
-        self.timeout_color = None
+        super().__init__(initial_time_seconds, increment_seconds, scheduler)
+
+    @property
+    def white_time(self):
+        return self.time_left['w']
+
+    @white_time.setter
+    def white_time(self, value):
+        self.time_left['w'] = value
+
+    @property
+    def black_time(self):
+        return self.time_left['b']
+
+    @black_time.setter
+    def black_time(self, value):
+        self.time_left['b'] = value
 
-    def start(self, starting_color='w'):
-        """Démarre l'horloge pour la couleur spécifiée"""
-        self.active_color = starting_color
-        self.last_update = time.time()
-        self.is_running = True
+    @property
+    def is_running(self):
+        return self.running
+
+    @is_running.setter
+    def is_running(self, value):
+        self.running = value
 
     def stop(self):
         """Arrête l'horloge"""
         self.update()
-        self.is_running = False
+        super().stop()
         self.active_color = None
 
     def pause(self):
         """Met en pause l'horloge sans changer le tour"""
         self.update()
-        self.is_running = False
+        super().stop()
 
     def resume(self):
         """Reprend l'horloge pour le joueur actuel"""
-        if self.active_color:
-            self.last_update = time.time()
-            self.is_running = True
-
-    def switch(self):
-        """Change le tour et ajoute l'incrément au joueur qui vient de jouer"""
-        if not self.is_running or self.game_over:
-            return
-
-        self.update()
-        
-        # Ajouter l'incrément au joueur qui vient de jouer
-        if self.active_color == 'w':
-            self.white_time += self.increment
-        else:
-            self.black_time += self.increment
-        
-        # Changer le tour
-        self.active_color = 'b' if self.active_color == 'w' else 'w'
-        self.last_update = time.time()
-
-    def update(self):
-        """Met à jour le temps restant pour le joueur actif"""
-        if not self.is_running or not self.active_color or self.game_over:
-            return
-
-        current_time = time.time()
-        elapsed = current_time - self.last_update
-        self.last_update = current_time
-
-        # Soustraire le temps écoulé
-        if self.active_color == 'w':
-            self.white_time -= elapsed
-            if self.white_time <= 0:
-                self.white_time = 0
-                self.game_over = True
-                self.timeout_color = 'w'
-                self.is_running = False
-        else:
-            self.black_time -= elapsed
-            if self.black_time <= 0:
-                self.black_time = 0
-                self.game_over = True
-                self.timeout_color = 'b'
-                self.is_running = False
+        if self.active_color and not self.game_over:
+            self.start(self.active_color)
 
     def get_time_str(self, color):
         """Retourne le temps restant formaté pour la couleur spécifiée"""
-        seconds = self.white_time if color == 'w' else self.black_time
+        seconds = self.remaining(color)
         
         minutes = int(seconds // 60)
         seconds = int(seconds % 60)
@@ -100,8 +74,7 @@ class ChessClock:
 
     def draw(self, window, font, width, height):
         """Dessine les horloges sur l'écran"""
-        # Mise à jour du temps
-        self.update()
+        # Lecture seule: la chute du drapeau est détectée par l'échéance programmée
         
         # Fond des horloges
         clock_height = 60
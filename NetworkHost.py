@@ -198,7 +198,7 @@ def process_data(self, data):
                 self.game.clock.timeout_color = data['clock']['timeout_color']
                 
                 # Mettre à jour l'horloge locale
-                self.game.clock.last_update = time.time()
+                self.game.clock.last_update = time.monotonic()
             
             # Mettre à jour l'état de démarrage du jeu
             if 'game_started' in data:
@@ -0,0 +1,161 @@
+# assets.py
+# Pack d'images des pièces: les PNG de images/ sont décodés et redimensionnés une seule fois,
+# puis enregistrés en pixels RGBA bruts dans un fichier relu d'un bloc aux démarrages suivants.
+# Les pièces d'une taille forment un atlas: une seule bande dont chaque image est une sous-surface.
+import collections
+import os
+import struct
+import zlib
+
+PIECES = ('wp', 'wR', 'wN', 'wB', 'wQ', 'wK', 'bp', 'bR', 'bN', 'bB', 'bQ', 'bK')
+IMAGE_DIR = 'images'
+PACK_VERSION = 1
+# Taille de case de l'atlas de référence, d'où sont tirées les tailles sans pack (fenêtre
+# redimensionnée): celle des PNG sources, gardés sans perte
+ATLAS_SIZE = 80
+MAX_CACHED_SIZES = 4  # Tailles gardées en mémoire par PieceAtlas
+
+_MAGIC = b'CHPK'
+# Magie, version, taille d'une case, masque des pièces présentes, signature des PNG sources
+_HEADER = struct.Struct('<4sHHHI')
+
+
+def source_path(piece, image_dir=IMAGE_DIR):
+    """Chemin du PNG d'une pièce (les fichiers sont nommés 'wP', 'bK'...)"""
+    return os.path.join(image_dir, f"{piece[0]}{piece[1].upper()}.png")
+
+
+def pack_path(size, image_dir=IMAGE_DIR):
+    """Chemin du pack pour une taille de case"""
+    return os.path.join(image_dir, f"pieces-{size}.pack")
+
+
+def source_signature(image_dir=IMAGE_DIR):
+    """Signature des PNG sources (nom, taille, date): le pack est régénéré si elle change"""
+    signature = 0
+    for piece in PIECES:
+        try:
+            stat = os.stat(source_path(piece, image_dir))
+        except OSError:
+            continue
+        signature = zlib.crc32(f"{piece}:{stat.st_size}:{stat.st_mtime_ns}".encode(), signature)
+    return signature
+
+
+def _split(strip, size, mask):
+    """Découpe la bande de pièces en un dictionnaire code -> surface (None si l'image manque)"""
+    return {piece: strip.subsurface((index * size, 0, size, size)) if mask & (1 << index) else None
+            for index, piece in enumerate(PIECES)}
+
+
+def build_pack(size, image_dir=IMAGE_DIR):
+    """Décode et redimensionne les PNG, écrit le pack et renvoie les images"""
+    return _split(*build_strip(size, image_dir))
+
+
+def build_strip(size, image_dir=IMAGE_DIR):
+    """Décode et redimensionne les PNG, écrit le pack et renvoie (bande, taille, masque des pièces présentes)"""
+    import pygame
+    strip = pygame.Surface((size * len(PIECES), size), pygame.SRCALPHA)
+    mask = 0
+    for index, piece in enumerate(PIECES):
+        try:
+            image = pygame.image.load(source_path(piece, image_dir))
+        except (pygame.error, OSError):
+            print(f"Impossible de charger l'image pour {piece}. Utilisation d'une représentation simple.")
+            continue
+        strip.blit(pygame.transform.scale(image, (size, size)), (index * size, 0))
+        mask |= 1 << index
+
+    header = _HEADER.pack(_MAGIC, PACK_VERSION, size, mask, source_signature(image_dir))
+    path = pack_path(size, image_dir)
+    try:
+        with open(path + '.tmp', 'wb') as pack_file:
+            pack_file.write(header)
+            pack_file.write(pygame.image.tostring(strip, 'RGBA'))
+        os.replace(path + '.tmp', path)
+    except OSError as e:
+        print(f"Impossible d'écrire le pack d'images {path}: {e}")
+
+    if pygame.display.get_surface() is not None:
+        strip = strip.convert_alpha()
+    return strip, size, mask
+
+
+def load_pack(size, image_dir=IMAGE_DIR):
+    """Relit le pack s'il existe et correspond aux sources, sinon renvoie None"""
+    strip = load_strip(size, image_dir)
+    return _split(*strip) if strip else None
+
+
+def load_strip(size, image_dir=IMAGE_DIR):
+    """Relit la bande du pack s'il existe et correspond aux sources: (bande, taille, masque) ou None"""
+    try:
+        with open(pack_path(size, image_dir), 'rb') as pack_file:
+            data = pack_file.read()
+    except OSError:
+        return None
+    if len(data) != _HEADER.size + size * size * len(PIECES) * 4:
+        return None
+    magic, version, pack_size, mask, signature = _HEADER.unpack_from(data)
+    if (magic, version, pack_size) != (_MAGIC, PACK_VERSION, size) or signature != source_signature(image_dir):
+        return None
+
+    import pygame
+    strip = pygame.image.frombuffer(memoryview(data)[_HEADER.size:], (size * len(PIECES), size), 'RGBA')
+    # Copie au format de l'écran (ou simple copie sans fenêtre) pour ne plus dépendre du tampon lu
+    strip = strip.convert_alpha() if pygame.display.get_surface() is not None else strip.copy()
+    return strip, size, mask
+
+
+def load_piece_images(size, image_dir=IMAGE_DIR):
+    """Renvoie les images des pièces à la taille d'une case, en générant le pack au premier lancement"""
+    images = load_pack(size, image_dir)
+    if images is None:
+        images = build_pack(size, image_dir)
+    return images
+
+
+class PieceAtlas:
+    """
+    Images des pièces à toutes les tailles de case, pour une fenêtre redimensionnable
+
+    Une taille qui a son pack (la taille de départ) est lue directement. Les autres sont
+    tirées une seule fois de l'atlas de référence (ATLAS_SIZE), pièce par pièce, puis gardées
+    en cache: l'affichage reste une simple copie de surface à toute taille.
+    """
+    def __init__(self, image_dir=IMAGE_DIR, max_sizes=MAX_CACHED_SIZES):
+        self.image_dir = image_dir
+        self.max_sizes = max_sizes
+        self.reference = None  # (bande, taille, masque) de l'atlas de référence, lu au premier besoin
+        self.sizes = collections.OrderedDict()  # Taille de case -> images, de la plus ancienne à la plus récente
+
+    def images(self, size):
+        """Images des pièces à la taille de case demandée"""
+        images = self.sizes.get(size)
+        if images is not None:
+            self.sizes.move_to_end(size)
+            return images
+        images = load_pack(size, self.image_dir)
+        if images is None:
+            images = self._scale(size)
+        self.sizes[size] = images
+        if len(self.sizes) > self.max_sizes:
+            self.sizes.popitem(last=False)
+        return images
+
+    def _scale(self, size):
+        """Redimensionne l'atlas de référence à une nouvelle taille (une seule fois par taille)"""
+        import pygame
+        if self.reference is None:
+            self.reference = load_strip(ATLAS_SIZE, self.image_dir) or build_strip(ATLAS_SIZE, self.image_dir)
+        reference, reference_size, mask = self.reference
+        strip = pygame.Surface((size * len(PIECES), size), pygame.SRCALPHA)
+        for index in range(len(PIECES)):
+            if mask & (1 << index):
+                piece = reference.subsurface((index * reference_size, 0, reference_size, reference_size))
+                # Pièce par pièce: les bords d'une image ne débordent pas sur sa voisine
+                strip.blit(pygame.transform.smoothscale(piece, (size, size)), (index * size, 0))
+        if pygame.display.get_surface() is not None:
+            strip = strip.convert_alpha()
+        return _split(strip, size, mask)
@@ -0,0 +1,125 @@
+# attack_map.py
+# Carte des cases attaquées par chaque couleur, maintenue de façon incrémentale.
+# Les cases sont des index 0-63 (row * 8 + col) en interne et des tuples (row, col)
+# dans l'API publique, comme dans ChessGame.
+
+
+def _targets(offsets):
+    """Précalcule les cases atteintes depuis chaque case pour des déplacements fixes"""
+    table = []
+    for sq in range(64):
+        row, col = divmod(sq, 8)
+        table.append(tuple((row + dr) * 8 + col + dc for dr, dc in offsets
+                           if 0 <= row + dr < 8 and 0 <= col + dc < 8))
+    return table
+
+
+def _ray_table(dr, dc):
+    """Précalcule les rayons (liste de (case, row, col)) dans une direction depuis chaque case"""
+    table = []
+    for sq in range(64):
+        row, col = divmod(sq, 8)
+        ray = []
+        r, c = row + dr, col + dc
+        while 0 <= r < 8 and 0 <= c < 8:
+            ray.append((r * 8 + c, r, c))
+            r, c = r + dr, c + dc
+        table.append(tuple(ray))
+    return table
+
+
+KNIGHT_TARGETS = _targets([(-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1)])
+KING_TARGETS = _targets([(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)])
+PAWN_TARGETS = {'w': _targets([(-1, -1), (-1, 1)]), 'b': _targets([(1, -1), (1, 1)])}
+ROOK_RAYS = [_ray_table(dr, dc) for dr, dc in [(-1, 0), (0, 1), (1, 0), (0, -1)]]
+BISHOP_RAYS = [_ray_table(dr, dc) for dr, dc in [(-1, -1), (-1, 1), (1, -1), (1, 1)]]
+SLIDER_RAYS = {'R': ROOK_RAYS, 'B': BISHOP_RAYS, 'Q': ROOK_RAYS + BISHOP_RAYS}
+
+
+def piece_attacks(board, sq):
+    """Renvoie les cases attaquées par la pièce en sq (cases alliées comprises)"""
+    row, col = divmod(sq, 8)
+    piece = board[row][col]
+    if piece == '--':
+        return ()
+    piece_type = piece[1]
+    if piece_type == 'p':
+        return PAWN_TARGETS[piece[0]][sq]
+    if piece_type == 'N':
+        return KNIGHT_TARGETS[sq]
+    if piece_type == 'K':
+        return KING_TARGETS[sq]
+
+    attacks = []
+    for rays in SLIDER_RAYS[piece_type]:
+        for target, r, c in rays[sq]:
+            attacks.append(target)
+            if board[r][c] != '--':
+                break
+    return attacks
+
+
+class AttackMap:
+    """Nombre d'attaquants par case et par couleur, mis à jour uniquement autour des cases modifiées"""
+    def __init__(self, board):
+        self.board = board
+        self.attacks_from = [()] * 64  # Cases attaquées par la pièce de chaque case
+        self.attackers = [set() for _ in range(64)]  # Cases des pièces qui attaquent chaque case
+        self.colors = [None] * 64  # Couleur de la pièce qui a produit attacks_from
+        self.counts = {'w': [0] * 64, 'b': [0] * 64}
+        for sq in range(64):
+            self._add(sq)
+
+    def _add(self, sq):
+        """Enregistre les attaques de la pièce présente en sq"""
+        piece = self.board[sq // 8][sq % 8]
+        if piece == '--':
+            return
+        color = piece[0]
+        attacks = piece_attacks(self.board, sq)
+        counts = self.counts[color]
+        attackers = self.attackers
+        for target in attacks:
+            counts[target] += 1
+            attackers[target].add(sq)
+        self.attacks_from[sq] = attacks
+        self.colors[sq] = color
+
+    def _remove(self, sq):
+        """Retire les attaques enregistrées pour la case sq"""
+        color = self.colors[sq]
+        if color is None:
+            return
+        counts = self.counts[color]
+        attackers = self.attackers
+        for target in self.attacks_from[sq]:
+            counts[target] -= 1
+            attackers[target].discard(sq)
+        self.attacks_from[sq] = ()
+        self.colors[sq] = None
+
+    def update(self, changed):
+        """
+        Met à jour la carte après modification du plateau
+
+        Args:
+            changed: Cases (row, col) dont le contenu a changé; les pièces qui y sont,
+                     et les pièces glissantes qui les attaquaient, sont recalculées
+        """
+        affected = set()
+        for row, col in changed:
+            sq = row * 8 + col
+            affected.add(sq)
+            affected.update(self.attackers[sq])
+        for sq in affected:
+            self._remove(sq)
+        for sq in affected:
+            self._add(sq)
+
+    def is_attacked(self, pos, by_color):
+        """Vérifie si la case (row, col) est attaquée par la couleur donnée"""
+        return self.counts[by_color][pos[0] * 8 + pos[1]] > 0
+
+    def attackers_of(self, pos, by_color):
+        """Renvoie les cases (row, col) des pièces de la couleur qui attaquent la case"""
+        return [divmod(sq, 8) for sq in self.attackers[pos[0] * 8 + pos[1]] if self.colors[sq] == by_color]
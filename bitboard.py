@@ -0,0 +1,529 @@
+# bitboard.py
+# Représentation alternative de la position basée sur des bitboards de 64 bits.
+# La case d'index `row * 8 + col` correspond à `board[row][col]` dans ChessGame
+# (ligne 0 = huitième rangée, côté noir).
+import zobrist
+
+COLORS = ('w', 'b')
+PIECE_TYPES = ('p', 'N', 'B', 'R', 'Q', 'K')
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+
+# Codes de pièces utilisés par ChessGame.board, indexés par couleur * 6 + type
+PIECE_CODES = [color + piece_type for color in COLORS for piece_type in PIECE_TYPES]
+CODE_INDEX = {code: index for index, code in enumerate(PIECE_CODES)}
+
+# Droits de roque sous forme de masque
+WHITE_KINGSIDE, WHITE_QUEENSIDE, BLACK_KINGSIDE, BLACK_QUEENSIDE = 1, 2, 4, 8
+CASTLING_BITS = {
+    'w': {'kingside': WHITE_KINGSIDE, 'queenside': WHITE_QUEENSIDE},
+    'b': {'kingside': BLACK_KINGSIDE, 'queenside': BLACK_QUEENSIDE},
+}
+
+
+START_FEN = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
+
+
+def parse_fen(fen):
+    """Décode une FEN en (plateau, trait, droits de roque, cible de prise en passant) au format ChessGame"""
+    fields = fen.split()
+    placement, turn = fields[0], fields[1]
+    castling = fields[2] if len(fields) > 2 else '-'
+    en_passant = fields[3] if len(fields) > 3 else '-'
+
+    board = []
+    for rank in placement.split('/'):
+        row = []
+        for char in rank:
+            if char.isdigit():
+                row.extend(['--'] * int(char))
+            else:
+                color = 'w' if char.isupper() else 'b'
+                piece_type = 'p' if char in 'pP' else char.upper()
+                row.append(color + piece_type)
+        if len(row) != 8:
+            raise ValueError(f"FEN invalide: {fen}")
+        board.append(row)
+    if len(board) != 8 or turn not in COLORS:
+        raise ValueError(f"FEN invalide: {fen}")
+
+    castling_rights = {
+        'w': {'kingside': 'K' in castling, 'queenside': 'Q' in castling},
+        'b': {'kingside': 'k' in castling, 'queenside': 'q' in castling},
+    }
+    en_passant_target = None
+    if en_passant != '-':
+        en_passant_target = (8 - int(en_passant[1]), ord(en_passant[0]) - ord('a'))
+    return board, turn, castling_rights, en_passant_target
+
+
+def square(row, col):
+    """Convertit une case (row, col) en index 0-63"""
+    return row * 8 + col
+
+
+def square_to_pos(sq):
+    """Convertit un index 0-63 en case (row, col)"""
+    return divmod(sq, 8)
+
+
+SQUARE_POSITIONS = [square_to_pos(sq) for sq in range(64)]
+
+
+def _leaper_attacks(offsets):
+    """Précalcule les attaques d'une pièce à déplacement fixe pour chaque case"""
+    table = []
+    for sq in range(64):
+        row, col = divmod(sq, 8)
+        attacks = 0
+        for dr, dc in offsets:
+            r, c = row + dr, col + dc
+            if 0 <= r < 8 and 0 <= c < 8:
+                attacks |= 1 << (r * 8 + c)
+        table.append(attacks)
+    return table
+
+
+def _rays(dr, dc):
+    """Précalcule le rayon (sans la case de départ) dans une direction pour chaque case"""
+    table = []
+    for sq in range(64):
+        row, col = divmod(sq, 8)
+        ray = 0
+        r, c = row + dr, col + dc
+        while 0 <= r < 8 and 0 <= c < 8:
+            ray |= 1 << (r * 8 + c)
+            r, c = r + dr, c + dc
+        table.append(ray)
+    return table
+
+
+KNIGHT_ATTACKS = _leaper_attacks([(-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1)])
+KING_ATTACKS = _leaper_attacks([(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)])
+# Cases attaquées par un pion de chaque couleur (les blancs montent vers la ligne 0)
+PAWN_ATTACKS = (_leaper_attacks([(-1, -1), (-1, 1)]), _leaper_attacks([(1, -1), (1, 1)]))
+
+# Rayons "positifs" (index croissant) et "négatifs" (index décroissant)
+NORTH, SOUTH = _rays(-1, 0), _rays(1, 0)
+EAST, WEST = _rays(0, 1), _rays(0, -1)
+NORTH_EAST, NORTH_WEST = _rays(-1, 1), _rays(-1, -1)
+SOUTH_EAST, SOUTH_WEST = _rays(1, 1), _rays(1, -1)
+ROOK_RAYS = ((SOUTH, EAST), (NORTH, WEST))
+BISHOP_RAYS = ((SOUTH_EAST, SOUTH_WEST), (NORTH_EAST, NORTH_WEST))
+
+# Rangées utiles
+RANK_8 = 0xFF
+RANK_1 = 0xFF << 56
+WHITE_DOUBLE_PUSH_RANK = 0xFF << 32  # Ligne 4 (quatrième rangée)
+BLACK_DOUBLE_PUSH_RANK = 0xFF << 24  # Ligne 3 (cinquième rangée)
+
+# Droits de roque conservés quand une pièce quitte ou atteint une case
+CASTLING_MASK = [15] * 64
+CASTLING_MASK[square(7, 4)] = 15 & ~(WHITE_KINGSIDE | WHITE_QUEENSIDE)
+CASTLING_MASK[square(7, 7)] = 15 & ~WHITE_KINGSIDE
+CASTLING_MASK[square(7, 0)] = 15 & ~WHITE_QUEENSIDE
+CASTLING_MASK[square(0, 4)] = 15 & ~(BLACK_KINGSIDE | BLACK_QUEENSIDE)
+CASTLING_MASK[square(0, 7)] = 15 & ~BLACK_KINGSIDE
+CASTLING_MASK[square(0, 0)] = 15 & ~BLACK_QUEENSIDE
+
+PROMOTION_TYPES = (QUEEN, ROOK, BISHOP, KNIGHT)
+
+# Clés Zobrist (mêmes valeurs que zobrist.compute_hash sur le plateau ChessGame)
+PIECE_HASH = [zobrist.PIECE_KEYS[code] for code in PIECE_CODES]
+CASTLING_HASH = [zobrist.state_key('w', {color: {side: bool(mask & bit) for side, bit in sides.items()}
+                                          for color, sides in CASTLING_BITS.items()}, None)
+                 for mask in range(16)]
+EN_PASSANT_HASH = [zobrist.EN_PASSANT_KEYS[sq % 8] for sq in range(64)]
+
+
+def iter_bits(bb):
+    """Itère sur les index des bits à 1 d'un bitboard"""
+    while bb:
+        low = bb & -bb
+        yield low.bit_length() - 1
+        bb ^= low
+
+
+def rook_attacks(sq, occupied):
+    """Cases attaquées par une tour en sq compte tenu des pièces bloquantes"""
+    attacks = 0
+    for rays in ROOK_RAYS[0]:
+        ray = rays[sq]
+        blockers = ray & occupied
+        if blockers:
+            ray ^= rays[(blockers & -blockers).bit_length() - 1]
+        attacks |= ray
+    for rays in ROOK_RAYS[1]:
+        ray = rays[sq]
+        blockers = ray & occupied
+        if blockers:
+            ray ^= rays[blockers.bit_length() - 1]
+        attacks |= ray
+    return attacks
+
+
+def bishop_attacks(sq, occupied):
+    """Cases attaquées par un fou en sq compte tenu des pièces bloquantes"""
+    attacks = 0
+    for rays in BISHOP_RAYS[0]:
+        ray = rays[sq]
+        blockers = ray & occupied
+        if blockers:
+            ray ^= rays[(blockers & -blockers).bit_length() - 1]
+        attacks |= ray
+    for rays in BISHOP_RAYS[1]:
+        ray = rays[sq]
+        blockers = ray & occupied
+        if blockers:
+            ray ^= rays[blockers.bit_length() - 1]
+        attacks |= ray
+    return attacks
+
+
+class BitboardPosition:
+    """Position d'échecs stockée sous forme de bitboards (un par couleur et type de pièce)
+
+    Les coups sont des tuples (depart, arrivee, promotion) où depart et arrivee
+    sont des index 0-63 et promotion est un type de pièce ou None.
+    """
+    __slots__ = ('pieces', 'occupancy', 'mailbox', 'turn', 'castling', 'en_passant', 'hash')
+
+    def __init__(self):
+        self.pieces = [0] * 12  # Indexé par couleur * 6 + type
+        self.occupancy = [0, 0]
+        self.mailbox = [-1] * 64  # Index de pièce par case, -1 si vide
+        self.turn = 0  # 0 pour blanc, 1 pour noir
+        self.castling = 0
+        self.en_passant = -1
+        self.hash = 0  # Hash Zobrist, maintenu de façon incrémentale
+
+    @classmethod
+    def from_board(cls, board, turn='w', castling_rights=None, en_passant_target=None):
+        """Construit une position à partir d'un plateau au format ChessGame"""
+        position = cls()
+        for row in range(8):
+            for col in range(8):
+                code = board[row][col]
+                if code != '--':
+                    position.put_piece(CODE_INDEX[code], row * 8 + col)
+        position.turn = COLORS.index(turn)
+
+        if castling_rights:
+            for color, sides in castling_rights.items():
+                for side, allowed in sides.items():
+                    if allowed:
+                        position.castling |= CASTLING_BITS[color][side]
+        # Ne conserver que les droits dont le roi et la tour sont encore en place
+        for sq, code, rights in ((square(7, 4), 'wK', WHITE_KINGSIDE | WHITE_QUEENSIDE),
+                                 (square(7, 7), 'wR', WHITE_KINGSIDE),
+                                 (square(7, 0), 'wR', WHITE_QUEENSIDE),
+                                 (square(0, 4), 'bK', BLACK_KINGSIDE | BLACK_QUEENSIDE),
+                                 (square(0, 7), 'bR', BLACK_KINGSIDE),
+                                 (square(0, 0), 'bR', BLACK_QUEENSIDE)):
+            if position.mailbox[sq] != CODE_INDEX[code]:
+                position.castling &= ~rights
+
+        if en_passant_target:
+            position.en_passant = square(*en_passant_target)
+        position.hash ^= position.state_hash()
+        return position
+
+    @classmethod
+    def from_game(cls, game):
+        """Construit une position à partir de l'état courant d'un ChessGame"""
+        return cls.from_board(game.board, game.turn, game.castling_rights, game.en_passant_target)
+
+    @classmethod
+    def from_fen(cls, fen):
+        """Construit une position à partir d'une chaîne FEN"""
+        return cls.from_board(*parse_fen(fen))
+
+    def to_board(self):
+        """Renvoie le plateau au format ChessGame (liste de 8 listes de codes)"""
+        return [[PIECE_CODES[index] if index >= 0 else '--' for index in self.mailbox[row * 8:row * 8 + 8]]
+                for row in range(8)]
+
+    def copy(self):
+        """Renvoie une copie indépendante de la position"""
+        position = BitboardPosition.__new__(BitboardPosition)
+        position.pieces = self.pieces[:]
+        position.occupancy = self.occupancy[:]
+        position.mailbox = self.mailbox[:]
+        position.turn = self.turn
+        position.castling = self.castling
+        position.en_passant = self.en_passant
+        position.hash = self.hash
+        return position
+
+    def put_piece(self, index, sq):
+        """Place une pièce (index couleur * 6 + type) sur une case vide"""
+        bit = 1 << sq
+        self.pieces[index] |= bit
+        self.occupancy[index // 6] |= bit
+        self.mailbox[sq] = index
+        self.hash ^= PIECE_HASH[index][sq]
+
+    def remove_piece(self, sq):
+        """Retire la pièce présente sur une case et renvoie son index"""
+        index = self.mailbox[sq]
+        bit = 1 << sq
+        self.pieces[index] ^= bit
+        self.occupancy[index // 6] ^= bit
+        self.mailbox[sq] = -1
+        self.hash ^= PIECE_HASH[index][sq]
+        return index
+
+    def state_hash(self):
+        """Part du hash due au trait, aux droits de roque et à la prise en passant"""
+        key = CASTLING_HASH[self.castling]
+        if self.turn == 1:
+            key ^= zobrist.SIDE_KEY
+        if self.en_passant >= 0:
+            key ^= EN_PASSANT_HASH[self.en_passant]
+        return key
+
+    def king_square(self, color):
+        """Renvoie la case du roi de la couleur (0 ou 1)"""
+        return self.pieces[color * 6 + KING].bit_length() - 1
+
+    def is_square_attacked(self, sq, by_color):
+        """Vérifie si la case est attaquée par la couleur donnée (0 ou 1)"""
+        pieces = self.pieces
+        base = by_color * 6
+        if PAWN_ATTACKS[by_color ^ 1][sq] & pieces[base + PAWN]:
+            return True
+        if KNIGHT_ATTACKS[sq] & pieces[base + KNIGHT]:
+            return True
+        if KING_ATTACKS[sq] & pieces[base + KING]:
+            return True
+        occupied = self.occupancy[0] | self.occupancy[1]
+        queens = pieces[base + QUEEN]
+        rooks = pieces[base + ROOK] | queens
+        if rooks and rook_attacks(sq, occupied) & rooks:
+            return True
+        bishops = pieces[base + BISHOP] | queens
+        if bishops and bishop_attacks(sq, occupied) & bishops:
+            return True
+        return False
+
+    def in_check(self, color=None):
+        """Vérifie si le roi de la couleur (par défaut le trait) est en échec"""
+        if color is None:
+            color = self.turn
+        king = self.pieces[color * 6 + KING]
+        if not king:
+            return False
+        return self.is_square_attacked(king.bit_length() - 1, color ^ 1)
+
+    def generate_pseudo_moves(self):
+        """Génère les coups pseudo-légaux du camp au trait (le roi peut rester en échec)"""
+        moves = []
+        color = self.turn
+        base = color * 6
+        pieces = self.pieces
+        own = self.occupancy[color]
+        enemy = self.occupancy[color ^ 1]
+        occupied = own | enemy
+        empty = ~occupied & 0xFFFFFFFFFFFFFFFF
+        not_own = ~own & 0xFFFFFFFFFFFFFFFF
+
+        # Pions
+        pawns = pieces[base + PAWN]
+        if color == 0:
+            single = (pawns >> 8) & empty
+            double = (single >> 8) & empty & WHITE_DOUBLE_PUSH_RANK
+            step, promotion_rank = 8, RANK_8
+        else:
+            single = (pawns << 8) & empty
+            double = (single << 8) & empty & BLACK_DOUBLE_PUSH_RANK
+            step, promotion_rank = -8, RANK_1
+        for to in iter_bits(single):
+            frm = to + step
+            if (1 << to) & promotion_rank:
+                for promotion in PROMOTION_TYPES:
+                    moves.append((frm, to, promotion))
+            else:
+                moves.append((frm, to, None))
+        for to in iter_bits(double):
+            moves.append((to + 2 * step, to, None))
+        ep_bit = 1 << self.en_passant if self.en_passant >= 0 else 0
+        pawn_attacks = PAWN_ATTACKS[color]
+        for frm in iter_bits(pawns):
+            targets = pawn_attacks[frm] & (enemy | ep_bit)
+            for to in iter_bits(targets):
+                if (1 << to) & promotion_rank:
+                    for promotion in PROMOTION_TYPES:
+                        moves.append((frm, to, promotion))
+                else:
+                    moves.append((frm, to, None))
+
+        # Cavaliers
+        for frm in iter_bits(pieces[base + KNIGHT]):
+            for to in iter_bits(KNIGHT_ATTACKS[frm] & not_own):
+                moves.append((frm, to, None))
+
+        # Pièces glissantes
+        queens = pieces[base + QUEEN]
+        for frm in iter_bits(pieces[base + BISHOP] | queens):
+            targets = bishop_attacks(frm, occupied) & not_own
+            for to in iter_bits(targets):
+                moves.append((frm, to, None))
+        for frm in iter_bits(pieces[base + ROOK] | queens):
+            targets = rook_attacks(frm, occupied) & not_own
+            for to in iter_bits(targets):
+                moves.append((frm, to, None))
+
+        # Roi et roque
+        king = pieces[base + KING]
+        if king:
+            frm = king.bit_length() - 1
+            for to in iter_bits(KING_ATTACKS[frm] & not_own):
+                moves.append((frm, to, None))
+            self._add_castling_moves(moves, color, occupied)
+        return moves
+
+    def _add_castling_moves(self, moves, color, occupied):
+        """Ajoute les roques possibles (cases libres et non attaquées)"""
+        if color == 0:
+            kingside, queenside, row = WHITE_KINGSIDE, WHITE_QUEENSIDE, 7
+        else:
+            kingside, queenside, row = BLACK_KINGSIDE, BLACK_QUEENSIDE, 0
+        if not self.castling & (kingside | queenside):
+            return
+        king_sq = row * 8 + 4
+        opponent = color ^ 1
+        if self.is_square_attacked(king_sq, opponent):
+            return
+        if (self.castling & kingside
+                and not occupied & (0b11 << (king_sq + 1))
+                and not self.is_square_attacked(king_sq + 1, opponent)
+                and not self.is_square_attacked(king_sq + 2, opponent)):
+            moves.append((king_sq, king_sq + 2, None))
+        if (self.castling & queenside
+                and not occupied & (0b111 << (king_sq - 3))
+                and not self.is_square_attacked(king_sq - 1, opponent)
+                and not self.is_square_attacked(king_sq - 2, opponent)):
+            moves.append((king_sq, king_sq - 2, None))
+
+    def make_move(self, move):
+        """Joue un coup et renvoie la nouvelle position (la position courante est inchangée)"""
+        frm, to, promotion = move
+        position = self.copy()
+        position.hash ^= self.state_hash()
+        mailbox = position.mailbox
+        index = mailbox[frm]
+        color = index // 6
+        piece_type = index % 6
+
+        if mailbox[to] >= 0:
+            position.remove_piece(to)
+        elif piece_type == PAWN and to == self.en_passant:
+            # Prise en passant: le pion capturé est derrière la case d'arrivée
+            position.remove_piece(to + (8 if color == 0 else -8))
+
+        position.remove_piece(frm)
+        if promotion is not None:
+            position.put_piece(color * 6 + promotion, to)
+        else:
+            position.put_piece(index, to)
+
+        if piece_type == KING and abs(to - frm) == 2:
+            # Déplacer la tour lors du roque
+            if to > frm:
+                position.put_piece(position.remove_piece(frm + 3), frm + 1)
+            else:
+                position.put_piece(position.remove_piece(frm - 4), frm - 1)
+
+        position.en_passant = -1
+        if piece_type == PAWN and abs(to - frm) == 16:
+            position.en_passant = (frm + to) // 2
+
+        position.castling &= CASTLING_MASK[frm] & CASTLING_MASK[to]
+        position.turn = color ^ 1
+        position.hash ^= position.state_hash()
+        return position
+
+    def pinned_pieces(self, color):
+        """Renvoie le bitboard des pièces de la couleur clouées sur leur roi par une pièce glissante"""
+        king_sq = self.king_square(color)
+        if king_sq < 0:
+            return 0
+        own = self.occupancy[color]
+        occupied = own | self.occupancy[color ^ 1]
+        base = (color ^ 1) * 6
+        queens = self.pieces[base + QUEEN]
+        pinned = 0
+        for attacks, sliders in ((rook_attacks, self.pieces[base + ROOK] | queens),
+                                 (bishop_attacks, self.pieces[base + BISHOP] | queens)):
+            if not sliders:
+                continue
+            from_king = attacks(king_sq, occupied)
+            # Pièces adverses visibles du roi une fois ses propres bloqueurs retirés
+            for pinner in iter_bits(attacks(king_sq, occupied ^ (from_king & own)) & sliders):
+                pinned |= attacks(pinner, occupied) & from_king & own
+        return pinned
+
+    def _iter_legal_moves(self):
+        """Itère sur les coups légaux du camp au trait
+
+        Hors échec, seuls les coups du roi, des pièces clouées et les prises en passant
+        doivent être vérifiés; les autres coups pseudo-légaux sont légaux.
+        """
+        color = self.turn
+        opponent = color ^ 1
+        king_sq = self.king_square(color)
+        if king_sq < 0 or self.is_square_attacked(king_sq, opponent):
+            for move in self.generate_pseudo_moves():
+                if not self.make_move(move).in_check(color):
+                    yield move
+            return
+        pinned = self.pinned_pieces(color)
+        pawn = color * 6 + PAWN
+        mailbox = self.mailbox
+        for move in self.generate_pseudo_moves():
+            frm, to = move[0], move[1]
+            if frm == king_sq:
+                # Les roques ont déjà été vérifiés par _add_castling_moves
+                if abs(to - frm) == 2 or not self.is_square_attacked(to, opponent):
+                    yield move
+            elif (pinned >> frm) & 1 or (to == self.en_passant and mailbox[frm] == pawn):
+                if not self.make_move(move).in_check(color):
+                    yield move
+            else:
+                yield move
+
+    def generate_legal_moves(self):
+        """Génère les coups légaux du camp au trait"""
+        return list(self._iter_legal_moves())
+
+    def has_legal_moves(self):
+        """Vérifie si le camp au trait a au moins un coup légal"""
+        return next(self._iter_legal_moves(), None) is not None
+
+    def legal_move_map(self):
+        """Renvoie les coups légaux du camp au trait au format ChessGame {(row, col): [(row, col), ...]}"""
+        moves = {}
+        for frm, to, promotion in self._iter_legal_moves():
+            # Une seule entrée par promotion: la pièce choisie ne change pas la case d'arrivée
+            if promotion is None or promotion == QUEEN:
+                moves.setdefault(SQUARE_POSITIONS[frm], []).append(SQUARE_POSITIONS[to])
+        return moves
+
+    def legal_targets(self, pos):
+        """Renvoie les cases d'arrivée légales (row, col) pour la pièce en pos"""
+        sq = square(*pos)
+        index = self.mailbox[sq]
+        if index < 0:
+            return []
+        position = self
+        if index // 6 != self.turn:
+            # Pièce du camp qui n'a pas le trait: pas de prise en passant possible
+            position = self.copy()
+            position.turn = index // 6
+            position.en_passant = -1
+        targets = []
+        for frm, to, _ in position._iter_legal_moves():
+            if frm == sq:
+                end = square_to_pos(to)
+                if end not in targets:
+                    targets.append(end)
+        return targets
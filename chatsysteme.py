@@ -4,6 +4,9 @@ import socket
 import threading
 import time
 
+import text_cache
+from constants import scaled
+
 # Première étape: Ajoutons une classe ChatSystem qui gérera les messages
 class ChatSystem:
     def __init__(self, max_messages=10):
@@ -12,6 +15,7 @@ class ChatSystem:
         self.input_text = ""
         self.input_active = False
         self.chat_visible = True
+        self.size = None  # Taille de la zone où le chat a été dessiné (celle du plateau)
         
     def add_message(self, user, message):
         """Ajoute un message au système de chat"""
@@ -20,60 +24,83 @@ class ChatSystem:
         if len(self.messages) > self.max_messages:
             self.messages.pop(0)
     
+    def controls(self, width, height):
+        """Zone de saisie et bouton afficher/cacher, à l'échelle du plateau"""
+        row = scaled(25, width)
+        bottom = height - scaled(5, width)
+        input_rect = pygame.Rect(scaled(10, width), bottom - row, width - scaled(90, width), row)
+        button_rect = pygame.Rect(width - scaled(80, width), bottom - row, scaled(70, width), row)
+        return input_rect, button_rect
+    
+    def area(self, width, height):
+        """Zone de l'écran occupée par le chat (ou par son bouton quand il est caché)"""
+        if not self.chat_visible:
+            return self.controls(width, height)[1]
+        chat_height = int(min(scaled(200, width), height * 0.25))
+        return pygame.Rect(0, height - chat_height, width, chat_height)
+    
+    def display_state(self):
+        """Ce que draw() affiche: le chat n'est redessiné que si cet état change"""
+        return self.chat_visible, tuple(self.messages), self.input_text, self.input_active
+    
     def draw(self, window, font, width, height):
         """Dessine l'interface de chat"""
+        self.size = (width, height)
         if not self.chat_visible:
             # Affiche juste un bouton pour montrer le chat
-            chat_btn = pygame.Rect(width - 80, height - 30, 70, 25)
+            chat_btn = self.area(width, height)
             pygame.draw.rect(window, (70, 70, 70), chat_btn)
-            btn_text = font.render("Chat", True, (255, 255, 255))
-            window.blit(btn_text, (width - 65, height - 28))
+            btn_text = text_cache.render(font, "Chat", (255, 255, 255))
+            window.blit(btn_text, btn_text.get_rect(center=chat_btn.center))
             return
             
         # Dessine la zone de chat en bas de l'écran
-        chat_height = min(200, height * 0.25)
+        chat_height = self.area(width, height).height
         chat_surface = pygame.Surface((width, chat_height), pygame.SRCALPHA)
         chat_surface.fill((0, 0, 0, 180))  # Semi-transparent
         window.blit(chat_surface, (0, height - chat_height))
         
         # Dessine les messages
-        y_offset = height - chat_height + 10
+        input_rect, hide_btn = self.controls(width, height)
+        margin = scaled(10, width)
+        y_offset = height - chat_height + margin
         for user, msg in self.messages:
-            message_text = font.render(f"{user}: {msg}", True, (255, 255, 255))
-            window.blit(message_text, (10, y_offset))
-            y_offset += 20
+            message_text = text_cache.render(font, f"{user}: {msg}", (255, 255, 255))
+            window.blit(message_text, (margin, y_offset))
+            y_offset += scaled(20, width)
         
         # Dessine la zone de saisie
-        input_rect = pygame.Rect(10, height - 30, width - 90, 25)
         pygame.draw.rect(window, (255, 255, 255), input_rect)
         pygame.draw.rect(window, (0, 0, 0), input_rect, 1)
         
-        # Affiche le texte en cours de saisie
+        # Texte en cours de saisie: change à chaque frappe, rendu sans passer par le cache
         input_surface = font.render(self.input_text, True, (0, 0, 0))
-        window.blit(input_surface, (input_rect.x + 5, input_rect.y + 3))
+        text_pos = input_surface.get_rect(midleft=(input_rect.x + scaled(5, width), input_rect.centery))
+        window.blit(input_surface, text_pos)
         
         # Bouton pour cacher le chat
-        hide_btn = pygame.Rect(width - 80, height - 30, 70, 25)
         pygame.draw.rect(window, (70, 70, 70), hide_btn)
-        btn_text = font.render("Cacher", True, (255, 255, 255))
-        window.blit(btn_text, (width - 65, height - 28))
+        btn_text = text_cache.render(font, "Cacher", (255, 255, 255))
+        window.blit(btn_text, btn_text.get_rect(center=hide_btn.center))
         
         # Si l'entrée est active, affiche un curseur
         if self.input_active:
-            cursor_x = input_rect.x + 5 + input_surface.get_width()
-            cursor_y = input_rect.y + 3
-            cursor_height = input_surface.get_height()
+            cursor_x = text_pos.right
+            cursor_y = text_pos.y
+            cursor_height = text_pos.height
             pygame.draw.line(window, (0, 0, 0), (cursor_x, cursor_y), 
-                            (cursor_x, cursor_y + cursor_height), 2)
+                            (cursor_x, cursor_y + cursor_height), scaled(2, width))
 
     def handle_event(self, event, network):
         """Gère les événements liés au chat"""
         if event.type == pygame.MOUSEBUTTONDOWN:
-            mouse_pos = pygame.mouse.get_pos()
-            window_width, window_height = pygame.display.get_surface().get_size()
+            # Position dans la zone du dessin (l'appelant ramène l'événement aux coordonnées du plateau)
+            mouse_pos = event.pos
+            window_width, window_height = self.size or pygame.display.get_surface().get_size()
+            
+            input_rect, chat_btn = self.controls(window_width, window_height)
             
             # Vérifie si on clique sur le bouton de chat (afficher/cacher)
-            chat_btn = pygame.Rect(window_width - 80, window_height - 30, 70, 25)
             if chat_btn.collidepoint(mouse_pos):
                 self.chat_visible = not self.chat_visible
                 return True
@@ -82,7 +109,6 @@ class ChatSystem:
                 return False
                 
             # Vérifie si on clique sur la zone de saisie
-            input_rect = pygame.Rect(10, window_height - 30, window_width - 90, 25)
             self.input_active = input_rect.collidepoint(mouse_pos)
             return self.input_active
             
@@ -1,48 +1,121 @@
 # chess_clock.py
-import pygame
+import heapq
+import itertools
+import math
 import time
-from constants import WIDTH, HEIGHT, WHITE, BLACK
+from constants import WIDTH, HEIGHT, WHITE, BLACK, scaled
+import text_cache
+
+
+class TimerHandle:
+    """Échéance programmée dans une TimerQueue"""
+    __slots__ = ('when', 'callback', 'cancelled')
+
+    def __init__(self, when, callback):
+        self.when = when
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class TimerQueue:
+    """
+    Échéances des horloges d'un processus sans boucle asyncio (interface pygame, hôte réseau)
+
+    Même interface que la boucle asyncio (call_at() renvoie une poignée avec cancel()), si
+    bien qu'une ChessClock s'utilise avec l'une ou l'autre. run_due() est appelé par la
+    boucle principale et ne coûte qu'une comparaison tant qu'aucune échéance n'est atteinte.
+    """
+    def __init__(self):
+        self.heap = []  # (instant time.monotonic(), ordre d'ajout, poignée)
+        self.counter = itertools.count()
+
+    def time(self):
+        return time.monotonic()
+
+    def call_at(self, when, callback):
+        """Programme callback() à l'instant when (time.monotonic())"""
+        handle = TimerHandle(when, callback)
+        heapq.heappush(self.heap, (when, next(self.counter), handle))
+        return handle
+
+    def next_deadline(self):
+        """Instant de la prochaine échéance, None s'il n'y en a pas"""
+        while self.heap and self.heap[0][2].cancelled:
+            heapq.heappop(self.heap)
+        return self.heap[0][0] if self.heap else None
+
+    def run_due(self, now=None):
+        """
+        Exécute les échéances atteintes
+
+        Returns:
+            Nombre de rappels exécutés
+        """
+        if now is None:
+            now = time.monotonic()
+        fired = 0
+        while self.heap and self.heap[0][0] <= now:
+            _, _, handle = heapq.heappop(self.heap)
+            if not handle.cancelled:
+                handle.callback()
+                fired += 1
+        return fired
+
 
 class ChessClock:
-    def __init__(self, initial_time, increment=0):
+    def __init__(self, initial_time, increment=0, scheduler=None):
         """
         Initialise une horloge d'échecs
         :param initial_time: Temps initial en secondes
         :param increment: Incrément de temps après chaque coup en secondes
+        :param scheduler: TimerQueue ou boucle asyncio (dont l'heure est time.monotonic()) qui
+                          déclenche la chute du drapeau à l'échéance; sans lui, seul update() la détecte
         """
         self.time_left = {'w': initial_time, 'b': initial_time}
         self.increment = increment
         self.running = False
         self.active_color = None
-        self.last_update = 0
+        self.last_update = 0  # Instant time.monotonic() du dernier décompte
         self.game_over = False
         self.timeout_color = None
+        # Un temps écoulé termine la partie; une horloge non autoritaire (client réseau) s'arrête
+        # à zéro et attend que l'hôte annonce la chute du drapeau
+        self.authoritative = True
+        self.scheduler = scheduler
+        self.timer = None  # Poignée de l'échéance du joueur actif
+        self.on_timeout = None  # Appelé avec la couleur dont le drapeau tombe
     
     def start(self, starting_color='w'):
         """Démarre l'horloge"""
         self.running = True
         self.active_color = starting_color
-        self.last_update = time.time()
+        self.last_update = time.monotonic()
+        self._schedule()
     
     def stop(self):
         """Arrête l'horloge"""
         self.running = False
+        self._cancel()
     
-    def switch(self):
-        """Change le joueur actif et applique l'incrément"""
+    def switch(self, elapsed=None):
+        """
+        Change le joueur actif et applique l'incrément
+        :param elapsed: Temps de réflexion à décompter au joueur actif (par défaut le temps écoulé
+                        depuis le dernier décompte; l'hôte y retire le délai de transmission)
+        """
         if not self.running:
             return
         
-        current_time = time.time()
-        elapsed = current_time - self.last_update
+        current_time = time.monotonic()
+        if elapsed is None:
+            elapsed = current_time - self.last_update
         self.time_left[self.active_color] -= elapsed
         
         # Vérifie si le temps est écoulé
-        if self.time_left[self.active_color] <= 0:
-            self.time_left[self.active_color] = 0
-            self.game_over = True
-            self.timeout_color = self.active_color
-            self.running = False
+        if self.time_left[self.active_color] <= 0 and self._flag():
             return
         
         # Ajoute l'incrément
@@ -51,23 +124,91 @@ class ChessClock:
         # Change le joueur actif
         self.active_color = 'b' if self.active_color == 'w' else 'w'
         self.last_update = current_time
+        self._schedule()
     
     def update(self):
         """Met à jour le temps restant"""
         if not self.running or self.game_over:
             return
         
-        current_time = time.time()
+        current_time = time.monotonic()
         elapsed = current_time - self.last_update
         self.time_left[self.active_color] -= elapsed
         self.last_update = current_time
         
         # Vérifie si le temps est écoulé
         if self.time_left[self.active_color] <= 0:
-            self.time_left[self.active_color] = 0
-            self.game_over = True
-            self.timeout_color = self.active_color
-            self.running = False
+            self._flag()
+    
+    def expired(self, elapsed=None):
+        """
+        Fait tomber le drapeau du joueur actif si son temps est épuisé avant qu'il ne joue
+
+        Un coup peut arriver après l'échéance mais avant que le planificateur ne l'ait traitée
+        (réseau lu avant les échéances): il doit alors être refusé plutôt que joué.
+        :param elapsed: Temps de réflexion du joueur actif (par défaut le temps écoulé depuis le dernier décompte)
+        :return: True si la partie est terminée au temps (on_timeout a été appelé)
+        """
+        if self.game_over:
+            return True
+        if not self.running or not self.authoritative:
+            return False
+        if elapsed is None:
+            elapsed = time.monotonic() - self.last_update
+        if self.time_left[self.active_color] - elapsed > 0:
+            return False
+        return self._flag()
+    
+    def _flag(self):
+        """
+        Temps du joueur actif épuisé: fin de partie si l'horloge fait foi, annoncée par on_timeout
+
+        Returns:
+            True si la partie est terminée
+        """
+        self.time_left[self.active_color] = 0
+        if not self.authoritative:
+            return False
+        self.game_over = True
+        self.timeout_color = self.active_color
+        self.running = False
+        self._cancel()
+        if self.on_timeout:
+            self.on_timeout(self.timeout_color)
+        return True
+    
+    def deadline(self):
+        """Instant time.monotonic() où le drapeau du joueur actif tombera, None si l'horloge est arrêtée"""
+        if not self.running or self.game_over:
+            return None
+        return self.last_update + self.time_left[self.active_color]
+    
+    def _schedule(self):
+        """Reprogramme l'échéance du joueur actif (rien ne tourne par image ni par partie entre deux coups)"""
+        self._cancel()
+        deadline = self.deadline()
+        if self.scheduler is not None and self.authoritative and deadline is not None:
+            self.timer = self.scheduler.call_at(deadline, self._expire)
+    
+    def _cancel(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+    
+    def _expire(self):
+        """Échéance atteinte: fait tomber le drapeau (update() prévient la partie)"""
+        self.timer = None
+        self.update()
+        if not self.game_over:
+            # Réveil un peu en avance (résolution de la boucle) ou temps modifié entre-temps
+            self._schedule()
+    
+    def remaining(self, color):
+        """Temps restant d'une couleur à cet instant, sans modifier l'horloge"""
+        time_left = self.time_left[color]
+        if self.running and color == self.active_color:
+            time_left -= time.monotonic() - self.last_update
+        return max(0.0, time_left)
     
     def format_time(self, seconds):
         """Formate le temps en minutes:secondes"""
@@ -75,27 +216,46 @@ class ChessClock:
         seconds = int(seconds) % 60
         return f"{minutes:02d}:{seconds:02d}"
     
+    def rects(self, width, height):
+        """Zones de l'écran occupées par les horloges (noirs en haut, blancs en bas)"""
+        import pygame
+        clock_height = scaled(30, width)
+        return pygame.Rect(0, 0, width, clock_height), pygame.Rect(0, height - clock_height, width, clock_height)
+    
+    def next_display_change(self):
+        """Secondes avant que le chiffre affiché du joueur actif ne change, None si l'horloge est arrêtée"""
+        if not self.running or self.game_over:
+            return None
+        remaining = self.remaining(self.active_color)
+        if remaining <= 0:
+            return None
+        return remaining - math.floor(remaining)
+    
+    def display_state(self):
+        """Ce que draw() affiche: ne change qu'au changement de seconde ou de joueur actif"""
+        return self.format_time(self.remaining('b')), self.format_time(self.remaining('w')), self.active_color
+    
     def draw(self, window, font, width, height):
         """Dessine l'horloge à l'écran"""
-        self.update()
+        import pygame  # Seul l'affichage dépend de pygame
+        # Lecture seule: la chute du drapeau est détectée par l'échéance programmée
+        black_left, white_left = self.remaining('b'), self.remaining('w')
         
         # Dessine le fond des horloges
-        clock_height = 30
-        black_clock_rect = pygame.Rect(0, 0, width, clock_height)
-        white_clock_rect = pygame.Rect(0, height - clock_height, width, clock_height)
+        black_clock_rect, white_clock_rect = self.rects(width, height)
         
         pygame.draw.rect(window, (50, 50, 50), black_clock_rect)
         pygame.draw.rect(window, (50, 50, 50), white_clock_rect)
         
         # Surligne l'horloge active
         if self.active_color == 'b':
-            pygame.draw.rect(window, (70, 70, 70), black_clock_rect, 3)
+            pygame.draw.rect(window, (70, 70, 70), black_clock_rect, scaled(3, width))
         elif self.active_color == 'w':
-            pygame.draw.rect(window, (70, 70, 70), white_clock_rect, 3)
+            pygame.draw.rect(window, (70, 70, 70), white_clock_rect, scaled(3, width))
         
         # Affiche le temps restant
-        black_time = font.render(self.format_time(self.time_left['b']), True, WHITE)
-        white_time = font.render(self.format_time(self.time_left['w']), True, WHITE)
+        black_time = text_cache.render(font, self.format_time(black_left), WHITE)
+        white_time = text_cache.render(font, self.format_time(white_left), WHITE)
         
-        window.blit(black_time, (width//2 - black_time.get_width()//2, 5))
-        window.blit(white_time, (width//2 - white_time.get_width()//2, height - clock_height + 5))
\ No newline at end of file
+        window.blit(black_time, black_time.get_rect(center=black_clock_rect.center))
+        window.blit(white_time, white_time.get_rect(center=white_clock_rect.center))
\ No newline at end of file
@@ -0,0 +1,615 @@
+# chess_game.py
+# Cœur du jeu sans interface: plateau, coups légaux, horloge et statut de la partie.
+# Importable sans pygame (serveurs, moteurs, perft); l'interface de main.py s'appuie dessus.
+from chess_pieces import create_piece
+from bitboard import BitboardPosition, PIECE_TYPES, square
+from attack_map import AttackMap
+from legal_moves import LegalMoveGenerator, LegalMoveCache
+import zobrist
+from chess_clock import ChessClock, TimerQueue
+from engine import EnginePlayer
+
+
+class ChessGame:
+    """Règles et état d'une partie, sans affichage"""
+    # Après chaque coup, calculer la liste complète des coups du camp au trait et la mettre en
+    # cache (clics, moteur); un arbitre qui ne fait que valider des coups se contente de savoir
+    # s'il en existe un
+    prefetch_moves = True
+
+    def __init__(self, use_bitboards=False):
+        """
+        Initialise une nouvelle partie d'échecs
+
+        Args:
+            use_bitboards: Calcule les coups, l'échec et la fin de partie avec BitboardPosition
+        """
+        self.use_bitboards = use_bitboards
+        self.board = self.create_board()
+        self.attack_map = AttackMap(self.board)
+        self.piece_objects = None  # Grille 8x8 d'objets ChessPiece
+        self.piece_lists = None  # Objets ChessPiece par couleur puis par type
+        self.pieces_board = None
+        self.update_piece_objects()  # Crée les objets de pièces
+        self.selected_piece = None
+        self.turn = 'w'
+        self.valid_moves = []
+        self.network = None
+        self.is_host = False
+        self.is_spectator = False  # Suit une partie du serveur sans pouvoir jouer
+        self.game_id = None
+        self.player_color = None
+        self.move_history = []
+        self.undo_stack = []  # Enregistrements d'annulation de make_move, un par demi-coup
+        self.king_positions = {'w': (7, 4), 'b': (0, 4)}
+        self.in_check = {'w': False, 'b': False}
+        self.game_status = 'Playing'
+        self.castling_rights = {'w': {'kingside': True, 'queenside': True}, 'b': {'kingside': True, 'queenside': True}}
+        self.en_passant_target = None
+        self.clock = None
+        # Échéances des horloges (remplacé par la boucle asyncio sur le serveur de parties)
+        self.timers = TimerQueue()
+        self.time_mode = 'Standard'
+        self.game_started = False
+        self.engine_player = None
+        # Appelé depuis les threads réseau et moteur quand un résultat attend la boucle principale
+        # (l'interface s'en sert pour sortir de son attente d'événements)
+        self.wakeup = None
+        self.position_hash = 0
+        self.hash_board = None
+        self.get_position_hash()
+        self.bitboard = None  # Position bitboard tenue à jour par make_move/unmake_move
+        self.move_cache = LegalMoveCache()  # Coups légaux par hash de position
+
+    def create_board(self):
+        """Crée et retourne le plateau initial"""
+        board = [
+            ['bR', 'bN', 'bB', 'bQ', 'bK', 'bB', 'bN', 'bR'],
+            ['bp', 'bp', 'bp', 'bp', 'bp', 'bp', 'bp', 'bp'],
+            ['--', '--', '--', '--', '--', '--', '--', '--'],
+            ['--', '--', '--', '--', '--', '--', '--', '--'],
+            ['--', '--', '--', '--', '--', '--', '--', '--'],
+            ['--', '--', '--', '--', '--', '--', '--', '--'],
+            ['wp', 'wp', 'wp', 'wp', 'wp', 'wp', 'wp', 'wp'],
+            ['wR', 'wN', 'wB', 'wQ', 'wK', 'wB', 'wN', 'wR']
+        ]
+        return board
+    
+    def create_piece_objects(self):
+        """Crée les objets de pièces à partir du tableau (les pièces hors de leur case initiale ont déjà bougé)"""
+        initial_board = self.create_board()
+        piece_objects = [[None for _ in range(8)] for _ in range(8)]
+        for row in range(8):
+            for col in range(8):
+                piece_code = self.board[row][col]
+                if piece_code != '--':
+                    piece_objects[row][col] = create_piece(piece_code, (row, col))
+                    piece_objects[row][col].has_moved = initial_board[row][col] != piece_code
+        return piece_objects
+    
+    def set_position(self, board, turn='w', castling_rights=None, en_passant_target=None):
+        """Remplace la position courante (plateau, trait, droits de roque, prise en passant)"""
+        self.board = [row[:] for row in board]
+        self.turn = turn
+        if castling_rights is None:
+            castling_rights = {'w': {'kingside': False, 'queenside': False}, 'b': {'kingside': False, 'queenside': False}}
+        self.castling_rights = {color: dict(sides) for color, sides in castling_rights.items()}
+        self.en_passant_target = en_passant_target
+        for row in range(8):
+            for col in range(8):
+                if self.board[row][col][1] == 'K':
+                    self.king_positions[self.board[row][col][0]] = (row, col)
+        self.update_piece_objects()
+        self.attack_map = AttackMap(self.board)
+        self.selected_piece = None
+        self.valid_moves = []
+        self.move_history = []
+        self.undo_stack = []
+        self.game_status = 'Playing'
+        self.hash_board = None
+        self.get_position_hash()
+        self.in_check['w'] = self.is_in_check('w')
+        self.in_check['b'] = self.is_in_check('b')
+        self.check_game_over()
+
+    def update_piece_objects(self):
+        """Reconstruit les objets de pièces et les listes de pièces à partir du plateau"""
+        self.piece_objects = self.create_piece_objects()
+        self.piece_lists = {color: {piece_type: [] for piece_type in ('p', 'N', 'B', 'R', 'Q', 'K')}
+                            for color in ('w', 'b')}
+        for row in self.piece_objects:
+            for piece_obj in row:
+                if piece_obj:
+                    self.piece_lists[piece_obj.color][piece_obj.type_char].append(piece_obj)
+        self.pieces_board = self.board
+
+    def get_piece_objects(self):
+        """Renvoie la grille d'objets de pièces, reconstruite si le plateau a été remplacé (ex: par le réseau)"""
+        if self.pieces_board is not self.board:
+            self.update_piece_objects()
+        return self.piece_objects
+
+    def iter_pieces(self, color):
+        """Parcourt les objets de pièces d'une couleur sans balayer les 64 cases"""
+        self.get_piece_objects()
+        for pieces in self.piece_lists[color].values():
+            yield from pieces
+
+    def _add_piece_object(self, piece_obj, pos):
+        """Place un objet de pièce sur une case et l'ajoute à sa liste"""
+        piece_obj.position = pos
+        self.piece_objects[pos[0]][pos[1]] = piece_obj
+        self.piece_lists[piece_obj.color][piece_obj.type_char].append(piece_obj)
+
+    def _remove_piece_object(self, pos):
+        """Retire l'objet de pièce d'une case et de sa liste, et le renvoie"""
+        piece_obj = self.piece_objects[pos[0]][pos[1]]
+        self.piece_objects[pos[0]][pos[1]] = None
+        self.piece_lists[piece_obj.color][piece_obj.type_char].remove(piece_obj)
+        return piece_obj
+
+    def _relocate_piece_object(self, start, end):
+        """Déplace un objet de pièce d'une case vide à l'autre, sans toucher aux listes"""
+        piece_obj = self.piece_objects[start[0]][start[1]]
+        self.piece_objects[start[0]][start[1]] = None
+        self.piece_objects[end[0]][end[1]] = piece_obj
+        piece_obj.position = end
+        return piece_obj
+
+    def select_square(self, square):
+        """Gère la sélection d'une pièce et son déplacement à partir d'une case (row, col)"""
+        if self.game_status != 'Playing' or self.is_spectator:
+            return
+            
+        row, col = square
+        
+        # Vérifier si c'est le tour du joueur
+        if self.player_color and self.turn != self.player_color:
+            return
+            
+        if self.selected_piece:
+            # Si on clique sur la même pièce, désélectionner
+            if self.selected_piece == (row, col):
+                self.selected_piece = None
+                self.valid_moves = []
+                return
+                
+            # Si on clique sur une case valide, déplacer la pièce
+            if (row, col) in self.valid_moves:
+                self.move_piece(self.selected_piece, (row, col))
+                self.selected_piece = None
+                self.valid_moves = []
+                return
+                
+            # Si on clique sur une autre pièce de même couleur, la sélectionner
+            piece = self.board[row][col]
+            if piece != '--' and piece[0] == self.turn:
+                self.selected_piece = (row, col)
+                self.valid_moves = self.get_valid_moves((row, col))
+                return
+                
+            # Sinon, désélectionner
+            self.selected_piece = None
+            self.valid_moves = []
+        else:
+            # Sélectionner une pièce si elle est de la bonne couleur
+            piece = self.board[row][col]
+            if piece != '--' and piece[0] == self.turn:
+                self.selected_piece = (row, col)
+                self.valid_moves = self.get_valid_moves((row, col))
+
+    def get_piece_moves(self, pos):
+        """Obtient tous les mouvements possibles pour une pièce spécifique en utilisant les objets de pièces"""
+        row, col = pos
+        piece_obj = self.get_piece_objects()[row][col]
+        
+        if not piece_obj:
+            return []
+            
+        # Utilise la méthode get_moves définie dans chess_pieces.py
+        return piece_obj.get_moves(self.board)
+
+    def to_bitboard(self):
+        """Renvoie la position bitboard du jeu, reconstruite si elle ne correspond plus au hash courant"""
+        if self.bitboard is None or self.bitboard.hash != self.get_position_hash():
+            self.bitboard = BitboardPosition.from_game(self)
+        return self.bitboard
+
+    def get_attack_map(self):
+        """Renvoie la carte des attaques, reconstruite si le plateau a été remplacé (ex: par le réseau)"""
+        if self.attack_map.board is not self.board:
+            self.attack_map = AttackMap(self.board)
+        return self.attack_map
+
+    def get_position_hash(self):
+        """Renvoie le hash Zobrist de la position, recalculé si le plateau a été remplacé"""
+        if self.hash_board is not self.board:
+            self.position_hash = zobrist.compute_hash(self.board, self.turn, self.castling_rights, self.en_passant_target)
+            self.hash_board = self.board
+        return self.position_hash
+
+    def get_all_possible_moves(self, color):
+        """Obtient tous les mouvements possibles pour une couleur, sans vérifier l'échec"""
+        moves = []
+        for piece_obj in self.iter_pieces(color):
+            moves.extend([(piece_obj.position, move) for move in piece_obj.get_moves(self.board)])
+        return moves
+
+    def is_in_check(self, color):
+        """Vérifie si le roi de la couleur spécifiée est en échec"""
+        if self.use_bitboards:
+            return self.to_bitboard().in_check(0 if color == 'w' else 1)
+
+        opponent_color = 'b' if color == 'w' else 'w'
+        return self.get_attack_map().is_attacked(self.king_positions[color], opponent_color)
+
+    def get_legal_moves(self):
+        """
+        Renvoie tous les coups légaux du camp au trait {départ: [arrivées]}
+
+        Le résultat est partagé via le cache LRU indexé par le hash de la position:
+        il ne doit pas être modifié par l'appelant.
+        """
+        key = self.get_position_hash()
+        moves = self.move_cache.get(key)
+        if moves is None:
+            if self.use_bitboards:
+                moves = self.to_bitboard().legal_move_map()
+            else:
+                moves = LegalMoveGenerator.from_game(self, self.turn).all_moves()
+            self.move_cache.put(key, moves)
+        return moves
+
+    def get_valid_moves(self, pos):
+        """Obtient tous les mouvements valides pour une pièce, en tenant compte de l'échec"""
+        row, col = pos
+        piece = self.board[row][col]
+        if piece == '--':
+            return []
+        if piece[0] == self.turn:
+            return self.get_legal_moves().get(pos, [])
+
+        # Pièce du camp qui n'a pas le trait: pas mise en cache
+        if self.use_bitboards:
+            return self.to_bitboard().legal_targets(pos)
+        return LegalMoveGenerator.from_game(self, piece[0]).targets(pos)
+
+    def is_legal_move(self, start, end):
+        """
+        Vérifie qu'un coup reçu (réseau, serveur) est jouable par le camp au trait
+
+        Hors cache, seuls les coups de la pièce jouée sont générés.
+        """
+        piece = self.board[start[0]][start[1]]
+        if piece == '--' or piece[0] != self.turn:
+            return False
+        moves = self.move_cache.get(self.get_position_hash())
+        if moves is not None:
+            return end in moves.get(start, ())
+        if self.use_bitboards:
+            return end in self.to_bitboard().legal_targets(start)
+        return end in LegalMoveGenerator.from_game(self, self.turn).targets(start)
+
+    def has_legal_moves(self):
+        """Vérifie si le camp au trait a au moins un coup légal (arrêt au premier trouvé hors cache)"""
+        moves = self.move_cache.get(self.get_position_hash())
+        if moves is not None:
+            return bool(moves)
+        if self.use_bitboards:
+            return self.to_bitboard().has_legal_moves()
+        return LegalMoveGenerator.from_game(self, self.turn).has_moves()
+
+    def _castling_rook_squares(self, start, end):
+        """Renvoie les cases de départ et d'arrivée de la tour pour un roque du roi de start à end"""
+        row = end[0]
+        if end[1] > start[1]:  # Roque côté roi
+            return (row, 7), (row, end[1] - 1)
+        return (row, 0), (row, end[1] + 1)  # Roque côté dame
+
+    def make_move(self, start, end, promotion='Q'):
+        """
+        Joue un coup sur le plateau sans horloge, réseau ni test de fin de partie
+
+        Le coup est empilé dans undo_stack sous forme d'un enregistrement compact
+        (cases modifiées, droits de roque, prise en passant, hash, échec, statut,
+        objets de pièces déplacé et pris, position bitboard précédente) pour que
+        unmake_move restaure la position sans copier le plateau.
+        """
+        start_row, start_col = start
+        end_row, end_col = end
+        moved_piece = self.board[start_row][start_col]
+        captured_piece = self.board[end_row][end_col]
+        rights = self.castling_rights
+        self.get_piece_objects()
+        piece_obj = self.piece_objects[start_row][start_col]
+        has_moved = piece_obj.has_moved
+        captured_obj = None
+        
+        # Enregistrer le mouvement dans l'historique
+        self.move_history.append((start, end, moved_piece, captured_piece))
+        
+        # Contenu initial des cases modifiées (hash, carte des attaques et annulation)
+        previous_squares = {start: moved_piece, end: captured_piece}
+        previous_state = ((rights['w']['kingside'], rights['w']['queenside'],
+                           rights['b']['kingside'], rights['b']['queenside']),
+                          self.en_passant_target, self.get_position_hash(),
+                          (self.in_check['w'], self.in_check['b']), self.game_status)
+        bitboard = self.to_bitboard() if self.use_bitboards else None
+        position_hash = self.position_hash ^ zobrist.state_key(self.turn, rights, self.en_passant_target)
+        if captured_piece != '--':
+            captured_obj = self._remove_piece_object(end)
+        
+        # Gérer le roque
+        if moved_piece[1] == 'K' and abs(start_col - end_col) == 2:
+            rook_start, rook_end = self._castling_rook_squares(start, end)
+            previous_squares[rook_end] = self.board[rook_end[0]][rook_end[1]]
+            previous_squares[rook_start] = self.board[rook_start[0]][rook_start[1]]
+            self.board[rook_end[0]][rook_end[1]] = self.board[rook_start[0]][rook_start[1]]
+            self.board[rook_start[0]][rook_start[1]] = '--'
+            self._relocate_piece_object(rook_start, rook_end).has_moved = True
+        
+        # Gérer la prise en passant
+        if moved_piece[1] == 'p' and start_col != end_col and captured_piece == '--':
+            previous_squares[(start_row, end_col)] = self.board[start_row][end_col]
+            self.board[start_row][end_col] = '--'
+            captured_obj = self._remove_piece_object((start_row, end_col))
+        
+        # Réinitialiser la cible de prise en passant
+        self.en_passant_target = None
+        
+        # Définir une nouvelle cible de prise en passant si un pion avance de deux cases
+        if moved_piece[1] == 'p' and abs(start_row - end_row) == 2:
+            self.en_passant_target = (start_row + (end_row - start_row) // 2, start_col)
+        
+        # Déplacer la pièce
+        self.board[end_row][end_col] = moved_piece
+        self.board[start_row][start_col] = '--'
+        self._relocate_piece_object(start, end)
+        piece_obj.has_moved = True
+        
+        # Promotion du pion (seul cas où un objet de pièce est créé)
+        if moved_piece[1] == 'p' and (end_row == 0 or end_row == 7):
+            self.board[end_row][end_col] = moved_piece[0] + promotion
+            self._remove_piece_object(end)
+            promoted_obj = create_piece(moved_piece[0] + promotion, end)
+            promoted_obj.has_moved = True
+            self._add_piece_object(promoted_obj, end)
+        
+        # Mettre à jour la carte des attaques autour des cases modifiées (remplacée par la
+        # position bitboard en mode bitboard)
+        if bitboard is None:
+            self.get_attack_map().update(previous_squares)
+        
+        # Mettre à jour la position du roi
+        if moved_piece[1] == 'K':
+            self.king_positions[moved_piece[0]] = (end_row, end_col)
+        
+        # Mettre à jour les droits de roque
+        if moved_piece[1] == 'K':
+            rights[moved_piece[0]]['kingside'] = False
+            rights[moved_piece[0]]['queenside'] = False
+        elif moved_piece[1] == 'R' and start_row == (7 if moved_piece[0] == 'w' else 0):
+            if start_col == 7:  # Tour côté roi
+                rights[moved_piece[0]]['kingside'] = False
+            elif start_col == 0:  # Tour côté dame
+                rights[moved_piece[0]]['queenside'] = False
+        
+        # Une tour prise dans son coin fait perdre le roque de ce côté
+        if captured_piece[1:] == 'R' and end_row == (7 if captured_piece[0] == 'w' else 0):
+            if end_col == 7:
+                rights[captured_piece[0]]['kingside'] = False
+            elif end_col == 0:
+                rights[captured_piece[0]]['queenside'] = False
+        
+        # Changer de tour
+        self.turn = 'b' if self.turn == 'w' else 'w'
+        
+        # Mettre à jour le hash de la position avec les seules cases modifiées
+        for (row, col), previous in previous_squares.items():
+            position_hash ^= zobrist.square_key(previous, row, col) ^ zobrist.square_key(self.board[row][col], row, col)
+        self.position_hash = position_hash ^ zobrist.state_key(self.turn, rights, self.en_passant_target)
+        if bitboard is not None:
+            promoted = moved_piece[1] == 'p' and (end_row == 0 or end_row == 7)
+            self.bitboard = bitboard.make_move((square(start_row, start_col), square(end_row, end_col),
+                                                PIECE_TYPES.index(promotion) if promoted else None))
+        self.undo_stack.append((previous_squares,) + previous_state + (piece_obj, has_moved, captured_obj, bitboard))
+
+    def unmake_move(self):
+        """Annule le dernier coup joué avec make_move ou move_piece (l'horloge n'est pas modifiée)"""
+        if not self.undo_stack:
+            return False
+        (previous_squares, castling, en_passant_target, position_hash, in_check, game_status,
+         piece_obj, has_moved, captured_obj, bitboard) = self.undo_stack.pop()
+        start, end, moved_piece, _ = self.move_history.pop()
+        
+        # Replacer le contenu des cases modifiées
+        for (row, col), piece in previous_squares.items():
+            self.board[row][col] = piece
+            if piece[1:] == 'K':
+                self.king_positions[piece[0]] = (row, col)
+        if bitboard is None:
+            self.get_attack_map().update(previous_squares)
+        
+        # Replacer les objets de pièces (la pièce prise garde sa position d'origine)
+        if self.piece_objects[end[0]][end[1]] is piece_obj:
+            self._relocate_piece_object(end, start)
+        else:  # Promotion
+            self._remove_piece_object(end)
+            self._add_piece_object(piece_obj, start)
+        piece_obj.has_moved = has_moved
+        if moved_piece[1] == 'K' and abs(start[1] - end[1]) == 2:
+            rook_start, rook_end = self._castling_rook_squares(start, end)
+            self._relocate_piece_object(rook_end, rook_start).has_moved = False
+        if captured_obj:
+            self._add_piece_object(captured_obj, captured_obj.position)
+        
+        # Restaurer l'état qui n'est pas sur le plateau
+        rights = self.castling_rights
+        rights['w']['kingside'], rights['w']['queenside'], rights['b']['kingside'], rights['b']['queenside'] = castling
+        self.en_passant_target = en_passant_target
+        self.turn = 'b' if self.turn == 'w' else 'w'
+        self.position_hash = position_hash
+        if bitboard is not None:
+            self.bitboard = bitboard
+        self.in_check['w'], self.in_check['b'] = in_check
+        self.game_status = game_status
+        self.selected_piece = None
+        self.valid_moves = []
+        return True
+
+    def move_piece(self, start, end, promotion='Q', send=True, elapsed=None):
+        """
+        Déplace une pièce et gère les règles spéciales (promotion, roque, etc.)
+
+        Args:
+            send: Envoie le coup au pair (False pour un coup reçu du réseau)
+            elapsed: Temps de réflexion à décompter (par défaut mesuré par l'horloge locale)
+
+        Returns:
+            False si le drapeau du joueur au trait est tombé avant le coup (coup non joué,
+            la fin de partie est annoncée par on_timeout de l'horloge)
+        """
+        # L'échéance a pu passer sans être encore traitée par la boucle (clic ou trame lus avant)
+        if self.clock and self.game_started and self.clock.expired(elapsed):
+            return False
+        
+        self.make_move(start, end, promotion)
+        
+        # Gérer l'horloge
+        if self.clock and self.game_started:
+            self.clock.switch(elapsed)
+        
+        # Vérifier l'échec
+        self.in_check['w'] = self.is_in_check('w')
+        self.in_check['b'] = self.is_in_check('b')
+        
+        # Vérifier fin de partie
+        self.check_game_over()
+        
+        # Envoyer le coup via le réseau (l'état complet n'est envoyé qu'à la connexion ou sur demande)
+        if send and self.network:
+            self.network.send_move(start, end, promotion)
+        return True
+
+    def poll_network(self):
+        """Applique les messages reçus du réseau (à appeler à chaque tour de la boucle principale)"""
+        if self.network:
+            self.network.process_messages()
+
+    def run_timers(self):
+        """Déclenche les échéances d'horloge atteintes (à appeler à chaque tour de la boucle principale)"""
+        return self.timers.run_due()
+
+    def on_clock_timeout(self, color):
+        """Drapeau tombé à l'échéance de l'horloge: fin de partie, annoncée au pair par l'hôte"""
+        if self.game_status != 'Playing':
+            return
+        self.check_game_over()
+        if self.network and self.network.authoritative_clock:
+            self.network.send_game_state()
+
+    def check_game_over(self):
+        """Vérifie si la partie est terminée (échec et mat, pat ou temps écoulé)"""
+        # Vérifier si le temps est écoulé
+        if self.clock and self.clock.game_over:
+            winner = 'Blancs' if self.clock.timeout_color == 'b' else 'Noirs'
+            self.game_status = f'Temps écoulé! {winner} gagnent!'
+            return
+        
+        # Vérifier si le joueur actuel a des mouvements légaux (liste complète gardée en cache
+        # pour les clics de sélection qui suivent, sauf pour un arbitre sans interface)
+        if self.prefetch_moves:
+            has_valid_moves = bool(self.get_legal_moves())
+        else:
+            has_valid_moves = self.has_legal_moves()
+        
+        # Si aucun mouvement légal, c'est soit échec et mat soit pat
+        if not has_valid_moves:
+            if self.in_check[self.turn]:
+                winner = 'Blancs' if self.turn == 'b' else 'Noirs'
+                self.game_status = f'Échec et mat! {winner} gagnent!'
+            else:
+                self.game_status = 'Pat! Match nul!'
+
+    def setup_clock(self, time_mode='Standard'):
+        """Configure l'horloge selon le mode de temps choisi"""
+        self.time_mode = time_mode
+        if self.clock:
+            self.clock.stop()  # Annule l'échéance de l'ancienne horloge
+        if time_mode == 'Blitz':
+            self.clock = ChessClock(180, 2, self.timers)  # 3 minutes + 2 secondes par coup
+        elif time_mode == 'Rapide':
+            self.clock = ChessClock(600, 5, self.timers)  # 10 minutes + 5 secondes par coup
+        elif time_mode == 'Standard':
+            self.clock = ChessClock(1800, 0, self.timers)  # 30 minutes sans incrément
+        else:
+            self.clock = ChessClock(600, 0, self.timers)  # 10 minutes par défaut
+        self.clock.on_timeout = self.on_clock_timeout
+        self.game_started = False
+
+    def start_game(self):
+        """Démarre la partie et l'horloge"""
+        if self.clock and (not self.game_started):
+            self.clock.start('w')
+            self.game_started = True
+
+    def host_game(self, port=5555):
+        """Démarre un jeu en tant qu'hôte"""
+        self.is_host = True
+        self.player_color = 'w'  # L'hôte joue les blancs
+        from network import NetworkHost
+        self.network = NetworkHost(self, port)
+        self.network.start()
+        return True
+
+    def play_against_computer(self, engine_color='b', workers=1):
+        """
+        Démarre une partie locale contre le moteur, qui réfléchit dans un thread séparé
+
+        Args:
+            engine_color: Couleur jouée par le moteur
+            workers: Nombre de processus de recherche (au-delà de 1, recherche parallèle)
+        """
+        self.is_host = False
+        self.player_color = 'w' if engine_color == 'b' else 'b'
+        engine = None
+        if workers > 1:
+            from parallel_search import ParallelEngine
+            engine = ParallelEngine(workers)
+        self.engine_player = EnginePlayer(engine_color, engine)
+        self.engine_player.wakeup = self.wakeup
+        self.start_game()
+        return True
+
+    def join_game(self, host, port=5555, game_id=None):
+        """
+        Rejoint un jeu en tant que client
+
+        Args:
+            game_id: Identifiant de partie sur un serveur de parties (server.py); sans
+                     identifiant, connexion directe à un hôte NetworkHost
+        """
+        self.is_host = False
+        self.player_color = 'b'  # Le client joue les noirs (le serveur de parties peut en décider autrement)
+        if game_id:
+            from network import NetworkServerClient
+            self.network = NetworkServerClient(self, host, port, game_id)
+        else:
+            from network import NetworkClient
+            self.network = NetworkClient(self, host, port)
+        connected = self.network.connect()
+        if connected:
+            self.network.start()
+        return connected
+
+    def watch_game(self, host, port=5555, game_id='partie'):
+        """Suit une partie d'un serveur de parties (server.py) en spectateur"""
+        self.is_host = False
+        self.is_spectator = True
+        self.player_color = None
+        from network import NetworkSpectator
+        self.network = NetworkSpectator(self, host, port, game_id)
+        connected = self.network.connect()
+        if connected:
+            self.network.start()
+        return connected
@@ -2,6 +2,8 @@
 
 class ChessPiece:
     """Classe de base pour toutes les pièces d'échecs"""
+    __slots__ = ('color', 'position', 'has_moved')
+
     def __init__(self, color, position):
         self.color = color  # 'w' pour blanc, 'b' pour noir
         self.position = position  # (row, col)
@@ -17,6 +19,7 @@ class ChessPiece:
         return f"{self.color}{self.type_char}"
 
 class Pawn(ChessPiece):
+    __slots__ = ()
     type_char = 'p'
     
     def get_moves(self, board):
@@ -30,7 +33,8 @@ class Pawn(ChessPiece):
             moves.append((row + direction, col))
             
             # Avancer de deux cases depuis la position initiale
-            if not self.has_moved and board[row + 2*direction][col] == '--':
+            start_row = 1 if self.color == 'b' else 6
+            if row == start_row and board[row + 2*direction][col] == '--':
                 moves.append((row + 2*direction, col))
         
         # Capturer en diagonale
@@ -44,6 +48,7 @@ class Pawn(ChessPiece):
         return moves
 
 class Rook(ChessPiece):
+    __slots__ = ()
     type_char = 'R'
     
     def get_moves(self, board):
@@ -70,6 +75,7 @@ class Rook(ChessPiece):
         return moves
 
 class Knight(ChessPiece):
+    __slots__ = ()
     type_char = 'N'
     
     def get_moves(self, board):
@@ -94,6 +100,7 @@ class Knight(ChessPiece):
         return moves
 
 class Bishop(ChessPiece):
+    __slots__ = ()
     type_char = 'B'
     
     def get_moves(self, board):
@@ -120,6 +127,7 @@ class Bishop(ChessPiece):
         return moves
 
 class Queen(ChessPiece):
+    __slots__ = ()
     type_char = 'Q'
     
     def get_moves(self, board):
@@ -149,6 +157,7 @@ class Queen(ChessPiece):
         return moves
 
 class King(ChessPiece):
+    __slots__ = ()
     type_char = 'K'
     
     def get_moves(self, board):
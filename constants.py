@@ -1,8 +1,7 @@
 
 # constants.py
-import pygame
 
-# Dimensions
+# Dimensions de départ (la fenêtre est redimensionnable, voir main.resize_display)
 WIDTH, HEIGHT = 600, 600
 SQUARE_SIZE = WIDTH // 8
 
@@ -23,8 +22,38 @@ GAME_MODES = {
     "Standard": {"time": 1800, "increment": 0, "description": "30min"}
 }
 
-# Initialisation des polices
-pygame.font.init()
-TITLE_FONT = pygame.font.SysFont('Arial', 36)
-SMALL_FONT = pygame.font.SysFont('Arial', 24)
-INPUT_FONT = pygame.font.SysFont('Arial', 30)
\ No newline at end of file
+# Polices, créées au premier accès (importer ce module n'initialise pas pygame) puis gardées:
+# SysFont parcourt les polices du système, il ne doit jamais être appelé pendant le dessin
+FONT_SIZES = {'TITLE_FONT': 36, 'SMALL_FONT': 24, 'INPUT_FONT': 30,
+              'STATUS_FONT': 36, 'CLOCK_FONT': 24, 'CHAT_FONT': 16, 'PIECE_FONT': 30}
+# Tailles pour des cases de SQUARE_SIZE pixels des polices qui suivent la taille du plateau
+# (toutes: l'horloge et le chat ont eux aussi des bandeaux proportionnels au plateau, voir scaled)
+SCALED_FONT_SIZES = dict(FONT_SIZES)
+_fonts_by_size = {}  # Une seule police par taille, partagée par les noms de même taille
+
+
+def scaled(length, board_width):
+    """Longueur en pixels pensée pour le plateau de départ, ramenée à un plateau de board_width pixels"""
+    return max(length * board_width // (8 * SQUARE_SIZE), 1)
+
+
+def scale_fonts(square_size):
+    """Adapte les polices du plateau et des menus à la taille des cases (voir main.resize_display)"""
+    for name, size in SCALED_FONT_SIZES.items():
+        size = max(size * square_size // SQUARE_SIZE, 8)
+        if FONT_SIZES[name] != size:
+            FONT_SIZES[name] = size
+            globals().pop(name, None)  # Recréée (ou reprise de _fonts_by_size) au prochain accès
+
+
+def __getattr__(name):
+    if name not in FONT_SIZES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    size = FONT_SIZES[name]
+    font = _fonts_by_size.get(size)
+    if font is None:
+        import pygame
+        pygame.font.init()
+        font = _fonts_by_size[size] = pygame.font.SysFont('Arial', size)
+    globals()[name] = font
+    return font
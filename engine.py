@@ -0,0 +1,463 @@
+# engine.py
+# Moteur d'échecs: alpha-bêta avec approfondissement itératif, table de transposition,
+# recherche de quiescence et tri des coups. La recherche travaille sur une BitboardPosition
+# copiée depuis le ChessGame et tourne dans un thread séparé de la boucle pygame.
+import random
+import threading
+import time
+
+from bitboard import BitboardPosition, PIECE_TYPES, PAWN, iter_bits, square_to_pos, square
+
+MATE_SCORE = 100000
+INFINITY = 1000000
+MAX_PLY = 64
+
+# Valeurs des pièces en centipions (indexées par type)
+PIECE_VALUES = [100, 320, 330, 500, 900, 0]
+
+# Tables de bonus par case du point de vue des blancs, case 0 = a8 (comme board[0][0])
+PAWN_TABLE = [
+    0, 0, 0, 0, 0, 0, 0, 0,
+    50, 50, 50, 50, 50, 50, 50, 50,
+    10, 10, 20, 30, 30, 20, 10, 10,
+    5, 5, 10, 25, 25, 10, 5, 5,
+    0, 0, 0, 20, 20, 0, 0, 0,
+    5, -5, -10, 0, 0, -10, -5, 5,
+    5, 10, 10, -20, -20, 10, 10, 5,
+    0, 0, 0, 0, 0, 0, 0, 0,
+]
+KNIGHT_TABLE = [
+    -50, -40, -30, -30, -30, -30, -40, -50,
+    -40, -20, 0, 0, 0, 0, -20, -40,
+    -30, 0, 10, 15, 15, 10, 0, -30,
+    -30, 5, 15, 20, 20, 15, 5, -30,
+    -30, 0, 15, 20, 20, 15, 0, -30,
+    -30, 5, 10, 15, 15, 10, 5, -30,
+    -40, -20, 0, 5, 5, 0, -20, -40,
+    -50, -40, -30, -30, -30, -30, -40, -50,
+]
+BISHOP_TABLE = [
+    -20, -10, -10, -10, -10, -10, -10, -20,
+    -10, 0, 0, 0, 0, 0, 0, -10,
+    -10, 0, 5, 10, 10, 5, 0, -10,
+    -10, 5, 5, 10, 10, 5, 5, -10,
+    -10, 0, 10, 10, 10, 10, 0, -10,
+    -10, 10, 10, 10, 10, 10, 10, -10,
+    -10, 5, 0, 0, 0, 0, 5, -10,
+    -20, -10, -10, -10, -10, -10, -10, -20,
+]
+ROOK_TABLE = [
+    0, 0, 0, 0, 0, 0, 0, 0,
+    5, 10, 10, 10, 10, 10, 10, 5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    0, 0, 0, 5, 5, 0, 0, 0,
+]
+QUEEN_TABLE = [
+    -20, -10, -10, -5, -5, -10, -10, -20,
+    -10, 0, 0, 0, 0, 0, 0, -10,
+    -10, 0, 5, 5, 5, 5, 0, -10,
+    -5, 0, 5, 5, 5, 5, 0, -5,
+    0, 0, 5, 5, 5, 5, 0, -5,
+    -10, 5, 5, 5, 5, 5, 0, -10,
+    -10, 0, 5, 0, 0, 0, 0, -10,
+    -20, -10, -10, -5, -5, -10, -10, -20,
+]
+KING_TABLE = [
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -20, -30, -30, -40, -40, -30, -30, -20,
+    -10, -20, -20, -20, -20, -20, -20, -10,
+    20, 20, 0, 0, 0, 0, 20, 20,
+    20, 30, 10, 0, 0, 10, 30, 20,
+]
+
+# Valeur + bonus de case pour chaque index de pièce (couleur * 6 + type) et chaque case;
+# les noirs lisent la table retournée verticalement (sq ^ 56)
+PIECE_SQUARE = [[PIECE_VALUES[piece_type] + table[sq ^ (56 * color)] for sq in range(64)]
+                for color in range(2)
+                for piece_type, table in enumerate([PAWN_TABLE, KNIGHT_TABLE, BISHOP_TABLE,
+                                                    ROOK_TABLE, QUEEN_TABLE, KING_TABLE])]
+
+# Drapeaux de la table de transposition
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+class SearchTimeout(Exception):
+    """Levée pour interrompre la recherche quand le temps est écoulé ou sur demande d'arrêt"""
+
+
+def evaluate(position):
+    """Évaluation statique en centipions du point de vue du camp au trait"""
+    score = 0
+    pieces = position.pieces
+    for index in range(12):
+        table = PIECE_SQUARE[index]
+        subtotal = 0
+        for sq in iter_bits(pieces[index]):
+            subtotal += table[sq]
+        score += subtotal if index < 6 else -subtotal
+    return score if position.turn == 0 else -score
+
+
+def score_to_tt(score, ply):
+    """Convertit un score de mat (distance à la racine) en distance au nœud pour la table de transposition"""
+    if score >= MATE_SCORE - MAX_PLY:
+        return score + ply
+    if score <= -(MATE_SCORE - MAX_PLY):
+        return score - ply
+    return score
+
+
+def score_from_tt(score, ply):
+    """Convertit un score de mat lu dans la table de transposition en distance à la racine"""
+    if score >= MATE_SCORE - MAX_PLY:
+        return score - ply
+    if score <= -(MATE_SCORE - MAX_PLY):
+        return score + ply
+    return score
+
+
+def allocate_time(time_left, increment=0, moves_to_go=30):
+    """
+    Temps de réflexion (secondes) pour un coup à partir de l'horloge
+
+    Args:
+        time_left: Temps restant du moteur en secondes
+        increment: Incrément par coup en secondes
+        moves_to_go: Nombre de coups estimé avant la fin de la partie
+    """
+    budget = time_left / moves_to_go + increment * 0.75
+    # Garder toujours une marge pour ne jamais perdre au temps
+    return max(0.05, min(budget, time_left * 0.5 - 0.05))
+
+
+class Engine:
+    """Recherche alpha-bêta sur une BitboardPosition"""
+    def __init__(self, tt_size=1 << 20, tt=None):
+        """
+        Args:
+            tt_size: Nombre d'entrées au-delà duquel la table de transposition locale est vidée
+            tt: Table de transposition à utiliser à la place d'un dict (ex: table partagée)
+        """
+        self.tt_size = tt_size
+        self.tt = tt if tt is not None else {}  # hash -> (profondeur, score, drapeau, coup)
+        self.nodes = 0
+        self.deadline = None
+        self.stop_event = None
+        self.killers = [[None, None] for _ in range(MAX_PLY + 1)]
+        self.history = {}
+        self.path = []
+
+    def clear(self):
+        """Vide la table de transposition et les heuristiques de tri"""
+        self.tt.clear()
+        self.history.clear()
+
+    def search(self, position, time_limit=None, max_depth=MAX_PLY, stop_event=None, on_info=None,
+               start_depth=1, seed=None):
+        """
+        Cherche le meilleur coup par approfondissement itératif
+
+        Args:
+            position: BitboardPosition à analyser (non modifiée)
+            time_limit: Temps maximal en secondes (None = limité par max_depth seulement)
+            max_depth: Profondeur maximale
+            stop_event: threading.Event permettant d'interrompre la recherche
+            on_info: Fonction appelée après chaque itération avec (profondeur, score, coup, nœuds)
+            start_depth: Première profondeur de l'approfondissement itératif
+            seed: Graine pour mélanger l'ordre des coups racine à égalité (recherche parallèle)
+
+        Returns:
+            (coup, score, profondeur) du dernier niveau complètement exploré
+        """
+        self.nodes = 0
+        self.stop_event = stop_event
+        start_time = time.perf_counter()
+        self.deadline = start_time + time_limit if time_limit else None
+        self.killers = [[None, None] for _ in range(MAX_PLY + 1)]
+        self.path = []
+        if isinstance(self.tt, dict) and len(self.tt) > self.tt_size:
+            self.tt.clear()
+
+        moves = position.generate_legal_moves()
+        if not moves:
+            return None, (-MATE_SCORE if position.in_check() else 0), 0
+        if seed is not None:
+            random.Random(seed).shuffle(moves)
+        best_move, best_score, completed_depth = moves[0], 0, 0
+
+        for depth in range(min(start_depth, max_depth), max_depth + 1):
+            try:
+                score, move = self._root(position, moves, depth)
+            except SearchTimeout:
+                break
+            best_move, best_score, completed_depth = move, score, depth
+            if on_info:
+                on_info(depth, score, best_move, self.nodes)
+            if abs(score) >= MATE_SCORE - MAX_PLY or len(moves) == 1:
+                break
+            # Une itération supplémentaire prendrait au moins autant de temps que les précédentes
+            if self.deadline and time.perf_counter() - start_time > (self.deadline - start_time) * 0.5:
+                break
+        return best_move, best_score, completed_depth
+
+    def _check_time(self):
+        """Interrompt la recherche si le temps est écoulé ou si l'arrêt est demandé"""
+        if self.stop_event is not None and self.stop_event.is_set():
+            raise SearchTimeout()
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+
+    def _root(self, position, moves, depth):
+        """Explore les coups racine et renvoie (score, meilleur coup)"""
+        alpha, beta = -INFINITY, INFINITY
+        best_move = None
+        entry = self.tt.get(position.hash)
+        self.path.append(position.hash)
+        try:
+            for move in self._order(position, moves, 0, entry[3] if entry else None):
+                score = -self._negamax(position.make_move(move), depth - 1, -beta, -alpha, 1)
+                if score > alpha or best_move is None:
+                    alpha, best_move = score, move
+        finally:
+            self.path.pop()
+        self.tt[position.hash] = (depth, alpha, EXACT, best_move)
+        return alpha, best_move
+
+    def _negamax(self, position, depth, alpha, beta, ply):
+        """Recherche alpha-bêta (forme negamax) avec table de transposition"""
+        self.nodes += 1
+        if self.nodes & 1023 == 0:
+            self._check_time()
+
+        key = position.hash
+        if key in self.path:
+            return 0  # Répétition dans la variante courante
+        in_check = position.in_check()
+        if in_check:
+            depth += 1
+        if depth <= 0 or ply >= MAX_PLY:
+            return self._quiesce(position, alpha, beta, ply)
+
+        original_alpha = alpha
+        tt_move = None
+        entry = self.tt.get(key)
+        if entry is not None:
+            entry_depth, entry_score, flag, tt_move = entry
+            entry_score = score_from_tt(entry_score, ply)
+            if entry_depth >= depth:
+                if flag == EXACT:
+                    return entry_score
+                if flag == LOWER and entry_score >= beta:
+                    return entry_score
+                if flag == UPPER and entry_score <= alpha:
+                    return entry_score
+
+        color = position.turn
+        best_score, best_move = -INFINITY, None
+        self.path.append(key)
+        try:
+            for move in self._order(position, position.generate_pseudo_moves(), ply, tt_move):
+                child = position.make_move(move)
+                if child.in_check(color):
+                    continue
+                score = -self._negamax(child, depth - 1, -beta, -alpha, ply + 1)
+                if score > best_score:
+                    best_score, best_move = score, move
+                if score > alpha:
+                    alpha = score
+                if alpha >= beta:
+                    if position.mailbox[move[1]] < 0:
+                        self._record_quiet_cutoff(move, ply, depth)
+                    break
+        finally:
+            self.path.pop()
+
+        if best_move is None:
+            return -MATE_SCORE + ply if in_check else 0
+
+        if best_score <= original_alpha:
+            flag = UPPER
+        elif best_score >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.tt[key] = (depth, score_to_tt(best_score, ply), flag, best_move)
+        return best_score
+
+    def _quiesce(self, position, alpha, beta, ply):
+        """Ne prolonge que les captures et promotions pour éviter l'effet d'horizon"""
+        self.nodes += 1
+        if self.nodes & 1023 == 0:
+            self._check_time()
+
+        stand_pat = evaluate(position)
+        if stand_pat >= beta:
+            return stand_pat
+        if stand_pat > alpha:
+            alpha = stand_pat
+
+        color = position.turn
+        mailbox = position.mailbox
+        captures = [move for move in position.generate_pseudo_moves()
+                    if mailbox[move[1]] >= 0 or move[2] is not None
+                    or (move[1] == position.en_passant and mailbox[move[0]] % 6 == PAWN)]
+        for move in self._order(position, captures, MAX_PLY):
+            child = position.make_move(move)
+            if child.in_check(color):
+                continue
+            score = -self._quiesce(child, -beta, -alpha, ply + 1)
+            if score >= beta:
+                return score
+            if score > alpha:
+                alpha = score
+        return alpha
+
+    def _order(self, position, moves, ply, tt_move=None):
+        """Trie les coups: coup de la table, captures MVV-LVA, promotions, coups meurtriers, historique"""
+        mailbox = position.mailbox
+        killers = self.killers[ply] if ply <= MAX_PLY else (None, None)
+        history = self.history
+
+        def priority(move):
+            if move == tt_move:
+                return 1000000
+            victim = mailbox[move[1]]
+            score = 0
+            if victim >= 0:
+                score = 100000 + PIECE_VALUES[victim % 6] * 10 - PIECE_VALUES[mailbox[move[0]] % 6] // 10
+            if move[2] is not None:
+                score += 90000 + PIECE_VALUES[move[2]]
+            if score:
+                return score
+            if move == killers[0]:
+                return 80000
+            if move == killers[1]:
+                return 79000
+            return history.get(move, 0)
+
+        return sorted(moves, key=priority, reverse=True)
+
+    def _record_quiet_cutoff(self, move, ply, depth):
+        """Mémorise un coup tranquille ayant provoqué une coupure"""
+        killers = self.killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+        self.history[move] = min(self.history.get(move, 0) + depth * depth, 70000)
+
+
+def move_to_game(move):
+    """Convertit un coup bitboard en (depart, arrivee, promotion) pour ChessGame.move_piece"""
+    frm, to, promotion = move
+    return square_to_pos(frm), square_to_pos(to), PIECE_TYPES[promotion] if promotion is not None else 'Q'
+
+
+def move_from_game(start, end, promotion=None):
+    """Convertit un coup ChessGame en coup bitboard"""
+    promotion_type = PIECE_TYPES.index(promotion) if promotion else None
+    return square(*start), square(*end), promotion_type
+
+
+class EnginePlayer:
+    """Fait jouer le moteur pour une couleur d'un ChessGame sans bloquer la boucle pygame"""
+    def __init__(self, color='b', engine=None, max_depth=MAX_PLY, move_time=None):
+        """
+        Args:
+            color: Couleur jouée par le moteur
+            max_depth: Profondeur maximale de recherche
+            move_time: Temps fixe par coup en secondes (sinon calculé depuis l'horloge)
+        """
+        self.color = color
+        self.engine = engine or Engine()
+        self.max_depth = max_depth
+        self.move_time = move_time
+        self.thread = None
+        self.stop_event = threading.Event()
+        self.result = None
+        self.search_hash = None
+        self.last_info = None
+        self.wakeup = None  # Appelé par le thread de recherche quand le coup est trouvé
+
+    @property
+    def thinking(self):
+        """Vrai tant que la recherche tourne"""
+        return self.thread is not None and self.thread.is_alive()
+
+    def think_time(self, game):
+        """Temps alloué pour le prochain coup, depuis l'horloge de la partie si elle existe"""
+        if self.move_time is not None:
+            return self.move_time
+        if game.clock:
+            return allocate_time(game.clock.time_left[self.color], game.clock.increment)
+        return 2.0
+
+    def start(self, game):
+        """Lance la recherche dans un thread à partir d'une copie de la position"""
+        position = BitboardPosition.from_game(game)
+        self.search_hash = game.get_position_hash()
+        self.result = None
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, args=(position, self.think_time(game)))
+        self.thread.daemon = True
+        self.thread.start()
+
+    def _run(self, position, time_limit):
+        move, score, depth = self.engine.search(position, time_limit, self.max_depth, self.stop_event,
+                                                self._on_info)
+        self.result = move
+        if self.wakeup:
+            self.wakeup()
+
+    def _on_info(self, depth, score, move, nodes):
+        self.last_info = (depth, score, move, nodes)
+
+    def update(self, game):
+        """
+        À appeler à chaque image: lance la réflexion quand c'est au moteur de jouer
+        et joue le coup trouvé. Renvoie True si un coup a été joué.
+        """
+        if game.game_status != 'Playing' or game.turn != self.color:
+            return False
+        if self.thread is None:
+            # Coup forcé (lu dans le cache des coups légaux de la partie): inutile de chercher
+            legal_moves = game.get_legal_moves()
+            if len(legal_moves) == 1:
+                (start, targets), = legal_moves.items()
+                if len(targets) == 1:
+                    game.move_piece(start, targets[0])
+                    return True
+            self.start(game)
+            return False
+        if self.thinking:
+            return False
+
+        self.thread = None
+        move = self.result
+        if move is not None and self.search_hash == game.get_position_hash():
+            start, end, promotion = move_to_game(move)
+            if end in game.get_legal_moves().get(start, ()):
+                game.move_piece(start, end, promotion)
+                return True
+        # La position a changé pendant la réflexion: relancer tout de suite, aucun réveil
+        # n'est attendu tant qu'aucune recherche ne tourne
+        return self.update(game)
+
+    def stop(self):
+        """Interrompt la recherche en cours"""
+        self.stop_event.set()
+        if self.thinking and self.thread != threading.current_thread():
+            self.thread.join(timeout=1)
+        self.thread = None
+
+    def close(self):
+        """Interrompt la recherche et libère les ressources du moteur (processus, mémoire partagée)"""
+        self.stop()
+        if hasattr(self.engine, 'close'):
+            self.engine.close()
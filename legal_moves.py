@@ -0,0 +1,240 @@
+# legal_moves.py
+# Générateur de coups légaux sans jouer/déjouer chaque coup candidat: les clouages,
+# les pièces qui donnent échec et les cases de parade sont calculés une fois par position.
+from collections import OrderedDict
+
+from attack_map import ROOK_RAYS, BISHOP_RAYS
+
+SLIDER_LINES = ((ROOK_RAYS, 'RQ'), (BISHOP_RAYS, 'BQ'))
+
+
+class LegalMoveGenerator:
+    """Coups légaux d'une couleur pour une position donnée (le plateau n'est jamais modifié)"""
+    def __init__(self, board, color, king_pos, attack_map, piece_objects,
+                 castling_rights=None, en_passant_target=None, pieces=None):
+        """
+        Args:
+            board: Plateau au format ChessGame (lu seulement)
+            color: Couleur dont on génère les coups ('w' ou 'b')
+            king_pos: Case (row, col) du roi de cette couleur
+            attack_map: AttackMap synchronisée avec le plateau
+            piece_objects: Grille d'objets ChessPiece utilisée pour les coups pseudo-légaux
+            castling_rights: Droits de roque de ChessGame
+            en_passant_target: Case de prise en passant, à fournir seulement si color a le trait
+            pieces: Listes d'objets ChessPiece de cette couleur par type (sinon les 64 cases sont parcourues)
+        """
+        self.board = board
+        self.color = color
+        self.opponent = 'b' if color == 'w' else 'w'
+        self.king_pos = king_pos
+        self.attack_map = attack_map
+        self.piece_objects = piece_objects
+        self.castling_rights = castling_rights
+        self.en_passant_target = en_passant_target
+        self.pieces = pieces
+
+        self.pins = {}  # Case de la pièce clouée -> cases où elle peut encore aller
+        self.check_lines = []  # Cases de parade (pièce qui donne échec incluse) pour chaque échec
+        self.xray_squares = set()  # Cases derrière le roi sur la ligne d'une pièce glissante qui donne échec
+        self._analyse()
+
+    @classmethod
+    def from_game(cls, game, color):
+        """Construit le générateur pour une couleur à partir de l'état d'un ChessGame"""
+        return cls(game.board, color, game.king_positions[color], game.get_attack_map(),
+                   game.get_piece_objects(), game.castling_rights,
+                   game.en_passant_target if color == game.turn else None,
+                   game.piece_lists[color])
+
+    def _analyse(self):
+        """Calcule clouages, échecs et parades en parcourant les lignes issues du roi"""
+        board = self.board
+        king_row, king_col = self.king_pos
+        king_sq = king_row * 8 + king_col
+
+        for rays, sliders in SLIDER_LINES:
+            for table in rays:
+                own_piece = None
+                line = []
+                for _, r, c in table[king_sq]:
+                    line.append((r, c))
+                    piece = board[r][c]
+                    if piece == '--':
+                        continue
+                    if piece[0] == self.color:
+                        if own_piece is not None:
+                            break
+                        own_piece = (r, c)
+                        continue
+                    if piece[1] in sliders:
+                        if own_piece is None:
+                            self.check_lines.append(set(line))
+                            dr, dc = r - king_row, c - king_col
+                            dr, dc = (dr > 0) - (dr < 0), (dc > 0) - (dc < 0)
+                            self.xray_squares.add((king_row - dr, king_col - dc))
+                        else:
+                            self.pins[own_piece] = set(line)
+                    break
+
+        # Pions et cavaliers qui donnent échec (les pièces glissantes sont déjà comptées)
+        for attacker in self.attack_map.attackers_of(self.king_pos, self.opponent):
+            if board[attacker[0]][attacker[1]][1] in 'pN':
+                self.check_lines.append({attacker})
+
+    @property
+    def in_check(self):
+        """Vérifie si le roi de la couleur est en échec"""
+        return bool(self.check_lines)
+
+    def targets(self, pos):
+        """Renvoie les cases d'arrivée légales pour la pièce en pos"""
+        row, col = pos
+        piece = self.board[row][col]
+        if piece == '--' or piece[0] != self.color:
+            return []
+        piece_obj = self.piece_objects[row][col]
+        pseudo_moves = piece_obj.get_moves(self.board) if piece_obj else []
+
+        if piece[1] == 'K':
+            attack_map = self.attack_map
+            moves = [move for move in pseudo_moves
+                     if move not in self.xray_squares and not attack_map.is_attacked(move, self.opponent)]
+            if not self.check_lines:
+                moves.extend(self._castling_moves())
+            return moves
+
+        # En double échec seul le roi peut bouger
+        if len(self.check_lines) > 1:
+            return []
+        allowed = None
+        if self.check_lines:
+            allowed = self.check_lines[0]
+        if pos in self.pins:
+            allowed = self.pins[pos] if allowed is None else allowed & self.pins[pos]
+
+        moves = pseudo_moves if allowed is None else [move for move in pseudo_moves if move in allowed]
+        if piece[1] == 'p' and self.en_passant_target:
+            en_passant = self._en_passant_move(pos)
+            if en_passant:
+                moves.append(en_passant)
+        return moves
+
+    def _positions(self):
+        """Cases des pièces de la couleur, depuis la liste de pièces si elle est fournie"""
+        if self.pieces is not None:
+            return [piece_obj.position for pieces in self.pieces.values() for piece_obj in pieces]
+        return [(row, col) for row in range(8) for col in range(8)
+                if self.board[row][col] != '--' and self.board[row][col][0] == self.color]
+
+    def all_moves(self):
+        """Renvoie un dictionnaire case de départ -> cases d'arrivée légales"""
+        moves = {}
+        for pos in self._positions():
+            targets = self.targets(pos)
+            if targets:
+                moves[pos] = targets
+        return moves
+
+    def has_moves(self):
+        """Vérifie s'il existe au moins un coup légal"""
+        return any(self.targets(pos) for pos in self._positions())
+
+    def _castling_moves(self):
+        """Roques possibles: le roi ne doit ni être en échec ni traverser une case attaquée"""
+        if not self.castling_rights:
+            return []
+        row = 7 if self.color == 'w' else 0
+        if self.king_pos != (row, 4):
+            return []
+        board = self.board
+        rights = self.castling_rights[self.color]
+        rook = self.color + 'R'
+        attacked = self.attack_map.is_attacked
+        moves = []
+        if (rights['kingside'] and board[row][7] == rook
+                and board[row][5] == '--' and board[row][6] == '--'
+                and not attacked((row, 5), self.opponent) and not attacked((row, 6), self.opponent)):
+            moves.append((row, 6))
+        if (rights['queenside'] and board[row][0] == rook
+                and board[row][1] == '--' and board[row][2] == '--' and board[row][3] == '--'
+                and not attacked((row, 3), self.opponent) and not attacked((row, 2), self.opponent)):
+            moves.append((row, 2))
+        return moves
+
+    def _en_passant_move(self, pos):
+        """Renvoie la case de prise en passant si elle est légale pour le pion en pos"""
+        row, col = pos
+        target_row, target_col = self.en_passant_target
+        direction = -1 if self.color == 'w' else 1
+        if row + direction != target_row or abs(col - target_col) != 1:
+            return None
+        captured = (row, target_col)
+        if self.board[row][target_col] != self.opponent + 'p':
+            return None
+        if len(self.check_lines) > 1:
+            return None
+        if self.check_lines and captured not in self.check_lines[0] and self.en_passant_target not in self.check_lines[0]:
+            return None
+        # Les deux pions quittent la rangée: vérifier les échecs à la découverte
+        if self._exposed_to_slider(vacated={pos, captured}, filled=self.en_passant_target):
+            return None
+        return self.en_passant_target
+
+    def _exposed_to_slider(self, vacated, filled):
+        """Vérifie si une pièce glissante adverse voit le roi une fois vacated vidées et filled occupée"""
+        board = self.board
+        king_row, king_col = self.king_pos
+        king_sq = king_row * 8 + king_col
+        for rays, sliders in SLIDER_LINES:
+            for table in rays:
+                for _, r, c in table[king_sq]:
+                    if (r, c) == filled:
+                        break
+                    if (r, c) in vacated:
+                        continue
+                    piece = board[r][c]
+                    if piece == '--':
+                        continue
+                    if piece[0] == self.opponent and piece[1] in sliders:
+                        return True
+                    break
+        return False
+
+
+class LegalMoveCache:
+    """Cache LRU borné des coups légaux complets d'une position, indexé par son hash Zobrist"""
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Renvoie les coups {départ: [arrivées]} de la position, ou None (compte les succès et échecs)"""
+        moves = self.entries.get(key)
+        if moves is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return moves
+
+    def put(self, key, moves):
+        """Enregistre les coups d'une position et évince la moins récemment utilisée au-delà de maxsize"""
+        self.entries[key] = moves
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        """Vide le cache et remet les compteurs à zéro"""
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        """Renvoie un dictionnaire de statistiques (succès, échecs, taux, taille)"""
+        lookups = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'size': len(self.entries), 'maxsize': self.maxsize}
@@ -0,0 +1,411 @@
+# load_test.py
+# Test de charge local du serveur de parties (server.py): ouvre deux connexions par partie,
+# joue des coups légaux aléatoires à cadence de blitz et mesure la latence de relais
+# (envoi d'un coup par un joueur -> réception par son adversaire et par les spectateurs).
+#
+# Exemples:
+#   python load_test.py --games 5000 --duration 30
+#   python load_test.py --connect 127.0.0.1:5555 --games 1000
+#   python load_test.py --think-time 0 --games 2000 --clients 4 --server-workers 1 2 4   # débit
+#   python load_test.py --games 20 --spectators 200                                      # diffusion
+import argparse
+import asyncio
+import gc
+import multiprocessing
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+
+import protocol
+import server
+from bitboard import BitboardPosition, START_FEN
+from engine import move_to_game
+
+
+class LoadGame:
+    """Partie simulée: les deux joueurs partagent la position de référence et les heures d'envoi"""
+    def __init__(self, game_id, tester):
+        self.game_id = game_id
+        self.tester = tester
+        self.position = BitboardPosition.from_fen(START_FEN)
+        self.players = {}
+        self.spectators = []
+        self.sequence = 0
+        self.sent_at = {}  # Numéro de séquence -> heure d'envoi
+        self.over = False
+
+    def schedule(self, color):
+        """Programme le prochain coup du joueur après un temps de réflexion aléatoire"""
+        if not self.over and self.tester.running:
+            delay = random.uniform(0.5, 1.5) * self.tester.think_time
+            asyncio.get_running_loop().call_later(delay, self.play, color)
+
+    def play(self, color):
+        """Joue un coup légal au hasard et l'envoie au serveur"""
+        if self.over or not self.tester.running or 'wb'[self.position.turn] != color:
+            return
+        position = self.random_move() if self.sequence < self.tester.max_plies else None
+        if position is None:
+            self.over = True
+            self.tester.finished += 1
+            return
+        move, self.position = position
+        self.sequence += 1
+        self.sent_at[self.sequence] = time.perf_counter()
+        # L'adversaire et les spectateurs lisent l'heure d'envoi: seuls les derniers coups sont gardés
+        self.sent_at.pop(self.sequence - 8, None)
+        start, end, promotion = move_to_game(move)
+        self.players[color].send(protocol.encode_move(start, end, promotion, self.sequence, self.position.hash,
+                                                      sent_at=time.monotonic()))
+        if self.tester.recording:
+            self.tester.moves_sent += 1
+
+    def random_move(self):
+        """
+        Tire un coup légal au hasard et renvoie (coup, position suivante), ou None sans coup légal
+
+        Les coups pseudo-légaux sont essayés dans un ordre aléatoire: seul le coup retenu est
+        vérifié, ce qui laisse l'essentiel du processeur au serveur lorsqu'ils partagent un cœur.
+        """
+        color = self.position.turn
+        moves = self.position.generate_pseudo_moves()
+        random.shuffle(moves)
+        for move in moves:
+            child = self.position.make_move(move)
+            if not child.in_check(color):
+                return move, child
+        return None
+
+    def resync(self, message):
+        """Reprend la position complète envoyée par le serveur"""
+        self.position = BitboardPosition.from_board(message["board"], message["turn"],
+                                                    message["castling_rights"], message["en_passant_target"])
+        self.sequence = message["sequence"]
+        self.sent_at.clear()
+
+
+class LoadPlayer(asyncio.BufferedProtocol):
+    """Connexion d'un joueur simulé"""
+    def __init__(self, game, color):
+        self.game = game
+        self.color = color
+        self.frames = protocol.FrameBuffer()
+        self.transport = None
+        self.started = False
+
+    def connection_made(self, transport):
+        self.transport = transport
+        transport.get_extra_info('socket').setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.send(protocol.encode_join(self.game.game_id))
+
+    def get_buffer(self, sizehint):
+        return self.frames.free_space()
+
+    def buffer_updated(self, nbytes):
+        for message in self.frames.feed(nbytes):
+            self.handle_message(message)
+
+    def connection_lost(self, exc):
+        if self.game.tester.running:
+            self.game.tester.disconnected += 1
+        self.game.over = True
+
+    def send(self, frame):
+        if not self.transport.is_closing():
+            self.transport.write(frame)
+
+    def handle_message(self, message):
+        game = self.game
+        tester = game.tester
+        message_type = message["type"]
+        if message_type == "move":
+            sent_at = game.sent_at.get(message["sequence"])
+            if sent_at is not None and tester.recording:
+                tester.latencies.append(time.perf_counter() - sent_at)
+            if message["checksum"] != game.position.hash:
+                tester.mismatches += 1
+            game.schedule(self.color)
+        elif message_type == "game_state":
+            clock = message.get("clock")
+            if not self.started:
+                # Premier état avec l'horloge lancée: les deux joueurs sont là
+                if clock and clock["running"]:
+                    self.started = True
+                    if self.color == 'w':
+                        tester.started += 1
+                        game.schedule('w')
+                return
+            # Un état complet en cours de partie est une resynchronisation demandée par le serveur
+            tester.resyncs += 1
+            game.resync(message)
+            if 'wb'[game.position.turn] == self.color:
+                game.schedule(self.color)
+        elif message_type == "ping":
+            # Répondre comme un vrai client: le serveur en déduit le temps de transmission à rendre
+            now = time.monotonic()
+            self.send(protocol.encode_pong(message["sent_at"], now, now))
+        elif message_type == "joined" and message["color"] is None:
+            tester.rejected_joins += 1
+
+
+class LoadSpectator(asyncio.BufferedProtocol):
+    """Spectateur simulé: mesure la latence de diffusion des coups"""
+    def __init__(self, game):
+        self.game = game
+        self.frames = protocol.FrameBuffer()
+        self.transport = None
+        self.states = 0
+
+    def connection_made(self, transport):
+        self.transport = transport
+        transport.get_extra_info('socket').setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        transport.write(protocol.encode_watch(self.game.game_id))
+
+    def get_buffer(self, sizehint):
+        return self.frames.free_space()
+
+    def buffer_updated(self, nbytes):
+        tester = self.game.tester
+        for message in self.frames.feed(nbytes):
+            if message["type"] == "move":
+                sent_at = self.game.sent_at.get(message["sequence"])
+                if sent_at is not None and tester.recording:
+                    tester.spectator_latencies.append(time.perf_counter() - sent_at)
+            elif message["type"] == "game_state":
+                # Les deux premiers états sont l'abonnement et le début de partie
+                self.states += 1
+                if self.states > 2:
+                    tester.catch_ups += 1
+
+
+class LoadTester:
+    """Ouvre les parties simulées et agrège les mesures"""
+    def __init__(self, host, port, games, think_time, max_plies, spectators=0):
+        self.host = host
+        self.port = port
+        self.game_count = games
+        self.spectator_count = spectators  # Spectateurs par partie
+        self.think_time = think_time
+        self.max_plies = max_plies
+        self.games = []
+        self.running = True
+        self.recording = False  # Mesures ignorées pendant la mise en route
+        self.latencies = []
+        self.spectator_latencies = []
+        self.catch_ups = 0
+        self.moves_sent = 0
+        self.started = 0
+        self.finished = 0
+        self.resyncs = 0
+        self.mismatches = 0
+        self.rejected_joins = 0
+        self.disconnected = 0
+
+    async def connect(self, batch_size=200):
+        """Ouvre deux connexions par partie, par lots pour ne pas saturer la file d'attente du serveur"""
+        loop = asyncio.get_running_loop()
+        run_id = os.getpid()
+        for first in range(0, self.game_count, batch_size):
+            connections = []
+            for number in range(first, min(first + batch_size, self.game_count)):
+                game = LoadGame(f"charge-{run_id}-{number}", self)
+                self.games.append(game)
+                for _ in range(self.spectator_count):
+                    spectator = LoadSpectator(game)
+                    game.spectators.append(spectator)
+                    connections.append(loop.create_connection(lambda spectator=spectator: spectator,
+                                                              self.host, self.port))
+                for color in ('w', 'b'):
+                    game.players[color] = LoadPlayer(game, color)
+                    connections.append(loop.create_connection(lambda player=game.players[color]: player,
+                                                              self.host, self.port))
+            await asyncio.gather(*connections)
+
+    def close(self):
+        self.running = False
+        for game in self.games:
+            for player in list(game.players.values()) + game.spectators:
+                if player.transport is not None:
+                    player.transport.close()
+
+    def summary(self, seconds):
+        """Compteurs et latences de la mesure, à fusionner avec ceux des autres processus"""
+        return {'games': self.game_count, 'seconds': seconds, 'latencies': self.latencies,
+                'spectator_latencies': self.spectator_latencies, 'catch_ups': self.catch_ups,
+                'moves_sent': self.moves_sent, 'started': self.started, 'finished': self.finished,
+                'resyncs': self.resyncs, 'mismatches': self.mismatches,
+                'rejected_joins': self.rejected_joins, 'disconnected': self.disconnected}
+
+
+def merge_summaries(summaries):
+    """Additionne les bilans de plusieurs processus de charge (durée: la plus longue)"""
+    merged = dict(summaries[0], latencies=[], spectator_latencies=[])
+    for summary in summaries[1:]:
+        for key, value in summary.items():
+            if key == 'seconds':
+                merged[key] = max(merged[key], value)
+            elif not key.endswith('latencies'):
+                merged[key] += value
+    for summary in summaries:
+        merged['latencies'].extend(summary['latencies'])
+        merged['spectator_latencies'].extend(summary['spectator_latencies'])
+    return merged
+
+
+def _print_latencies(title, latencies):
+    """Affiche les percentiles d'une liste de latences triée (secondes)"""
+    def percentile(fraction):
+        return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1000
+    print(f"{title} sur {len(latencies)} coups: p50 {percentile(0.5):.2f} ms, "
+          f"p90 {percentile(0.9):.2f} ms, p99 {percentile(0.99):.2f} ms, max {latencies[-1] * 1000:.2f} ms")
+
+
+def report(summary):
+    """Affiche le débit et les percentiles de latence de relais"""
+    latencies = sorted(summary['latencies'])
+    seconds = summary['seconds']
+    print(f"{summary['started']}/{summary['games']} parties démarrées, {summary['finished']} terminées, "
+          f"{summary['moves_sent']} coups envoyés en {seconds:.1f}s ({summary['moves_sent'] / seconds:.0f} coups/s)")
+    if latencies:
+        _print_latencies("Latence de relais", latencies)
+    if summary['spectator_latencies']:
+        _print_latencies("Latence de diffusion aux spectateurs", sorted(summary['spectator_latencies']))
+        print(f"{summary['catch_ups']} rattrapages de spectateurs en retard")
+    print(f"{summary['resyncs']} resynchronisations, {summary['mismatches']} empreintes différentes, "
+          f"{summary['rejected_joins']} parties pleines, {summary['disconnected']} déconnexions", flush=True)
+
+
+async def run(host, port, games, duration, think_time, max_plies, warmup=5.0, spectators=0, verbose=True):
+    """
+    Connecte les parties, joue pendant duration secondes et renvoie le bilan
+
+    Args:
+        warmup: Secondes de jeu non mesurées après les connexions, le temps que le serveur
+                ait traité toutes les arrivées et que les coups s'étalent dans le temps
+        spectators: Nombre de spectateurs par partie
+        verbose: Affiche la mise en route et le bilan
+    """
+    # Même réglage du ramasse-miettes que le serveur: ses pauses seraient comptées à tort comme
+    # latence du serveur
+    freezer = server.configure_gc()
+    tester = LoadTester(host, port, games, think_time, max_plies, spectators)
+    start_time = time.perf_counter()
+    await tester.connect()
+    if verbose:
+        print(f"{games * (2 + spectators)} connexions ouvertes en {time.perf_counter() - start_time:.1f}s", flush=True)
+    # Les objets des parties vivent jusqu'à la fin: hors du ramasse-miettes sans attendre le gel périodique
+    gc.freeze()
+    await asyncio.sleep(warmup)
+
+    tester.recording = True
+    start_time = time.perf_counter()
+    await asyncio.sleep(duration)
+    summary = tester.summary(time.perf_counter() - start_time)
+    tester.close()
+    freezer.cancel()
+    if verbose:
+        report(summary)
+    return summary
+
+
+def _run_client(args):
+    """Point d'entrée d'un processus de charge"""
+    seed, run_args = args
+    random.seed(seed)
+    return asyncio.run(run(*run_args, verbose=False))
+
+
+def run_clients(host, port, games, duration, think_time, max_plies, warmup, spectators=0, clients=1, seed=None):
+    """Répartit les parties entre clients processus de charge et renvoie le bilan fusionné"""
+    if clients <= 1:
+        return asyncio.run(run(host, port, games, duration, think_time, max_plies, warmup, spectators))
+    counts = [games // clients + (index < games % clients) for index in range(clients)]
+    tasks = [(None if seed is None else seed + index,
+              (host, port, count, duration, think_time, max_plies, warmup, spectators))
+             for index, count in enumerate(counts)]
+    with multiprocessing.Pool(clients) as pool:
+        summary = merge_summaries(pool.map(_run_client, tasks))
+    report(summary)
+    return summary
+
+
+def free_port():
+    """Port TCP libre sur la boucle locale"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port, stats_interval, workers=1):
+    """Lance server.py dans un autre processus et attend que le port accepte les connexions"""
+    command = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server.py'),
+               '--host', '127.0.0.1', '--port', str(port), '--stats-interval', str(stats_interval),
+               '--workers', str(workers)]
+    server = subprocess.Popen(command)
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+            return server
+        except OSError:
+            time.sleep(0.05)
+    server.kill()
+    raise RuntimeError("Le serveur de parties n'a pas démarré")
+
+
+def main(argv=None):
+    """Point d'entrée en ligne de commande"""
+    parser = argparse.ArgumentParser(description="Test de charge du serveur de parties")
+    parser.add_argument('--games', type=int, default=5000, help="Nombre de parties simultanées (5000 par défaut)")
+    parser.add_argument('--duration', type=float, default=30, help="Durée de la mesure en secondes (30 par défaut)")
+    parser.add_argument('--think-time', type=float, default=4.5,
+                        help="Temps de réflexion moyen par demi-coup en secondes (4.5 par défaut, "
+                             "soit une partie de 80 demi-coups en 6 minutes)")
+    parser.add_argument('--warmup', type=float, default=5,
+                        help="Secondes de jeu non mesurées avant la mesure (5 par défaut)")
+    parser.add_argument('--max-plies', type=int, default=200, help="Nombre de demi-coups maximal par partie")
+    parser.add_argument('--connect', metavar='HOTE:PORT',
+                        help="Serveur déjà lancé à utiliser (sinon server.py est lancé localement)")
+    parser.add_argument('--seed', type=int, help="Graine des coups aléatoires")
+    parser.add_argument('--spectators', type=int, default=0,
+                        help="Spectateurs par partie (0 par défaut)")
+    parser.add_argument('--clients', type=int, default=1,
+                        help="Nombre de processus de charge (1 par défaut)")
+    parser.add_argument('--server-workers', type=int, nargs='+', default=[1],
+                        help="Nombres de processus du serveur à comparer (server.py --workers)")
+    args = parser.parse_args(argv)
+    random.seed(args.seed)
+
+    if args.connect:
+        host, _, port = args.connect.rpartition(':')
+        run_clients(host, int(port), args.games, args.duration, args.think_time, args.max_plies,
+                    args.warmup, args.spectators, args.clients, args.seed)
+        return 0
+
+    results = []
+    for workers in sorted(set(args.server_workers)):
+        print(f"--- Serveur à {workers} processus", flush=True)
+        port = free_port()
+        server = start_server(port, max(1.0, args.duration / 6), workers)
+        try:
+            summary = run_clients('127.0.0.1', port, args.games, args.duration, args.think_time,
+                                  args.max_plies, args.warmup, args.spectators, args.clients, args.seed)
+        finally:
+            server.terminate()
+            server.wait()
+        results.append((workers, summary['moves_sent'] / summary['seconds']))
+
+    if len(results) > 1:
+        baseline = results[0][1]
+        print(f"Débit du serveur selon le nombre de processus ({multiprocessing.cpu_count()} cœurs):")
+        for workers, moves_per_second in results:
+            speedup = moves_per_second / baseline if baseline else 0
+            print(f"  {workers:>3} processus: {moves_per_second:>8,.0f} coups/s, accélération x{speedup:.2f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
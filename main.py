@@ -1,19 +1,19 @@
 import pygame
+import math
 import sys
 import time
-import socket
-import threading
-import pickle
-from chess_pieces import create_piece
-from chess_clock import ChessClock
-from network import NetworkHost, NetworkClient
+import assets
+import chess_game
+import constants
+import text_cache
 from chatsysteme import ChatSystem
 
-pygame.init()
+# Taille du plateau (carré), recalculée par resize_display() quand la fenêtre change de taille
 WIDTH, HEIGHT = (600, 600)
 SQUARE_SIZE = WIDTH // 8
-WINDOW = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Jeu d'Échecs Multijoueur")
+WINDOW = None  # Fenêtre ouverte par init_display(), jamais à l'import
+BOARD = None  # Zone de la fenêtre où sont dessinés le plateau et les menus (sous-surface centrée)
+BOARD_ORIGIN = (0, 0)  # Coin de cette zone dans la fenêtre
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 GRAY = (128, 128, 128)
@@ -22,503 +22,412 @@ DARK_SQUARE = (181, 136, 99)
 HIGHLIGHT = (186, 202, 68)
 MOVE_HIGHLIGHT = (106, 135, 77, 150)
 CHECK_HIGHLIGHT = (214, 85, 80, 200)
+# Événement posté par les threads réseau et moteur pour sortir la boucle de son attente
+WAKEUP_EVENT = pygame.event.custom_type()
+MAX_IDLE_WAIT = 1.0  # Attente maximale sans événement (secondes), par sécurité
+
+def init_display():
+    """Initialise uniquement l'affichage et les polices (pas de son ni de manettes) et ouvre la fenêtre"""
+    pygame.display.init()
+    pygame.font.init()
+    pygame.display.set_mode((WIDTH, HEIGHT), pygame.RESIZABLE)
+    pygame.display.set_caption("Jeu d'Échecs Multijoueur")
+    resize_display()
+    return WINDOW
+
+def resize_display():
+    """Adapte la taille des cases à la fenêtre (ouverte ou redimensionnée): le plateau reste carré et centré"""
+    global WINDOW, BOARD, BOARD_ORIGIN, WIDTH, HEIGHT, SQUARE_SIZE
+    WINDOW = pygame.display.get_surface()
+    width, height = WINDOW.get_size()
+    SQUARE_SIZE = max(min(width, height) // 8, 1)
+    WIDTH = HEIGHT = SQUARE_SIZE * 8
+    BOARD_ORIGIN = ((width - WIDTH) // 2, (height - HEIGHT) // 2)
+    BOARD = WINDOW.subsurface(pygame.Rect(BOARD_ORIGIN, (WIDTH, HEIGHT)))
+    constants.scale_fonts(SQUARE_SIZE)
+
+def menu_rect(top, width=4, height=1):
+    """
+    Rectangle centré horizontalement sur le plateau, mesuré en douzièmes de sa hauteur
+    (50 pixels dans la fenêtre de départ) pour que les menus suivent la taille de la fenêtre
+    """
+    unit = HEIGHT / 12
+    return pygame.Rect(round((WIDTH - width * unit) / 2), round(top * unit), round(width * unit), round(height * unit))
+
+def draw_button(rect, label, color):
+    """Dessine un bouton de menu avec son libellé centré"""
+    pygame.draw.rect(BOARD, color, rect)
+    text = text_cache.render(constants.TITLE_FONT, label, WHITE)
+    BOARD.blit(text, text.get_rect(center=rect.center))
+
+def draw_caption(text, top):
+    """Texte centré horizontalement sur le plateau à la hauteur donnée (en douzièmes)"""
+    BOARD.blit(text, text.get_rect(midtop=(WIDTH // 2, round(top * HEIGHT / 12))))
+
+def board_pos(pos):
+    """Position dans la fenêtre -> position sur le plateau"""
+    return pos[0] - BOARD_ORIGIN[0], pos[1] - BOARD_ORIGIN[1]
+
+def board_event(event):
+    """Événement souris ramené aux coordonnées du plateau (les autres sont renvoyés tels quels)"""
+    if not hasattr(event, 'pos'):
+        return event
+    return pygame.event.Event(event.type, {**event.dict, 'pos': board_pos(event.pos)})
+
+def post_wakeup():
+    """Réveille la boucle principale (appelable depuis n'importe quel thread)"""
+    try:
+        pygame.event.post(pygame.event.Event(WAKEUP_EVENT))
+    except pygame.error:
+        pass  # File d'événements pleine: la boucle est de toute façon réveillée
+
+def wait_events(timeout=None):
+    """
+    Attend le prochain événement puis renvoie tous ceux en attente, sans tourner à vide
+
+    Args:
+        timeout: Attente maximale en secondes (None: jusqu'au prochain événement, 0: aucune)
+    """
+    if timeout is not None and timeout <= 0:
+        return pygame.event.get()
+    if timeout is None:
+        first = pygame.event.wait()
+    else:
+        first = pygame.event.wait(math.ceil(timeout * 1000))
+    if first.type == pygame.NOEVENT:
+        return []
+    return [first] + pygame.event.get()
+
+PIECE_ATLAS = assets.PieceAtlas()
 
 def load_images():
-    """Charge les images des pièces d'échecs depuis le dossier 'images'"""
-    pieces = ['wp', 'wR', 'wN', 'wB', 'wQ', 'wK', 'bp', 'bR', 'bN', 'bB', 'bQ', 'bK']
-    images = {}
-    for piece in pieces:
-        try:
-            images[piece] = pygame.transform.scale(pygame.image.load(f'images/{piece}.png'), (SQUARE_SIZE, SQUARE_SIZE))
-        except:
-            print(f"Impossible de charger l'image pour {piece}. Utilisation d'une représentation simple.")
-            images[piece] = None
-    return images
-
-class ChessGame:
-    def __init__(self):
-        """Initialise une nouvelle partie d'échecs"""
-        self.board = self.create_board()
-        self.piece_objects = self.create_piece_objects()  # Crée les objets de pièces
-        self.selected_piece = None
-        self.turn = 'w'
-        self.valid_moves = []
-        self.images = load_images()
-        self.network = None
-        self.is_host = False
-        self.game_id = None
-        self.player_color = None
-        self.move_history = []
-        self.king_positions = {'w': (7, 4), 'b': (0, 4)}
-        self.in_check = {'w': False, 'b': False}
-        self.game_status = 'Playing'
-        self.castling_rights = {'w': {'kingside': True, 'queenside': True}, 'b': {'kingside': True, 'queenside': True}}
-        self.en_passant_target = None
-        self.clock = None
-        self.time_mode = 'Standard'
-        self.game_started = False
-        self.chat = ChatSystem()
+    """
+    Images des pièces à la taille de case courante: pack pré-redimensionné (généré au premier
+    lancement), ou atlas mis à l'échelle une seule fois par nouvelle taille de fenêtre
+    """
+    return PIECE_ATLAS.images(SQUARE_SIZE)
 
-    def create_board(self):
-        """Crée et retourne le plateau initial"""
-        board = [
-            ['bR', 'bN', 'bB', 'bQ', 'bK', 'bB', 'bN', 'bR'],
-            ['bp', 'bp', 'bp', 'bp', 'bp', 'bp', 'bp', 'bp'],
-            ['--', '--', '--', '--', '--', '--', '--', '--'],
-            ['--', '--', '--', '--', '--', '--', '--', '--'],
-            ['--', '--', '--', '--', '--', '--', '--', '--'],
-            ['--', '--', '--', '--', '--', '--', '--', '--'],
-            ['wp', 'wp', 'wp', 'wp', 'wp', 'wp', 'wp', 'wp'],
-            ['wR', 'wN', 'wB', 'wQ', 'wK', 'wB', 'wN', 'wR']
-        ]
-        return board
-    
-    def create_piece_objects(self):
-        """Crée les objets de pièces à partir du tableau"""
-        piece_objects = [[None for _ in range(8)] for _ in range(8)]
-        for row in range(8):
-            for col in range(8):
-                piece_code = self.board[row][col]
-                if piece_code != '--':
-                    piece_objects[row][col] = create_piece(piece_code, (row, col))
-        return piece_objects
-    
-    def update_piece_objects(self):
-        """Met à jour les objets de pièces après un mouvement"""
+class BoardRenderer:
+    """
+    Dessin du plateau par rectangles modifiés
+
+    Le damier est pré-rendu une fois. À chaque image, l'état de chaque case (pièce, sélection,
+    coup possible, échec) et de chaque incrustation (statut, horloge, chat) est comparé à celui
+    de l'image précédente: seules les zones qui ont changé sont redessinées, et draw() renvoie
+    leurs rectangles pour pygame.display.update().
+    """
+    # Au-delà, une mise à jour de tout l'écran coûte moins que les rectangles séparés
+    MAX_DIRTY_RECTS = 24
+
+    def __init__(self, game):
+        self.game = game
+        self.background = None  # Damier pré-rendu
+        self.check_surface = None  # Surlignage semi-transparent du roi en échec
+        self.squares = {}  # (ligne, colonne) -> état dessiné
+        self.overlays = {}  # Nom -> (état dessiné, rectangles)
+        self.full_redraw = True
+
+    def invalidate(self):
+        """Tout redessiner à la prochaine image (retour du menu, fenêtre découverte)"""
+        self.full_redraw = True
+
+    def reset(self):
+        """Nouvelle taille de case: surfaces pré-rendues à refaire, tout est à redessiner"""
+        self.background = None
+        self.squares = {}
+        self.overlays = {}
+        self.full_redraw = True
+
+    def _build_surfaces(self):
+        """Pré-rend le damier et le surlignage d'échec"""
+        self.background = pygame.Surface((WIDTH, HEIGHT))
         for row in range(8):
             for col in range(8):
-                piece_code = self.board[row][col]
-                if piece_code != '--' and self.piece_objects[row][col] is None:
-                    self.piece_objects[row][col] = create_piece(piece_code, (row, col))
-                elif piece_code == '--':
-                    self.piece_objects[row][col] = None
-                elif self.piece_objects[row][col] and self.piece_objects[row][col].notation != piece_code:
-                    self.piece_objects[row][col] = create_piece(piece_code, (row, col))
+                color = LIGHT_SQUARE if (row + col) % 2 == 0 else DARK_SQUARE
+                self.background.fill(color, pygame.Rect(col * SQUARE_SIZE, row * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE))
+        self.background = self.background.convert()
+        self.check_surface = pygame.Surface((SQUARE_SIZE, SQUARE_SIZE), pygame.SRCALPHA)
+        self.check_surface.fill(CHECK_HIGHLIGHT)
 
-    def draw_board(self, window):
-        """Dessine le plateau et les pièces"""
+    def square_state(self, row, col, valid_moves):
+        """Ce qui est dessiné sur une case"""
+        game = self.game
+        checked = any(game.in_check[color] and game.king_positions[color] == (row, col) for color in ('w', 'b'))
+        return game.board[row][col], game.selected_piece == (row, col), (row, col) in valid_moves, checked
+
+    def status_rect(self):
+        """Bandeau du message de fin de partie, au milieu du plateau (50 pixels au départ)"""
+        band = SQUARE_SIZE * 2 // 3
+        return pygame.Rect(0, (HEIGHT - band) // 2, WIDTH, band)
+
+    def overlay_states(self):
+        """Incrustations affichées par-dessus le plateau, dans l'ordre de dessin: nom -> (état, rectangles)"""
+        game = self.game
+        overlays = {}
+        if game.game_status != 'Playing':
+            overlays['status'] = (game.game_status, (self.status_rect(),))
+        if game.clock:
+            overlays['clock'] = (game.clock.display_state(), game.clock.rects(WIDTH, HEIGHT))
+        if hasattr(game, 'chat'):
+            overlays['chat'] = (game.chat.display_state(), (game.chat.area(WIDTH, HEIGHT),))
+        return overlays
+
+    def draw(self, window):
+        """
+        Redessine ce qui a changé depuis l'image précédente
+
+        Returns:
+            Rectangles de l'écran à mettre à jour (liste vide si rien n'a changé)
+        """
+        if self.background is None:
+            self._build_surfaces()
+        valid_moves = set(self.game.valid_moves)
+        dirty = []
+
+        squares = {}
         for row in range(8):
             for col in range(8):
-                color = LIGHT_SQUARE if (row + col) % 2 == 0 else DARK_SQUARE
-                pygame.draw.rect(window, color, pygame.Rect(col * SQUARE_SIZE, row * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE))
-                piece = self.board[row][col]
-                if piece != '--' and self.images.get(piece):
-                    window.blit(self.images[piece], pygame.Rect(col * SQUARE_SIZE, row * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE))
-                elif piece != '--':
-                    font = pygame.font.SysFont('Arial', 30)
-                    text = font.render(piece, True, WHITE if piece[0] == 'b' else BLACK)
-                    window.blit(text, (col * SQUARE_SIZE + 15, row * SQUARE_SIZE + 15))
-                
-                if self.selected_piece == (row, col):
-                    pygame.draw.rect(window, HIGHLIGHT, pygame.Rect(col * SQUARE_SIZE, row * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE), 3)
-                
-                if (row, col) in self.valid_moves:
-                    if self.board[row][col] != '--':
-                        pygame.draw.circle(window, MOVE_HIGHLIGHT, (col * SQUARE_SIZE + SQUARE_SIZE // 2, row * SQUARE_SIZE + SQUARE_SIZE // 2), SQUARE_SIZE // 2 - 5, 3)
-                    else:
-                        pygame.draw.circle(window, MOVE_HIGHLIGHT, (col * SQUARE_SIZE + SQUARE_SIZE // 2, row * SQUARE_SIZE + SQUARE_SIZE // 2), SQUARE_SIZE // 6)
-        
-        # Afficher les rois en échec
-        for color in ['w', 'b']:
-            if self.in_check[color]:
-                king_row, king_col = self.king_positions[color]
-                king_rect = pygame.Rect(king_col * SQUARE_SIZE, king_row * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE)
-                s = pygame.Surface((SQUARE_SIZE, SQUARE_SIZE), pygame.SRCALPHA)
-                s.fill(CHECK_HIGHLIGHT)
-                window.blit(s, king_rect)
-        
-        # Afficher le statut de la partie
-        if self.game_status != 'Playing':
-            status_surface = pygame.Surface((WIDTH, 50), pygame.SRCALPHA)
-            status_surface.fill((0, 0, 0, 180))
-            window.blit(status_surface, (0, HEIGHT // 2 - 25))
-            font = pygame.font.SysFont('Arial', 36)
-            text = font.render(self.game_status, True, WHITE)
-            window.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT // 2 - text.get_height() // 2))
-        
-        # Afficher l'horloge
+                state = squares[row, col] = self.square_state(row, col, valid_moves)
+                if self.squares.get((row, col)) != state:
+                    dirty.append(pygame.Rect(col * SQUARE_SIZE, row * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE))
+        self.squares = squares
+
+        # Une incrustation qui change ou disparaît libère aussi la zone qu'elle couvrait
+        overlays = self.overlay_states()
+        for name in self.overlays.keys() | overlays.keys():
+            old, new = self.overlays.get(name), overlays.get(name)
+            if old != new:
+                for entry in (old, new):
+                    if entry:
+                        dirty.extend(entry[1])
+        self.overlays = overlays
+
+        if self.full_redraw or len(dirty) > self.MAX_DIRTY_RECTS:
+            dirty = [window.get_rect()]
+            self.full_redraw = False
+        for rect in dirty:
+            window.set_clip(rect)
+            self._paint(window, rect, valid_moves)
+        window.set_clip(None)
+        return dirty
+
+    def _paint(self, window, rect, valid_moves):
+        """Redessine une zone: damier, cases qu'elle touche, puis incrustations qui la recouvrent"""
+        window.blit(self.background, rect, rect)
+        first_row, last_row = max(rect.top // SQUARE_SIZE, 0), min((rect.bottom - 1) // SQUARE_SIZE, 7)
+        first_col, last_col = max(rect.left // SQUARE_SIZE, 0), min((rect.right - 1) // SQUARE_SIZE, 7)
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                self._draw_square(window, row, col, self.squares[row, col])
+
+        game = self.game
+        for name, (_, rects) in self.overlays.items():
+            if rect.collidelist(rects) == -1:
+                continue
+            if name == 'status':
+                status_rect = self.status_rect()
+                status_surface = pygame.Surface(status_rect.size, pygame.SRCALPHA)
+                status_surface.fill((0, 0, 0, 180))
+                window.blit(status_surface, status_rect)
+                text = text_cache.render(constants.STATUS_FONT, game.game_status, WHITE)
+                window.blit(text, text.get_rect(center=status_rect.center))
+            elif name == 'clock':
+                game.clock.draw(window, constants.CLOCK_FONT, WIDTH, HEIGHT)
+            elif name == 'chat':
+                game.chat.draw(window, constants.CHAT_FONT, WIDTH, HEIGHT)
+
+    def _draw_square(self, window, row, col, state):
+        """Pièce et marques d'une case (le damier est déjà en place)"""
+        piece, selected, valid, checked = state
+        square = pygame.Rect(col * SQUARE_SIZE, row * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE)
+        if piece != '--' and self.game.images.get(piece):
+            window.blit(self.game.images[piece], square)
+        elif piece != '--':
+            text = text_cache.render(constants.PIECE_FONT, piece, WHITE if piece[0] == 'b' else BLACK)
+            window.blit(text, text.get_rect(center=square.center))
+
+        if selected:
+            pygame.draw.rect(window, HIGHLIGHT, square, 3)
+
+        if valid:
+            if piece != '--':
+                pygame.draw.circle(window, MOVE_HIGHLIGHT, square.center, SQUARE_SIZE // 2 - 5, 3)
+            else:
+                pygame.draw.circle(window, MOVE_HIGHLIGHT, square.center, SQUARE_SIZE // 6)
+
+        if checked:
+            window.blit(self.check_surface, square)
+
+
+class ChessGame(chess_game.ChessGame):
+    """Partie affichée avec pygame: images des pièces, dessin du plateau, clics et chat"""
+    def __init__(self, use_bitboards=False):
+        super().__init__(use_bitboards)
+        self.images = load_images()
+        self.chat = ChatSystem()
+        self.renderer = BoardRenderer(self)
+        self.wakeup = post_wakeup
+
+    def resize(self):
+        """Reprend les images et le rendu à la taille de case courante (après resize_display)"""
+        self.images = load_images()
+        self.renderer.reset()
+
+    def idle_timeout(self):
+        """
+        Secondes avant que l'écran ne doive changer sans événement: chiffre suivant de
+        l'horloge ou prochaine échéance (les messages réseau et le moteur réveillent la
+        boucle eux-mêmes), 0 si une image complète est en attente
+        """
+        if self.renderer.full_redraw:
+            return 0
+        delays = [MAX_IDLE_WAIT]
         if self.clock:
-            clock_font = pygame.font.SysFont('Arial', 24)
-            self.clock.draw(window, clock_font, WIDTH, HEIGHT)
-            
-        # Afficher le chat
-        if hasattr(self, 'chat') and self.chat.chat_visible:
-            small_font = pygame.font.SysFont('Arial', 16)
-            self.chat.draw(window, small_font, WIDTH, HEIGHT)
+            change = self.clock.next_display_change()
+            if change is not None:
+                delays.append(change)
+        deadline = self.timers.next_deadline()
+        if deadline is not None:
+            delays.append(max(0.0, deadline - time.monotonic()))
+        return min(delays)
+
+    def draw_board(self, window):
+        """
+        Dessine le plateau, les pièces et les incrustations (seulement ce qui a changé)
+
+        Returns:
+            Rectangles à passer à pygame.display.update()
+        """
+        return self.renderer.draw(window)
 
     def select_piece(self, pos):
-        """Gère la sélection d'une pièce et son déplacement"""
-        if self.game_status != 'Playing':
-            return
-            
-        col, row = (pos[0] // SQUARE_SIZE, pos[1] // SQUARE_SIZE)
-        
-        # Vérifier si c'est le tour du joueur
-        if self.player_color and self.turn != self.player_color:
-            return
-            
-        if self.selected_piece:
-            # Si on clique sur la même pièce, désélectionner
-            if self.selected_piece == (row, col):
-                self.selected_piece = None
-                self.valid_moves = []
-                return
-                
-            # Si on clique sur une case valide, déplacer la pièce
-            if (row, col) in self.valid_moves:
-                self.move_piece(self.selected_piece, (row, col))
-                self.selected_piece = None
-                self.valid_moves = []
-                return
-                
-            # Si on clique sur une autre pièce de même couleur, la sélectionner
-            piece = self.board[row][col]
-            if piece != '--' and piece[0] == self.turn:
-                self.selected_piece = (row, col)
-                self.valid_moves = self.get_valid_moves((row, col))
-                return
-                
-            # Sinon, désélectionner
-            self.selected_piece = None
-            self.valid_moves = []
-        else:
-            # Sélectionner une pièce si elle est de la bonne couleur
-            piece = self.board[row][col]
-            if piece != '--' and piece[0] == self.turn:
-                self.selected_piece = (row, col)
-                self.valid_moves = self.get_valid_moves((row, col))
-
-    def get_piece_moves(self, pos):
-        """Obtient tous les mouvements possibles pour une pièce spécifique en utilisant les objets de pièces"""
-        row, col = pos
-        piece_obj = self.piece_objects[row][col]
-        
-        if not piece_obj:
-            return []
-            
-        # Utilise la méthode get_moves définie dans chess_pieces.py
-        return piece_obj.get_moves(self.board)
+        """Gère la sélection d'une pièce et son déplacement à partir d'une position en pixels"""
+        if not (0 <= pos[0] < WIDTH and 0 <= pos[1] < HEIGHT):
+            return  # Clic dans la marge autour du plateau
+        self.select_square((pos[1] // SQUARE_SIZE, pos[0] // SQUARE_SIZE))
 
-    def get_all_possible_moves(self, color):
-        """Obtient tous les mouvements possibles pour une couleur, sans vérifier l'échec"""
-        moves = []
-        for row in range(8):
-            for col in range(8):
-                piece = self.board[row][col]
-                if piece != '--' and piece[0] == color:
-                    piece_moves = self.get_piece_moves((row, col))
-                    moves.extend([((row, col), move) for move in piece_moves])
-        return moves
-
-    def is_in_check(self, color):
-        """Vérifie si le roi de la couleur spécifiée est en échec"""
-        king_row, king_col = self.king_positions[color]
-        opponent_color = 'b' if color == 'w' else 'w'
-        
-        for start_pos, end_pos in self.get_all_possible_moves(opponent_color):
-            if end_pos == (king_row, king_col):
-                return True
-        return False
-
-    def get_valid_moves(self, pos):
-        """Obtient tous les mouvements valides pour une pièce, en tenant compte de l'échec"""
-        row, col = pos
-        piece = self.board[row][col]
-        color = piece[0]
-        possible_moves = self.get_piece_moves(pos)
-        valid_moves = []
-        
-        for move in possible_moves:
-            end_row, end_col = move
-            captured_piece = self.board[end_row][end_col]
-            
-            # Sauvegarder l'état actuel
-            king_pos = self.king_positions[color]
-            
-            # Si c'est le roi qui bouge, mettre à jour sa position
-            if piece[1] == 'K':
-                self.king_positions[color] = (end_row, end_col)
-                
-            # Simuler le mouvement
-            self.board[end_row][end_col] = piece
-            self.board[row][col] = '--'
-            
-            # Vérifier si le roi est en échec après ce mouvement
-            in_check = self.is_in_check(color)
-            
-            # Restaurer l'état précédent
-            self.board[row][col] = piece
-            self.board[end_row][end_col] = captured_piece
-            
-            if piece[1] == 'K':
-                self.king_positions[color] = king_pos
-                
-            # Si le mouvement ne met pas le roi en échec, il est valide
-            if not in_check:
-                valid_moves.append(move)
-                
-        return valid_moves
-
-    def move_piece(self, start, end):
-        """Déplace une pièce et gère les règles spéciales (promotion, roque, etc.)"""
-        start_row, start_col = start
-        end_row, end_col = end
-        moved_piece = self.board[start_row][start_col]
-        captured_piece = self.board[end_row][end_col]
-        
-        # Enregistrer le mouvement dans l'historique
-        self.move_history.append((start, end, moved_piece, captured_piece))
-        
-        # Gérer le roque
-        if moved_piece[1] == 'K' and abs(start_col - end_col) == 2:
-            if end_col > start_col:  # Roque côté roi
-                self.board[end_row][end_col - 1] = self.board[end_row][7]
-                self.board[end_row][7] = '--'
-            else:  # Roque côté dame
-                self.board[end_row][end_col + 1] = self.board[end_row][0]
-                self.board[end_row][0] = '--'
-        
-        # Gérer la prise en passant
-        if moved_piece[1] == 'p' and start_col != end_col and captured_piece == '--':
-            self.board[start_row][end_col] = '--'
-        
-        # Réinitialiser la cible de prise en passant
-        self.en_passant_target = None
-        
-        # Définir une nouvelle cible de prise en passant si un pion avance de deux cases
-        if moved_piece[1] == 'p' and abs(start_row - end_row) == 2:
-            self.en_passant_target = (start_row + (end_row - start_row) // 2, start_col)
-        
-        # Déplacer la pièce
-        self.board[end_row][end_col] = moved_piece
-        self.board[start_row][start_col] = '--'
-        
-        # Mettre à jour les objets de pièces
-        self.update_piece_objects()
-        
-        # Promotion du pion
-        if moved_piece[1] == 'p' and (end_row == 0 or end_row == 7):
-            self.board[end_row][end_col] = moved_piece[0] + 'Q'
-            self.update_piece_objects()
-        
-        # Mettre à jour la position du roi
-        if moved_piece[1] == 'K':
-            self.king_positions[moved_piece[0]] = (end_row, end_col)
-        
-        # Mettre à jour les droits de roque
-        if moved_piece[1] == 'K':
-            self.castling_rights[moved_piece[0]]['kingside'] = False
-            self.castling_rights[moved_piece[0]]['queenside'] = False
-        elif moved_piece[1] == 'R':
-            if start_col == 7:  # Tour côté roi
-                self.castling_rights[moved_piece[0]]['kingside'] = False
-            elif start_col == 0:  # Tour côté dame
-                self.castling_rights[moved_piece[0]]['queenside'] = False
+
+def choose_time_mode(clock, running=True):
+    """Affiche le menu de sélection du mode de temps et renvoie (mode choisi ou None, running)"""
+    time_selection_active = True
+    selected_mode = None
+
+    # Menu de sélection du mode de temps
+    while time_selection_active and running:
+        WINDOW.fill(LIGHT_SQUARE)
         
-        # Changer de tour
-        self.turn = 'b' if self.turn == 'w' else 'w'
+        small_font = constants.SMALL_FONT
+        draw_caption(text_cache.render(constants.TITLE_FONT, 'Choisissez un mode de jeu', BLACK), 2)
         
-        # Gérer l'horloge
-        if self.clock and self.game_started:
-            self.clock.switch()
+        # Bouton Blitz
+        blitz_button = menu_rect(4)
+        draw_button(blitz_button, 'Blitz', DARK_SQUARE)
+        draw_caption(text_cache.render(small_font, '3min + 2sec', BLACK), 5.2)
         
-        # Vérifier l'échec
-        self.in_check['w'] = self.is_in_check('w')
-        self.in_check['b'] = self.is_in_check('b')
+        # Bouton Rapide
+        rapid_button = menu_rect(6)
+        draw_button(rapid_button, 'Rapide', DARK_SQUARE)
+        draw_caption(text_cache.render(small_font, '10min + 5sec', BLACK), 7.2)
         
-        # Vérifier fin de partie
-        self.check_game_over()
+        # Bouton Standard
+        standard_button = menu_rect(8)
+        draw_button(standard_button, 'Standard', DARK_SQUARE)
+        draw_caption(text_cache.render(small_font, '30min', BLACK), 9.2)
         
-        # Envoyer le mouvement et l'état du jeu via le réseau
-        if self.network:
-            self.network.send_move(start, end)
-            time.sleep(0.1)
-            self.network.send_game_state()
-
-    def check_game_over(self):
-        """Vérifie si la partie est terminée (échec et mat, pat ou temps écoulé)"""
-        # Vérifier si le temps est écoulé
-        if self.clock and self.clock.game_over:
-            winner = 'Blancs' if self.clock.timeout_color == 'b' else 'Noirs'
-            self.game_status = f'Temps écoulé! {winner} gagnent!'
-            return
+        # Bouton Retour
+        back_button = menu_rect(10)
+        draw_button(back_button, 'Retour', GRAY)
         
-        # Vérifier si le joueur actuel a des mouvements légaux
-        has_valid_moves = False
-        for row in range(8):
-            for col in range(8):
-                piece = self.board[row][col]
-                if piece != '--' and piece[0] == self.turn:
-                    moves = self.get_valid_moves((row, col))
-                    if moves:
-                        has_valid_moves = True
-                        break
-            if has_valid_moves:
-                break
+        pygame.display.flip()
         
-        # Si aucun mouvement légal, c'est soit échec et mat soit pat
-        if not has_valid_moves:
-            if self.in_check[self.turn]:
-                winner = 'Blancs' if self.turn == 'b' else 'Noirs'
-                self.game_status = f'Échec et mat! {winner} gagnent!'
-            else:
-                self.game_status = 'Pat! Match nul!'
-
-    def setup_clock(self, time_mode='Standard'):
-        """Configure l'horloge selon le mode de temps choisi"""
-        self.time_mode = time_mode
-        if time_mode == 'Blitz':
-            self.clock = ChessClock(180, 2)  # 3 minutes + 2 secondes par coup
-        elif time_mode == 'Rapide':
-            self.clock = ChessClock(600, 5)  # 10 minutes + 5 secondes par coup
-        elif time_mode == 'Standard':
-            self.clock = ChessClock(1800, 0)  # 30 minutes sans incrément
-        else:
-            self.clock = ChessClock(600, 0)  # 10 minutes par défaut
-        self.game_started = False
-
-    def start_game(self):
-        """Démarre la partie et l'horloge"""
-        if self.clock and (not self.game_started):
-            self.clock.start('w')
-            self.game_started = True
-
-    def host_game(self, port=5555):
-        """Démarre un jeu en tant qu'hôte"""
-        self.is_host = True
-        self.player_color = 'w'  # L'hôte joue les blancs
-        self.network = NetworkHost(self, port)
-        self.network.start()
-        return True
-
-    def join_game(self, host, port=5555):
-        """Rejoint un jeu en tant que client"""
-        self.is_host = False
-        self.player_color = 'b'  # Le client joue les noirs
-        self.network = NetworkClient(self, host, port)
-        connected = self.network.connect()
-        if connected:
-            self.network.start()
-        return connected
-
-
-def main():
-    """Fonction principale du jeu"""
+        # Menu immobile: on dort jusqu'au prochain événement
+        for mode_event in wait_events():
+            if mode_event.type == pygame.QUIT:
+                time_selection_active = False
+                running = False
+            elif mode_event.type == pygame.VIDEORESIZE:
+                resize_display()
+            if mode_event.type == pygame.MOUSEBUTTONDOWN:
+                mode_mouse_pos = board_pos(pygame.mouse.get_pos())
+                if blitz_button.collidepoint(mode_mouse_pos):
+                    selected_mode = 'Blitz'
+                    time_selection_active = False
+                elif rapid_button.collidepoint(mode_mouse_pos):
+                    selected_mode = 'Rapide'
+                    time_selection_active = False
+                elif standard_button.collidepoint(mode_mouse_pos):
+                    selected_mode = 'Standard'
+                    time_selection_active = False
+                elif back_button.collidepoint(mode_mouse_pos):
+                    time_selection_active = False
+                    selected_mode = None
+        clock.tick(30)
+    return selected_mode, running
+
+
+def main(exit_after_first_frame=False):
+    """
+    Fonction principale du jeu
+
+    Args:
+        exit_after_first_frame: Quitte dès la première image affichée (mesure du démarrage,
+                                voir startup_benchmark.py)
+    """
+    init_display()
     game = ChessGame()
     clock = pygame.time.Clock()
     running = True
     menu_active = True
     selected_mode = None
     
-    # Polices
-    font = pygame.font.SysFont('Arial', 36)
-    small_font = pygame.font.SysFont('Arial', 24)
-    
     while running:
         # Menu principal
         while menu_active and running:
             WINDOW.fill(LIGHT_SQUARE)
             
             # Titre
-            title = font.render("Jeu d'Échecs Multijoueur", True, BLACK)
-            WINDOW.blit(title, (WIDTH // 2 - title.get_width() // 2, 100))
+            draw_caption(text_cache.render(constants.TITLE_FONT, "Jeu d'Échecs Multijoueur", BLACK), 2)
             
             # Bouton pour héberger une partie
-            host_button = pygame.Rect(WIDTH // 2 - 100, 200, 200, 50)
-            pygame.draw.rect(WINDOW, DARK_SQUARE, host_button)
-            host_text = font.render('Héberger', True, WHITE)
-            WINDOW.blit(host_text, (WIDTH // 2 - host_text.get_width() // 2, 210))
+            host_button = menu_rect(4)
+            draw_button(host_button, 'Héberger', DARK_SQUARE)
             
             # Bouton pour rejoindre une partie
-            join_button = pygame.Rect(WIDTH // 2 - 100, 300, 200, 50)
-            pygame.draw.rect(WINDOW, DARK_SQUARE, join_button)
-            join_text = font.render('Rejoindre', True, WHITE)
-            WINDOW.blit(join_text, (WIDTH // 2 - join_text.get_width() // 2, 310))
+            join_button = menu_rect(6)
+            draw_button(join_button, 'Rejoindre', DARK_SQUARE)
+            
+            # Bouton pour jouer contre l'ordinateur
+            computer_button = menu_rect(8)
+            draw_button(computer_button, 'Ordinateur', DARK_SQUARE)
             
             # Bouton pour quitter
-            quit_button = pygame.Rect(WIDTH // 2 - 100, 400, 200, 50)
-            pygame.draw.rect(WINDOW, DARK_SQUARE, quit_button)
-            quit_text = font.render('Quitter', True, WHITE)
-            WINDOW.blit(quit_text, (WIDTH // 2 - quit_text.get_width() // 2, 410))
+            quit_button = menu_rect(10)
+            draw_button(quit_button, 'Quitter', DARK_SQUARE)
             
             pygame.display.flip()
+            if exit_after_first_frame:
+                print("first-frame", flush=True)
+                pygame.quit()
+                return
             if selected_mode:
                 game.setup_clock(selected_mode)
                 if game.host_game():
                     menu_active = False  # Quitter le menu principal
                     running = True   
-            for event in pygame.event.get():
+            for event in wait_events():
                 if event.type == pygame.QUIT:
                     running = False
                     menu_active = False
+                elif event.type == pygame.VIDEORESIZE:
+                    resize_display()
                     
                 if event.type == pygame.MOUSEBUTTONDOWN:
-                    mouse_pos = pygame.mouse.get_pos()
+                    mouse_pos = board_pos(pygame.mouse.get_pos())
                     
                     # Héberger une partie
                     if host_button.collidepoint(mouse_pos):
-                        time_selection_active = True
-                        selected_mode = None
+                        selected_mode, running = choose_time_mode(clock, running)
                         
-                        # Menu de sélection du mode de temps
-                        while time_selection_active and running:
-                            WINDOW.fill(LIGHT_SQUARE)
-                            
-                            mode_title = font.render('Choisissez un mode de jeu', True, BLACK)
-                            WINDOW.blit(mode_title, (WIDTH // 2 - mode_title.get_width() // 2, 100))
-                            
-                            # Bouton Blitz
-                            blitz_button = pygame.Rect(WIDTH // 2 - 100, 200, 200, 50)
-                            pygame.draw.rect(WINDOW, DARK_SQUARE, blitz_button)
-                            blitz_text = font.render('Blitz', True, WHITE)
-                            WINDOW.blit(blitz_text, (WIDTH // 2 - blitz_text.get_width() // 2, 210))
-                            blitz_desc = small_font.render('3min + 2sec', True, BLACK)
-                            WINDOW.blit(blitz_desc, (WIDTH // 2 - blitz_desc.get_width() // 2, 260))
-                            
-                            # Bouton Rapide
-                            rapid_button = pygame.Rect(WIDTH // 2 - 100, 300, 200, 50)
-                            pygame.draw.rect(WINDOW, DARK_SQUARE, rapid_button)
-                            rapid_text = font.render('Rapide', True, WHITE)
-                            WINDOW.blit(rapid_text, (WIDTH // 2 - rapid_text.get_width() // 2, 310))
-                            rapid_desc = small_font.render('10min + 5sec', True, BLACK)
-                            WINDOW.blit(rapid_desc, (WIDTH // 2 - rapid_desc.get_width() // 2, 360))
-                            
-                            # Bouton Standard
-                            standard_button = pygame.Rect(WIDTH // 2 - 100, 400, 200, 50)
-                            pygame.draw.rect(WINDOW, DARK_SQUARE, standard_button)
-                            standard_text = font.render('Standard', True, WHITE)
-                            WINDOW.blit(standard_text, (WIDTH // 2 - standard_text.get_width() // 2, 410))
-                            standard_desc = small_font.render('30min', True, BLACK)
-                            WINDOW.blit(standard_desc, (WIDTH // 2 - standard_desc.get_width() // 2, 460))
-                            
-                            # Bouton Retour
-                            back_button = pygame.Rect(WIDTH // 2 - 100, 500, 200, 50)
-                            pygame.draw.rect(WINDOW, GRAY, back_button)
-                            back_text = font.render('Retour', True, WHITE)
-                            WINDOW.blit(back_text, (WIDTH // 2 - back_text.get_width() // 2, 510))
-                            
-                            pygame.display.flip()
-                            
-                            for mode_event in pygame.event.get():
-                                if mode_event.type == pygame.QUIT:
-                                    time_selection_active = False
-                                    running = False
-                                if mode_event.type == pygame.MOUSEBUTTONDOWN:
-                                    mode_mouse_pos = pygame.mouse.get_pos()
-                                    if blitz_button.collidepoint(mode_mouse_pos):
-                                        selected_mode = 'Blitz'
-                                        time_selection_active = False
-                                    elif rapid_button.collidepoint(mode_mouse_pos):
-                                        selected_mode = 'Rapide'
-                                        time_selection_active = False
-                                    elif standard_button.collidepoint(mode_mouse_pos):
-                                        selected_mode = 'Standard'
-                                        time_selection_active = False
-                                    elif back_button.collidepoint(mode_mouse_pos):
-                                        time_selection_active = False
-                                        selected_mode = None
-                            clock.tick(30)
-                            
                         # Démarrer le jeu en tant qu'hôte avec le mode sélectionné
                         if selected_mode:
                             game.setup_clock(selected_mode)
@@ -529,38 +438,34 @@ def main():
                     elif join_button.collidepoint(mouse_pos):
                         input_active = True
                         host_ip = ''
-                        input_font = pygame.font.SysFont('Arial', 30)
                         
                         # Saisie de l'adresse IP
                         while input_active and running:
                             WINDOW.fill(LIGHT_SQUARE)
                             
-                            prompt = font.render("Entrez l'adresse IP de l'hôte:", True, BLACK)
-                            WINDOW.blit(prompt, (WIDTH // 2 - prompt.get_width() // 2, 200))
+                            draw_caption(text_cache.render(constants.TITLE_FONT, "Entrez l'adresse IP de l'hôte:", BLACK), 4)
                             
-                            input_rect = pygame.Rect(WIDTH // 2 - 150, 250, 300, 40)
-                            pygame.draw.rect(WINDOW, WHITE, input_rect)
-                            pygame.draw.rect(WINDOW, BLACK, input_rect, 2)
+                            input_rect = menu_rect(5, width=6, height=0.8)
+                            pygame.draw.rect(BOARD, WHITE, input_rect)
+                            pygame.draw.rect(BOARD, BLACK, input_rect, 2)
                             
-                            input_surface = input_font.render(host_ip, True, BLACK)
-                            WINDOW.blit(input_surface, (input_rect.x + 5, input_rect.y + 5))
+                            input_surface = constants.INPUT_FONT.render(host_ip, True, BLACK)  # Saisie: hors cache
+                            BOARD.blit(input_surface, input_surface.get_rect(midleft=(input_rect.x + 5, input_rect.centery)))
                             
-                            validate_button = pygame.Rect(WIDTH // 2 - 100, 320, 200, 50)
-                            pygame.draw.rect(WINDOW, DARK_SQUARE, validate_button)
-                            validate_text = font.render('Valider', True, WHITE)
-                            WINDOW.blit(validate_text, (WIDTH // 2 - validate_text.get_width() // 2, 330))
+                            validate_button = menu_rect(6.4)
+                            draw_button(validate_button, 'Valider', DARK_SQUARE)
                             
-                            back_button = pygame.Rect(WIDTH // 2 - 100, 400, 200, 50)
-                            pygame.draw.rect(WINDOW, GRAY, back_button)
-                            back_text = font.render('Retour', True, WHITE)
-                            WINDOW.blit(back_text, (WIDTH // 2 - back_text.get_width() // 2, 410))
+                            back_button = menu_rect(8)
+                            draw_button(back_button, 'Retour', GRAY)
                             
                             pygame.display.flip()
                             
-                            for input_event in pygame.event.get():
+                            for input_event in wait_events():
                                 if input_event.type == pygame.QUIT:
                                     input_active = False
                                     running = False
+                                elif input_event.type == pygame.VIDEORESIZE:
+                                    resize_display()
                                 if input_event.type == pygame.KEYDOWN:
                                     if input_event.key == pygame.K_RETURN:
                                         input_active = False
@@ -569,7 +474,7 @@ def main():
                                     else:
                                         host_ip += input_event.unicode
                                 if input_event.type == pygame.MOUSEBUTTONDOWN:
-                                    mouse_pos = pygame.mouse.get_pos()
+                                    mouse_pos = board_pos(pygame.mouse.get_pos())
                                     if validate_button.collidepoint(mouse_pos):
                                         input_active = False
                                     elif back_button.collidepoint(mouse_pos):
@@ -583,6 +488,14 @@ def main():
                                 running = True
                                 game.start_game()
                     
+                    # Jouer contre l'ordinateur
+                    elif computer_button.collidepoint(mouse_pos):
+                        computer_mode, running = choose_time_mode(clock, running)
+                        if computer_mode:
+                            game.setup_clock(computer_mode)
+                            if game.play_against_computer():
+                                menu_active = False
+                    
                     # Quitter le jeu
                     elif quit_button.collidepoint(mouse_pos):
                         running = False
@@ -590,10 +503,21 @@ def main():
             
             clock.tick(30)
             
+            # Le menu a recouvert la fenêtre (dont la taille a pu changer): la première image
+            # de la partie la redessine entièrement
+            game.resize()
             while not menu_active and running:
-                for event in pygame.event.get():
+                # Sans activité, dort jusqu'au prochain changement de l'écran ou jusqu'au réveil
+                # par un événement, un message réseau ou le coup du moteur
+                for event in wait_events(game.idle_timeout()):
+                    event = board_event(event)
                     if event.type == pygame.QUIT:
                         running = False
+                    elif event.type == pygame.VIDEORESIZE:
+                        resize_display()
+                        game.resize()
+                    elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                        game.renderer.invalidate()
 
                     if game.network and hasattr(game, 'chat'):
                         if game.chat.handle_event(event, game.network):
@@ -608,6 +532,9 @@ def main():
                             if game.network:
                                 game.network.stop()
                                 game.network = None
+                            if game.engine_player:
+                                game.engine_player.close()
+                                game.engine_player = None
                             if game.clock:
                                 game.clock.stop()
                             menu_active = True
@@ -615,10 +542,25 @@ def main():
                             if hasattr(game, 'chat'):
                                 game.chat.chat_visible = not game.chat.chat_visible
 
-                game.draw_board(WINDOW)
-                pygame.display.flip()
+                # Coups et messages reçus depuis l'image précédente, appliqués avant l'affichage
+                game.poll_network()
+                # Chute du drapeau à l'échéance de l'horloge, même si rien n'est redessiné
+                game.run_timers()
+
+                # Le moteur réfléchit dans son thread; on ne fait ici que récupérer son coup
+                if game.engine_player:
+                    game.engine_player.update(game)
+
+                if game.renderer.full_redraw:
+                    WINDOW.fill(BLACK)  # Marges autour du plateau centré
+                    game.draw_board(BOARD)
+                    pygame.display.flip()
+                else:
+                    dirty_rects = game.draw_board(BOARD)
+                    if dirty_rects:
+                        pygame.display.update([rect.move(BOARD_ORIGIN) for rect in dirty_rects])
                 clock.tick(60)
     pygame.quit()
     sys.exit()
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main('--first-frame' in sys.argv[1:])
\ No newline at end of file
@@ -1,34 +1,315 @@
 # network.py
+import collections
+import queue
 import socket
 import threading
-import pickle
 import time
 
+import protocol
+
+# Genres de trames de la file d'envoi: un état complet rend caducs les coups et états
+# encore en attente (il les contient), les autres trames (chat...) sont toujours envoyées
+MOVE_FRAME = 'move'
+STATE_FRAME = 'state'
+OTHER_FRAME = 'other'
+
+PING_INTERVAL = 2.0  # Secondes entre deux mesures du délai aller-retour
+MAX_TRANSIT_CREDIT = 0.5  # Plafond du temps de transmission rendu par trajet (secondes)
+
+
+class SendQueue:
+    """
+    File d'envoi d'une connexion, vidée par un thread d'écriture
+
+    put() ne bloque jamais: la boucle pygame ne fait que déposer des trames, le thread
+    d'écriture attend le socket à sa place. La mémoire est bornée par max_bytes.
+    """
+    def __init__(self, sock, max_bytes=64 * 1024):
+        self.sock = sock
+        self.max_bytes = max_bytes
+        self.frames = collections.deque()  # (genre, trame, description, heure de dépôt)
+        self.queued_bytes = 0
+        self.condition = threading.Condition()
+        self.closed = False
+
+        # Mesures
+        self.sent = 0
+        self.superseded = 0  # Trames remplacées par un état complet plus récent
+        self.dropped = 0  # Trames refusées faute de place
+        self.max_depth = 0
+        self.total_latency = 0.0  # Dépôt -> fin de l'envoi (secondes)
+        self.max_latency = 0.0
+        self.last_latency = 0.0
+
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def put(self, frame, description="message", kind=OTHER_FRAME):
+        """
+        Dépose une trame sans attendre le socket
+
+        Returns:
+            False si la file est fermée ou pleine (la trame n'est pas envoyée)
+        """
+        with self.condition:
+            if self.closed:
+                return False
+            if kind == STATE_FRAME:
+                self._drop_superseded()
+            if self.queued_bytes + len(frame) > self.max_bytes:
+                self.dropped += 1
+                return False
+            self.frames.append((kind, frame, description, time.perf_counter()))
+            self.queued_bytes += len(frame)
+            self.max_depth = max(self.max_depth, len(self.frames))
+            self.condition.notify()
+            return True
+
+    def _drop_superseded(self):
+        """Retire les coups et états en attente, contenus dans l'état complet déposé"""
+        kept = collections.deque(entry for entry in self.frames if entry[0] == OTHER_FRAME)
+        self.superseded += len(self.frames) - len(kept)
+        self.frames = kept
+        self.queued_bytes = sum(len(entry[1]) for entry in kept)
+
+    def _run(self):
+        """Thread d'écriture: envoie les trames dans l'ordre de dépôt"""
+        while True:
+            with self.condition:
+                while not self.frames and not self.closed:
+                    self.condition.wait()
+                if self.closed:
+                    return
+                _, frame, description, queued_at = self.frames.popleft()
+                self.queued_bytes -= len(frame)
+            try:
+                self._send_all(frame)
+            except Exception as e:
+                with self.condition:
+                    if not self.closed:
+                        print(f"Erreur lors de l'envoi du {description}: {e}")
+                    self.closed = True
+                return
+            latency = time.perf_counter() - queued_at
+            self.sent += 1
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+            self.last_latency = latency
+
+    def _send_all(self, frame):
+        """Envoie toute la trame; le délai du socket (écoute) sert seulement à vérifier closed"""
+        view = memoryview(frame)
+        while view:
+            try:
+                sent = self.sock.send(view)
+            except socket.timeout:
+                if self.closed:
+                    raise ConnectionError("File d'envoi fermée")
+                continue
+            view = view[sent:]
+
+    def metrics(self):
+        """Profondeur de la file et latence d'envoi (ms)"""
+        with self.condition:
+            depth, queued_bytes = len(self.frames), self.queued_bytes
+        return {
+            "depth": depth,
+            "queued_bytes": queued_bytes,
+            "max_depth": self.max_depth,
+            "sent": self.sent,
+            "superseded": self.superseded,
+            "dropped": self.dropped,
+            "average_latency_ms": self.total_latency / self.sent * 1000 if self.sent else 0.0,
+            "max_latency_ms": self.max_latency * 1000,
+            "last_latency_ms": self.last_latency * 1000,
+        }
+
+    def close(self, timeout=1.0):
+        """Laisse partir les trames en attente pendant au plus timeout secondes, puis arrête le thread"""
+        deadline = time.monotonic() + timeout
+        with self.condition:
+            while self.frames and not self.closed and time.monotonic() < deadline:
+                self.condition.wait(0.01)
+            self.closed = True
+            self.condition.notify()
+        if self.thread is not threading.current_thread():
+            self.thread.join(timeout)
+
+
+class ClockSync:
+    """
+    Délai aller-retour et décalage entre l'horloge monotone locale et celle du pair
+
+    Échange de type NTP: t0 envoi du ping, t1 réception et t2 réponse chez le pair,
+    t3 réception du pong. On garde les derniers échantillons et on retient celui du plus
+    petit aller-retour, le moins perturbé par les files d'attente.
+    """
+    def __init__(self, samples=8):
+        self.samples = collections.deque(maxlen=samples)  # (aller-retour, décalage)
+        self.last_ping = None  # Instant du dernier ping envoyé
+
+    def add(self, t0, t1, t2, t3):
+        """Enregistre un échange ping/pong complet"""
+        rtt = max(0.0, (t3 - t0) - (t2 - t1))
+        offset = ((t1 - t0) + (t2 - t3)) / 2
+        self.samples.append((rtt, offset))
+
+    @property
+    def rtt(self):
+        """Plus petit aller-retour mesuré (secondes), None sans mesure"""
+        return min(self.samples)[0] if self.samples else None
+
+    @property
+    def offset(self):
+        """Horloge du pair moins horloge locale, estimé sur le meilleur échantillon"""
+        return min(self.samples)[1] if self.samples else None
+
+    def transit(self, sent_at, received_at):
+        """Durée de transmission d'une trame horodatée par le pair, None sans mesure"""
+        if not self.samples:
+            return None
+        return received_at - (sent_at - self.offset)
+
+    def transit_credit(self, sent_at, received_at):
+        """
+        Temps de transmission à ne pas décompter au pair pour un coup reçu: l'aller de notre
+        dernier coup (moitié de l'aller-retour) et le retour du sien (mesuré grâce au décalage),
+        chacun plafonné pour qu'un pair ne puisse pas se faire rendre du temps en trichant
+        """
+        if not self.samples:
+            return 0.0
+        credit = min(self.rtt / 2, MAX_TRANSIT_CREDIT)
+        return credit + min(max(self.transit(sent_at, received_at), 0.0), MAX_TRANSIT_CREDIT)
+
+    def ping_due(self, now):
+        """Vrai, et note l'envoi, si le dernier ping date d'au moins PING_INTERVAL"""
+        if self.last_ping is not None and now - self.last_ping < PING_INTERVAL:
+            return False
+        self.last_ping = now
+        return True
+
+
 class Network:
-    """Classe de base pour la communication réseau"""
+    """
+    Classe de base pour la communication réseau
+
+    Le thread d'écoute ne touche jamais à la partie: il dépose les messages reçus dans
+    inbox, que la boucle principale applique par lots avec process_messages().
+    """
+    # Un état complet reçu rend caducs les coups reçus avant lui (seulement pour le côté
+    # qui applique les états de son pair)
+    applies_game_state = False
+    # L'horloge de ce côté fait foi (hôte): il mesure le délai du pair, rend le temps de
+    # transmission à chaque coup reçu et annonce la chute du drapeau
+    authoritative_clock = True
+
     def __init__(self, game, port=5555):
         self.game = game
         self.port = port
         self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.connection = None  # Socket connecté au pair
+        self.outbox = None  # File d'envoi, créée à la première trame
+        self.inbox = queue.SimpleQueue()  # Messages reçus, en attente de la boucle principale
+        self.wakeup = game.wakeup  # Réveille la boucle principale après un dépôt dans inbox
+        self.sequence = 0  # Nombre de coups synchronisés avec le pair
+        self.sync = ClockSync()
         self.running = False
         self.thread = None
 
-    def send_chat_message(self, message):
-        """Envoie un message de chat"""
-        if hasattr(self, 'client') and self.client:  # Pour NetworkHost
+    def send_frame(self, frame, description="message", kind=OTHER_FRAME):
+        """
+        Dépose une trame encodée par le module protocol dans la file d'envoi (sans bloquer)
+
+        Si la file est pleine (pair qui ne lit plus), les coups en attente sont remplacés
+        par l'état complet.
+        """
+        if not self.connection:
+            return False
+        if self.outbox is None:
+            self.outbox = SendQueue(self.connection)
+        if self.outbox.put(frame, description, kind):
+            return True
+        if kind == MOVE_FRAME:
+            return self.outbox.put(protocol.encode_game_state(self.game, self.sequence), "état du jeu", STATE_FRAME)
+        return False
+
+    def send_metrics(self):
+        """Mesures de la file d'envoi (profondeur, latence), None avant le premier envoi"""
+        return self.outbox.metrics() if self.outbox else None
+
+    def receive_messages(self):
+        """Lit les trames du pair jusqu'à la déconnexion et dépose chaque message dans inbox"""
+        reader = protocol.FrameReader(self.connection)
+        while self.running:
             try:
-                data = pickle.dumps({'type': 'chat', 'message': message})
-                self.client.send(data)
-                print(f"Message envoyé: {message}")
+                messages = reader.read()
+            except socket.timeout:
+                continue
+            except protocol.ProtocolError as e:
+                print(f"Message invalide reçu, déconnexion: {e}")
+                break
             except Exception as e:
-                print(f"Erreur lors de l'envoi du message: {e}")
-        elif hasattr(self, 'socket') and self.socket:  # Pour NetworkClient
+                print(f"Erreur lors de la réception des données: {e}")
+                break
+            arrived_at = time.monotonic()
+            for message in messages:
+                message["arrived_at"] = arrived_at  # Instant d'arrivée local (un pong a son propre received_at)
+                self.inbox.put(message)
+            if messages and self.wakeup:
+                self.wakeup()
+
+    def process_messages(self):
+        """
+        Applique les messages reçus depuis le dernier appel (boucle principale uniquement)
+
+        Returns:
+            Nombre de messages traités
+        """
+        batch = []
+        while True:
             try:
-                data = pickle.dumps({'type': 'chat', 'message': message})
-                self.socket.send(data)
-                print(f"Message envoyé: {message}")
-            except Exception as e:
-                print(f"Erreur lors de l'envoi du message: {e}")
+                batch.append(self.inbox.get_nowait())
+            except queue.Empty:
+                break
+        if self.applies_game_state:
+            # Après une coupure, seuls les messages qui suivent le dernier état complet
+            # importent pour la position (le chat est toujours affiché)
+            last_state = max((index for index, message in enumerate(batch)
+                              if message.get("type") == "game_state"), default=0)
+            batch = [message for index, message in enumerate(batch)
+                     if index >= last_state or message.get("type") != "move"]
+        for message in batch:
+            if message.get("type") == "ping":
+                self.send_frame(protocol.encode_pong(message["sent_at"], message["arrived_at"], time.monotonic()),
+                                "réponse au ping")
+            elif message.get("type") == "pong":
+                self.sync.add(message["ping_sent_at"], message["received_at"], message["replied_at"],
+                              message["arrived_at"])
+            else:
+                self.handle_message(message)
+        if self.authoritative_clock:
+            self.send_ping()
+        return len(batch)
+
+    def send_ping(self):
+        """Mesure périodique du délai aller-retour (côté qui fait foi), au plus une fois par PING_INTERVAL"""
+        now = time.monotonic()
+        if self.connection and self.sync.ping_due(now):
+            self.send_frame(protocol.encode_ping(now), "ping")
+
+    def transit_credit(self, message):
+        """Temps de transmission à ne pas décompter au pair pour un coup reçu (voir ClockSync.transit_credit)"""
+        return self.sync.transit_credit(message["sent_at"], message["arrived_at"])
+
+    def handle_chat(self, message):
+        """Ajoute un message de chat reçu à l'interface, si elle existe"""
+        if hasattr(self.game, 'chat'):
+            self.game.chat.add_message("Adversaire", message.get("message", ""))
+
+    def send_chat_message(self, message):
+        """Envoie un message de chat"""
+        if self.send_frame(protocol.encode_chat(message), "message"):
+            print(f"Message envoyé: {message}")
 
     def start(self):
         """Démarre le thread d'écoute"""
@@ -42,6 +323,8 @@ class Network:
         if not self.running:
             return
         self.running = False
+        if self.outbox:
+            self.outbox.close()
         if self.thread and self.thread != threading.current_thread():
             self.thread.join(timeout=1)
         print("Serveur ou client arrêté")
@@ -51,12 +334,59 @@ class Network:
         pass
     
     def send_game_state(self):
-        """Méthode abstraite pour envoyer l'état du jeu"""
-        pass
+        """Envoie l'état complet du jeu au pair"""
+        self.send_frame(protocol.encode_game_state(self.game, self.sequence), "état du jeu", STATE_FRAME)
     
-    def send_move(self, start, end):
-        """Méthode abstraite pour envoyer un mouvement"""
-        pass
+    def request_game_state(self):
+        """Demande l'état complet au pair (désynchronisation détectée)"""
+        self.send_frame(protocol.encode_snapshot_request(), "demande d'état")
+    
+    def send_move(self, start, end, promotion='Q'):
+        """
+        Envoie un coup déjà joué localement, avec son numéro, le hash de la position
+        obtenue, les temps restants et l'instant d'envoi (pas d'état complet)
+        """
+        self.sequence += 1
+        mover = 'b' if self.game.turn == 'w' else 'w'
+        clock = self.game.clock
+        time_left = clock.time_left[mover] if clock else 0.0
+        opponent_time = clock.time_left[self.game.turn] if clock else 0.0
+        self.send_frame(protocol.encode_move(start, end, promotion, self.sequence, self.game.get_position_hash(),
+                                             time_left, opponent_time, time.monotonic()), "mouvement", MOVE_FRAME)
+    
+    def apply_move(self, message):
+        """
+        Joue un coup reçu du pair
+
+        Returns:
+            False si le coup ne suit pas le dernier coup synchronisé, n'est pas légal
+            ou ne mène pas à la même position (hash différent): un état complet est nécessaire
+        """
+        start, end = message["start"], message["end"]
+        mover = self.game.turn
+        clock = self.game.clock
+        if (message["sequence"] != self.sequence + 1 or mover == self.game.player_color
+                or self.game.game_status != 'Playing' or not self.game.is_legal_move(start, end)):
+            return False
+        
+        # Côté qui fait foi: temps de réflexion du pair compté jusqu'à la réception de la trame,
+        # moins le temps de transmission
+        elapsed = None
+        if self.authoritative_clock and clock and clock.running:
+            elapsed = max(0.0, message["arrived_at"] - clock.last_update - self.transit_credit(message))
+        
+        # Joue le coup localement sans le renvoyer au pair; un coup arrivé après la chute du
+        # drapeau est refusé (le pair reçoit l'état final)
+        if not self.game.move_piece(start, end, message["promotion"], send=False, elapsed=elapsed):
+            return False
+        self.sequence += 1
+        
+        # Sinon les temps de l'hôte font foi; le décompte du joueur au trait part de la réception
+        if clock and not self.authoritative_clock:
+            clock.time_left[mover] = message["time_left"]
+            clock.time_left[self.game.turn] = message["opponent_time"]
+            clock.last_update = message["arrived_at"]
+        return self.game.get_position_hash() == message["checksum"]
 
 
 class NetworkHost(Network):
@@ -88,8 +418,12 @@ class NetworkHost(Network):
             while self.running:
                 try:
                     self.client_socket, self.client_address = self.socket.accept()
+                    self.connection = self.client_socket
                     print(f"Client connecté: {self.client_address}")
-                    self.on_client_connected()
+                    # Démarrage de la partie appliqué par la boucle principale
+                    self.inbox.put({"type": "connected"})
+                    if self.wakeup:
+                        self.wakeup()
                     break
                 except socket.timeout:
                     continue
@@ -100,19 +434,7 @@ class NetworkHost(Network):
             # Écoute les messages du client
             if self.client_socket:  # Vérifie que le client est connecté
                 self.client_socket.settimeout(1)
-                while self.running:
-                    try:
-                        data = self.client_socket.recv(4096)
-                        if not data:
-                            break
-                        
-                        message = pickle.loads(data)
-                        self.handle_message(message)
-                    except socket.timeout:
-                        continue
-                    except Exception as e:
-                        print(f"Erreur lors de la réception des données: {e}")
-                        break
+                self.receive_messages()
         finally:
             self.stop()
     
@@ -126,75 +448,31 @@ class NetworkHost(Network):
         if not message:
             return
         
-        if message.get("type") == "move":
-            start = message.get("start")
-            end = message.get("end")
-            if start and end:
-                # Simule le mouvement localement
-                # On utilise un attribut pour savoir si on doit envoyer le mouvement
-                # afin d'éviter une boucle infinie
-                old_network = self.game.network
-                self.game.network = None
-                self.game.move_piece(start, end)
-                self.game.network = old_network
+        if message.get("type") == "connected":
+            self.on_client_connected()
+        
+        elif message.get("type") == "move":
+            # L'hôte fait foi: en cas de désaccord il renvoie son état complet
+            if not self.apply_move(message):
+                self.send_game_state()
+        
+        elif message.get("type") == "snapshot_request":
+            self.send_game_state()
         
         elif message.get("type") == "game_state":
             # Mise à jour de l'état du jeu depuis le client si nécessaire
             # Généralement pas utilisé dans cette direction, mais peut être utile pour la synchronisation
             pass
-    
-    def send_game_state(self):
-        """Envoie l'état complet du jeu au client"""
-        if not self.client_socket:
-            return
-        
-        game_state = {
-            "type": "game_state",
-            "board": self.game.board,
-            "turn": self.game.turn,
-            "king_positions": self.game.king_positions,
-            "castling_rights": self.game.castling_rights,
-            "en_passant_target": self.game.en_passant_target,
-            "in_check": self.game.in_check,
-            "game_status": self.game.game_status
-        }
         
-        # Ajoute l'état de l'horloge si disponible
-        if self.game.clock:
-            game_state["clock"] = {
-                "time_left": self.game.clock.time_left,
-                "active_color": self.game.clock.active_color,
-                "increment": self.game.clock.increment,
-                "running": self.game.clock.running,
-                "game_over": self.game.clock.game_over,
-                "timeout_color": self.game.clock.timeout_color
-            }
-            game_state["time_mode"] = self.game.time_mode
-        
-        try:
-            self.client_socket.sendall(pickle.dumps(game_state))
-        except Exception as e:
-            print(f"Erreur lors de l'envoi de l'état du jeu: {e}")
-    
-    def send_move(self, start, end):
-        """Envoie un mouvement au client"""
-        if not self.client_socket:
-            return
-        
-        move_data = {
-            "type": "move",
-            "start": start,
-            "end": end
-        }
-        
-        try:
-            self.client_socket.sendall(pickle.dumps(move_data))
-        except Exception as e:
-            print(f"Erreur lors de l'envoi du mouvement: {e}")
+        elif message.get("type") == "chat":
+            self.handle_chat(message)
 
 
 class NetworkClient(Network):
     """Client réseau pour rejoindre une partie"""
+    applies_game_state = True
+    authoritative_clock = False
+
     def __init__(self, game, host, port=5555):
         super().__init__(game, port)
         self.host = host
@@ -203,6 +481,7 @@ class NetworkClient(Network):
         """Se connecte au serveur"""
         try:
             self.socket.connect((self.host, self.port))
+            self.connection = self.socket
             print(f"Connecté au serveur {self.host}:{self.port}")
             return True
         except Exception as e:
@@ -210,21 +489,12 @@ class NetworkClient(Network):
             return False
     
     def listen(self):
+        """Écoute les messages du serveur"""
         try:
-            while self.running:
-                try:
-                    self.client_socket, addr = self.server_socket.accept()
-                    print(f"Client connecté depuis {addr}")
-                    if self.client_socket:
-                        self.client_socket.settimeout(1)
-                        self.handle_client(self.client_socket)
-                except socket.timeout:
-                    continue
-        except Exception as e:
-            print(f"Erreur dans listen: {e}")
+            self.socket.settimeout(1)  # Timeout de 1 seconde pour vérifier régulièrement self.running
+            self.receive_messages()
+        finally:
             self.stop()
-        
-        
     
     def handle_message(self, message):
         """Gère les messages reçus du serveur"""
@@ -232,24 +502,19 @@ class NetworkClient(Network):
             return
         
         if message.get("type") == "move":
-            start = message.get("start")
-            end = message.get("end")
-            if start and end:
-                # Simule le mouvement localement
-                old_network = self.game.network
-                self.game.network = None
-                self.game.move_piece(start, end)
-                self.game.network = old_network
+            if not self.apply_move(message):
+                self.request_game_state()
+        
+        elif message.get("type") == "chat":
+            self.handle_chat(message)
         
         elif message.get("type") == "game_state":
             # Mise à jour de l'état complet du jeu
-            self.game.board = message.get("board", self.game.board)
-            self.game.turn = message.get("turn", self.game.turn)
-            self.game.king_positions = message.get("king_positions", self.game.king_positions)
-            self.game.castling_rights = message.get("castling_rights", self.game.castling_rights)
-            self.game.en_passant_target = message.get("en_passant_target", self.game.en_passant_target)
-            self.game.in_check = message.get("in_check", self.game.in_check)
-            self.game.game_status = message.get("game_status", self.game.game_status)
+            self.game.set_position(message["board"], message["turn"], message["castling_rights"],
+                                   message["en_passant_target"])
+            self.game.in_check = message["in_check"]
+            self.game.game_status = message["game_status"]
+            self.sequence = message["sequence"]
             
             # Mise à jour de l'horloge
             if message.get("clock") and not self.game.clock:
@@ -268,9 +533,10 @@ class NetworkClient(Network):
                     self.game.clock.game_over = clock_data.get("game_over", self.game.clock.game_over)
                     self.game.clock.timeout_color = clock_data.get("timeout_color", self.game.clock.timeout_color)
                     
-                    # Met à jour le moment de la dernière mise à jour
+                    # Le temps reçu court depuis la réception; l'hôte décide seul de la fin au temps
+                    self.game.clock.authoritative = False
                     if self.game.clock.running:
-                        self.game.clock.last_update = time.time()
+                        self.game.clock.last_update = message["arrived_at"]
             
             elif message.get("clock") and self.game.clock:
                 # Met à jour l'horloge existante
@@ -281,37 +547,45 @@ class NetworkClient(Network):
                 self.game.clock.game_over = clock_data.get("game_over", self.game.clock.game_over)
                 self.game.clock.timeout_color = clock_data.get("timeout_color", self.game.clock.timeout_color)
                 
-                # Met à jour le moment de la dernière mise à jour
+                # Le temps reçu court depuis la réception; l'hôte décide seul de la fin au temps
+                self.game.clock.authoritative = False
                 if self.game.clock.running:
-                    self.game.clock.last_update = time.time()
+                    self.game.clock.last_update = message["arrived_at"]
+            
+            # L'horloge locale décompte aussi nos propres coups, corrigée par chaque coup de l'hôte
+            if self.game.clock and self.game.clock.running:
+                self.game.game_started = True
+
+
+class NetworkServerClient(NetworkClient):
+    """Client d'un serveur de parties (server.py): rejoint une partie par son identifiant"""
+    def __init__(self, game, host, port=5555, game_id='partie'):
+        super().__init__(game, host, port)
+        self.game_id = game_id
     
-    def send_game_state(self):
-        """Envoie l'état complet du jeu au serveur"""
-        game_state = {
-            "type": "game_state",
-            "board": self.game.board,
-            "turn": self.game.turn,
-            "king_positions": self.game.king_positions,
-            "castling_rights": self.game.castling_rights,
-            "en_passant_target": self.game.en_passant_target,
-            "in_check": self.game.in_check,
-            "game_status": self.game.game_status
-        }
-        
-        try:
-            self.socket.sendall(pickle.dumps(game_state))
-        except Exception as e:
-            print(f"Erreur lors de l'envoi de l'état du jeu: {e}")
+    def connect(self):
+        """Se connecte au serveur et demande à rejoindre la partie"""
+        if not super().connect():
+            return False
+        return self.send_frame(protocol.encode_join(self.game_id), "demande de connexion")
     
-    def send_move(self, start, end):
-        """Envoie un mouvement au serveur"""
-        move_data = {
-            "type": "move",
-            "start": start,
-            "end": end
-        }
-        
-        try:
-            self.socket.sendall(pickle.dumps(move_data))
-        except Exception as e:
-            print(f"Erreur lors de l'envoi du mouvement: {e}")
\ No newline at end of file
+    def handle_message(self, message):
+        """Gère la couleur attribuée par le serveur, puis les messages habituels"""
+        if message.get("type") == "joined":
+            if message["color"] is None:
+                print(f"La partie {message['game_id']} est complète")
+                self.running = False
+                return
+            self.game.player_color = message["color"]
+            print(f"Partie {message['game_id']} rejointe avec les {'blancs' if message['color'] == 'w' else 'noirs'}")
+            return
+        super().handle_message(message)
+
+
+class NetworkSpectator(NetworkServerClient):
+    """Spectateur d'une partie d'un serveur de parties: reçoit les coups sans jamais en envoyer"""
+    def connect(self):
+        """Se connecte au serveur et s'abonne à la partie"""
+        if not NetworkClient.connect(self):
+            return False
+        return self.send_frame(protocol.encode_watch(self.game_id), "demande de suivi")
@@ -0,0 +1,234 @@
+# parallel_search.py
+# Recherche parallèle de type "lazy SMP": plusieurs processus cherchent la même position
+# racine et partagent une table de transposition placée en mémoire partagée.
+#
+# Banc d'essai (accélération par rapport à un seul processus, à profondeur fixe):
+#   python parallel_search.py --workers 1 2 4 8 16 --depth 5
+import argparse
+import multiprocessing
+import sys
+import time
+from multiprocessing import shared_memory
+
+from bitboard import BitboardPosition, START_FEN
+from engine import Engine, MAX_PLY
+
+# Positions du banc d'essai: position initiale et milieux de partie choisis
+BENCH_POSITIONS = {
+    'initial': START_FEN,
+    'kiwipete': 'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+    'italienne': 'r1bq1rk1/pppp1ppp/2n2n2/2b1p3/2B1P3/2NP1N2/PPP2PPP/R1BQ1RK1 w - - 0 7',
+    'sicilienne': 'r1bqkb1r/pp2pppp/2np1n2/8/3NP3/2N5/PPP2PPP/R1BQKB1R w KQkq - 2 6',
+    'gambit-dame': 'r1bq1rk1/pp1nbppp/2p1pn2/3p2B1/2PP4/2N1PN2/PPQ2PPP/R3KB1R w KQ - 0 8',
+    'middlegame': 'r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10',
+}
+
+_SCORE_OFFSET = 1 << 20
+_MASK_64 = (1 << 64) - 1
+
+
+class SharedTranspositionTable:
+    """
+    Table de transposition de taille fixe dans un segment de mémoire partagée
+
+    Chaque entrée occupe deux mots de 64 bits: (hash ^ données, données). Une entrée
+    écrite à moitié par un autre processus ne redonne pas le hash et est ignorée,
+    ce qui évite tout verrou. Même interface que le dict utilisé par Engine.
+    """
+    def __init__(self, entries=1 << 18, name=None):
+        self.entries = entries
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=entries * 16)
+        self.table = self.shm.buf.cast('Q')
+
+    @property
+    def name(self):
+        """Nom du segment, à passer aux processus pour s'y rattacher"""
+        return self.shm.name
+
+    def get(self, key, default=None):
+        """Renvoie (profondeur, score, drapeau, coup) ou default"""
+        index = (key % self.entries) * 2
+        data = self.table[index + 1]
+        if self.table[index] ^ data != key or not data:
+            return default
+        depth = data & 0xFF
+        flag = (data >> 8) & 0x3
+        score = ((data >> 10) & 0x1FFFFF) - _SCORE_OFFSET
+        packed_move = data >> 31
+        move = None
+        if packed_move & 1:
+            promotion = (packed_move >> 13) & 0x7
+            move = ((packed_move >> 1) & 0x3F, (packed_move >> 7) & 0x3F, promotion - 1 if promotion else None)
+        return depth, score, flag, move
+
+    def __setitem__(self, key, value):
+        depth, score, flag, move = value
+        score = max(-_SCORE_OFFSET, min(_SCORE_OFFSET - 1, score))
+        packed_move = 0
+        if move is not None:
+            frm, to, promotion = move
+            packed_move = 1 | (frm << 1) | (to << 7) | ((promotion + 1 if promotion is not None else 0) << 13)
+        data = min(depth, 0xFF) | (flag << 8) | ((score + _SCORE_OFFSET) << 10) | (packed_move << 31)
+        index = (key % self.entries) * 2
+        self.table[index] = (key ^ data) & _MASK_64
+        self.table[index + 1] = data
+
+    def __len__(self):
+        return self.entries
+
+    def clear(self):
+        """Efface toutes les entrées"""
+        self.shm.buf[:] = bytes(self.entries * 16)
+
+    def close(self):
+        """Détache le segment (et le libère si ce processus l'a créé)"""
+        self.table.release()
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+# --- Processus de travail ---------------------------------------------------
+
+_worker_engine = None
+_worker_stop = None
+
+
+def _init_worker(tt_name, tt_entries, stop_event):
+    """Initialise un processus: moteur attaché à la table partagée"""
+    global _worker_engine, _worker_stop
+    _worker_engine = Engine(tt=SharedTranspositionTable(tt_entries, tt_name))
+    _worker_stop = stop_event
+
+
+def _worker_search(args):
+    """Lance une recherche dans un processus; les assistants varient l'ordre et la profondeur de départ"""
+    worker_id, position, time_limit, max_depth = args
+    start_depth = 1 + worker_id % 2
+    seed = worker_id if worker_id else None
+    move, score, depth = _worker_engine.search(position, time_limit, max_depth, _worker_stop,
+                                               start_depth=start_depth, seed=seed)
+    return worker_id, move, score, depth, _worker_engine.nodes
+
+
+class ParallelEngine:
+    """Moteur multi-processus (lazy SMP), même interface de recherche qu'Engine"""
+    def __init__(self, workers=None, tt_entries=1 << 18):
+        """
+        Args:
+            workers: Nombre de processus (par défaut le nombre de cœurs)
+            tt_entries: Nombre d'entrées de la table de transposition partagée
+        """
+        self.workers = workers or multiprocessing.cpu_count()
+        self.tt = SharedTranspositionTable(tt_entries)
+        self.stop_event = multiprocessing.Event()
+        self.pool = multiprocessing.Pool(self.workers, initializer=_init_worker,
+                                         initargs=(self.tt.name, tt_entries, self.stop_event))
+        self.nodes = 0
+
+    def clear(self):
+        """Vide la table de transposition partagée"""
+        self.tt.clear()
+
+    def search(self, position, time_limit=None, max_depth=MAX_PLY, stop_event=None, on_info=None):
+        """
+        Lance un processus par worker sur la même racine et renvoie (coup, score, profondeur)
+
+        La recherche s'arrête dès qu'un processus a terminé max_depth, que le temps est écoulé
+        ou que stop_event (threading.Event) est positionné. Le résultat retenu est celui du
+        processus ayant complété la plus grande profondeur.
+        """
+        self.stop_event.clear()
+        tasks = [(worker_id, position, time_limit, max_depth) for worker_id in range(self.workers)]
+        pending = [self.pool.apply_async(_worker_search, (task,)) for task in tasks]
+        results = []
+        while pending:
+            still_pending = []
+            for async_result in pending:
+                if async_result.ready():
+                    results.append(async_result.get())
+                    # Le premier processus qui termine met fin à la recherche des autres
+                    self.stop_event.set()
+                else:
+                    still_pending.append(async_result)
+            pending = still_pending
+            if pending:
+                if stop_event is not None and stop_event.is_set():
+                    self.stop_event.set()
+                pending[0].wait(0.005)
+
+        self.nodes = sum(result[4] for result in results)
+        worker_id, move, score, depth, _ = max(results, key=lambda result: (result[3], -result[0]))
+        if on_info and move is not None:
+            on_info(depth, score, move, self.nodes)
+        return move, score, depth
+
+    def close(self):
+        """Arrête les processus et libère la mémoire partagée"""
+        self.stop_event.set()
+        self.pool.terminate()
+        self.pool.join()
+        self.tt.close()
+
+
+def benchmark(worker_counts, depth, positions, tt_entries=1 << 18):
+    """
+    Mesure le temps pour atteindre une profondeur fixe selon le nombre de processus
+
+    Returns:
+        Liste de (workers, secondes, nœuds) en sommant sur toutes les positions
+    """
+    results = []
+    for workers in worker_counts:
+        if workers == 1:
+            engine = Engine()
+        else:
+            engine = ParallelEngine(workers, tt_entries)
+        total_time, total_nodes = 0.0, 0
+        try:
+            for name, fen in positions:
+                engine.clear()
+                position = BitboardPosition.from_fen(fen)
+                start_time = time.perf_counter()
+                move, score, reached = engine.search(position, max_depth=depth)
+                seconds = time.perf_counter() - start_time
+                total_time += seconds
+                total_nodes += engine.nodes
+                print(f"  {workers} processus, {name}: profondeur {reached}, score {score}, "
+                      f"{engine.nodes} nœuds en {seconds:.2f}s")
+        finally:
+            if workers > 1:
+                engine.close()
+        results.append((workers, total_time, total_nodes))
+    return results
+
+
+def main(argv=None):
+    """Point d'entrée du banc d'essai en ligne de commande"""
+    parser = argparse.ArgumentParser(description="Accélération de la recherche parallèle (lazy SMP)")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4],
+                        help="Nombres de processus à comparer (1 = moteur séquentiel)")
+    parser.add_argument('--depth', type=int, default=4, help="Profondeur fixe à atteindre (4 par défaut)")
+    parser.add_argument('--position', choices=sorted(BENCH_POSITIONS), action='append',
+                        help="Position du banc d'essai (répétable, toutes par défaut)")
+    parser.add_argument('--tt-entries', type=int, default=1 << 18,
+                        help="Taille de la table de transposition partagée")
+    args = parser.parse_args(argv)
+
+    names = args.position or list(BENCH_POSITIONS)
+    positions = [(name, BENCH_POSITIONS[name]) for name in names]
+    worker_counts = sorted(set(args.workers))
+    results = benchmark(worker_counts, args.depth, positions, args.tt_entries)
+
+    baseline = results[0][1]
+    print(f"Profondeur {args.depth} sur {len(positions)} positions ({multiprocessing.cpu_count()} cœurs):")
+    for workers, seconds, nodes in results:
+        speedup = baseline / seconds if seconds > 0 else 0
+        print(f"  {workers:>3} processus: {seconds:7.2f}s, {nodes / seconds if seconds else 0:>10,.0f} n/s, "
+              f"accélération x{speedup:.2f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,251 @@
+# perft.py
+# Banc d'essai perft: compte les nœuds de l'arbre des coups légaux et mesure la vitesse
+# du générateur. Sert de test de non-régression pour chess_pieces.py et chess_game.py.
+#
+# Exemples:
+#   python perft.py                                  # toutes les positions de référence, profondeur 3
+#   python perft.py --position kiwipete --depth 4 --divide
+#   python perft.py --depth 5 --workers 8            # coups racine répartis sur 8 processus
+#   python perft.py --backend game --depth 2         # passe par ChessGame.get_valid_moves / make_move / unmake_move
+import argparse
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+from bitboard import BitboardPosition, START_FEN, PIECE_TYPES, parse_fen, square_to_pos
+from chess_game import ChessGame
+
+# Positions de référence et nombres de nœuds attendus par profondeur (1, 2, 3, ...)
+REFERENCE_POSITIONS = {
+    'initial': (START_FEN,
+                [20, 400, 8902, 197281, 4865609, 119060324]),
+    'kiwipete': ('r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+                 [48, 2039, 97862, 4085603, 193690690]),
+    'endgame': ('8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1',
+                [14, 191, 2812, 43238, 674624, 11030083]),
+    'promotions': ('r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1',
+                   [6, 264, 9467, 422333, 15833292]),
+    'talkchess': ('rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8',
+                  [44, 1486, 62379, 2103487, 89941194]),
+    'middlegame': ('r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10',
+                   [46, 2079, 89890, 3894594, 164075551]),
+}
+
+BACKENDS = ('bitboard', 'game')
+
+
+def move_to_uci(start, end, promotion=None):
+    """Formate un coup (cases (row, col)) en notation UCI, ex: e2e4, e7e8q"""
+    text = ''.join(chr(ord('a') + col) + str(8 - row) for row, col in (start, end))
+    if promotion and promotion != 'p':
+        text += promotion.lower()
+    return text
+
+
+# --- Backend bitboard -------------------------------------------------------
+
+def perft_bitboard(position, depth):
+    """Compte les feuilles à la profondeur donnée pour une BitboardPosition"""
+    if depth == 0:
+        return 1
+    moves = position.generate_legal_moves()
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        nodes += perft_bitboard(position.make_move(move), depth - 1)
+    return nodes
+
+
+def _bitboard_root_moves(fen):
+    """Coups racine du backend bitboard, au format (depart, arrivee, promotion) en (row, col)"""
+    position = BitboardPosition.from_fen(fen)
+    return [(square_to_pos(frm), square_to_pos(to), PIECE_TYPES[promotion] if promotion is not None else None)
+            for frm, to, promotion in position.generate_legal_moves()]
+
+
+def _bitboard_divide(fen, move, depth):
+    """Compte les nœuds sous un coup racine (backend bitboard)"""
+    position = BitboardPosition.from_fen(fen)
+    start, end, promotion = move
+    for candidate in position.generate_legal_moves():
+        if (square_to_pos(candidate[0]), square_to_pos(candidate[1])) == (start, end) and \
+                (candidate[2] is None or PIECE_TYPES[candidate[2]] == promotion):
+            return perft_bitboard(position.make_move(candidate), depth - 1)
+    raise ValueError(f"Coup illégal: {move_to_uci(*move)}")
+
+
+# --- Backend ChessGame ------------------------------------------------------
+
+def _create_game(fen, use_bitboards=False):
+    """Crée un ChessGame sans interface positionné sur la FEN"""
+    game = ChessGame(use_bitboards=use_bitboards)
+    game.set_position(*parse_fen(fen))
+    return game
+
+
+def _game_moves(game):
+    """Coups légaux via ChessGame.get_valid_moves, promotions développées"""
+    moves = []
+    for row in range(8):
+        for col in range(8):
+            piece = game.board[row][col]
+            if piece == '--' or piece[0] != game.turn:
+                continue
+            for end in game.get_valid_moves((row, col)):
+                if piece[1] == 'p' and end[0] in (0, 7):
+                    for promotion in ('Q', 'R', 'B', 'N'):
+                        moves.append(((row, col), end, promotion))
+                else:
+                    moves.append(((row, col), end, None))
+    return moves
+
+
+def _game_play(game, move):
+    """Joue un coup (depart, arrivee, promotion) avec make_move"""
+    start, end, promotion = move
+    game.make_move(start, end, promotion or 'Q')
+
+
+def perft_game(game, depth):
+    """Compte les feuilles en passant par l'API publique de ChessGame"""
+    if depth == 0:
+        return 1
+    moves = _game_moves(game)
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        _game_play(game, move)
+        nodes += perft_game(game, depth - 1)
+        game.unmake_move()
+    return nodes
+
+
+def _game_root_moves(fen, use_bitboards):
+    """Coups racine du backend ChessGame"""
+    return _game_moves(_create_game(fen, use_bitboards))
+
+
+def _game_divide(fen, move, depth, use_bitboards):
+    """Compte les nœuds sous un coup racine (backend ChessGame)"""
+    game = _create_game(fen, use_bitboards)
+    _game_play(game, move)
+    return perft_game(game, depth - 1)
+
+
+# --- Pilotage ---------------------------------------------------------------
+
+def _divide_task(args):
+    """Point d'entrée des processus de travail: (backend, fen, coup, profondeur, use_bitboards)"""
+    backend, fen, move, depth, use_bitboards = args
+    if backend == 'bitboard':
+        return _bitboard_divide(fen, move, depth)
+    return _game_divide(fen, move, depth, use_bitboards)
+
+
+def divide(fen, depth, backend='bitboard', workers=1, use_bitboards=False):
+    """
+    Renvoie la liste [(coup, nœuds)] pour chaque coup racine
+
+    Args:
+        workers: Nombre de processus; au-delà de 1 les coups racine sont répartis sur un Pool
+    """
+    if depth < 1:
+        raise ValueError("La profondeur doit être au moins 1")
+    if backend == 'bitboard':
+        root_moves = _bitboard_root_moves(fen)
+    else:
+        root_moves = _game_root_moves(fen, use_bitboards)
+
+    tasks = [(backend, fen, move, depth, use_bitboards) for move in root_moves]
+    if workers > 1 and len(tasks) > 1:
+        with Pool(processes=workers) as pool:
+            counts = pool.map(_divide_task, tasks, chunksize=1)
+    else:
+        counts = [_divide_task(task) for task in tasks]
+    return list(zip(root_moves, counts))
+
+
+def perft(fen, depth, backend='bitboard', workers=1, use_bitboards=False):
+    """Compte les nœuds à la profondeur donnée et renvoie (nœuds, secondes)"""
+    if depth == 0:
+        return 1, 0.0
+    if workers > 1:
+        start_time = time.perf_counter()
+        nodes = sum(count for _, count in divide(fen, depth, backend, workers, use_bitboards))
+    elif backend == 'bitboard':
+        position = BitboardPosition.from_fen(fen)
+        start_time = time.perf_counter()
+        nodes = perft_bitboard(position, depth)
+    else:
+        game = _create_game(fen, use_bitboards)
+        start_time = time.perf_counter()
+        nodes = perft_game(game, depth)
+    return nodes, time.perf_counter() - start_time
+
+
+def _format_rate(nodes, seconds):
+    return f"{nodes / seconds:,.0f} n/s" if seconds > 0 else "-"
+
+
+def main(argv=None):
+    """Point d'entrée en ligne de commande; renvoie 1 si un compte diffère de la référence"""
+    parser = argparse.ArgumentParser(description="Perft pour le générateur de coups du jeu d'échecs")
+    parser.add_argument('--position', choices=sorted(REFERENCE_POSITIONS), action='append',
+                        help="Position de référence (répétable, toutes par défaut)")
+    parser.add_argument('--fen', help="Position arbitraire au format FEN (pas de valeur attendue)")
+    parser.add_argument('--depth', type=int, default=3, help="Profondeur maximale (3 par défaut)")
+    parser.add_argument('--divide', action='store_true', help="Affiche le nombre de nœuds par coup racine")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Nombre de processus pour répartir les coups racine (0 = tous les cœurs)")
+    parser.add_argument('--backend', choices=BACKENDS, default='bitboard',
+                        help="bitboard: BitboardPosition directement; game: ChessGame.get_valid_moves/make_move/unmake_move")
+    parser.add_argument('--use-bitboards', action='store_true',
+                        help="Avec --backend game, active ChessGame(use_bitboards=True)")
+    args = parser.parse_args(argv)
+
+    workers = args.workers if args.workers > 0 else os.cpu_count() or 1
+    if args.fen:
+        positions = [('fen', args.fen, [])]
+    else:
+        names = args.position or list(REFERENCE_POSITIONS)
+        positions = [(name,) + REFERENCE_POSITIONS[name] for name in names]
+
+    failures = 0
+    total_nodes, total_time = 0, 0.0
+    for name, fen, expected in positions:
+        print(f"{name}: {fen}")
+        if args.divide:
+            start_time = time.perf_counter()
+            results = divide(fen, args.depth, args.backend, workers, args.use_bitboards)
+            seconds = time.perf_counter() - start_time
+            for move, count in sorted(results, key=lambda item: move_to_uci(*item[0])):
+                print(f"  {move_to_uci(*move)}: {count}")
+            nodes = sum(count for _, count in results)
+            depths = [(args.depth, nodes, seconds)]
+        else:
+            depths = []
+            for depth in range(1, args.depth + 1):
+                nodes, seconds = perft(fen, depth, args.backend, workers, args.use_bitboards)
+                depths.append((depth, nodes, seconds))
+
+        for depth, nodes, seconds in depths:
+            status = ''
+            if depth <= len(expected):
+                if nodes == expected[depth - 1]:
+                    status = 'OK'
+                else:
+                    status = f'ÉCHEC (attendu {expected[depth - 1]})'
+                    failures += 1
+            print(f"  profondeur {depth}: {nodes} nœuds en {seconds:.3f}s ({_format_rate(nodes, seconds)}) {status}")
+            total_nodes += nodes
+            total_time += seconds
+
+    print(f"Total: {total_nodes} nœuds en {total_time:.3f}s ({_format_rate(total_nodes, total_time)})")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,364 @@
+# protocol.py
+# Protocole binaire entre l'hôte et le client: chaque trame est préfixée par sa longueur
+# et son type, et chaque type de message a une disposition fixe (struct). Le décodage ne
+# fait que lire des entiers et du texte UTF-8 bornés: rien n'est exécuté, contrairement à pickle.
+import math
+import struct
+
+from bitboard import PIECE_CODES
+
+# Types de messages
+MOVE = 1
+GAME_STATE = 2
+CHAT = 3
+SNAPSHOT_REQUEST = 4  # Demande d'un état complet (après une désynchronisation)
+JOIN = 5  # Client -> serveur de parties: rejoindre une partie par son identifiant
+JOINED = 6  # Serveur -> client: couleur attribuée (aucune si la partie est complète)
+WATCH = 7  # Spectateur -> serveur de parties: suivre une partie par son identifiant
+PING = 8  # Mesure du délai aller-retour et du décalage d'horloge (échange de type NTP)
+PONG = 9
+
+MAX_PAYLOAD = 4096  # Les trames plus grandes sont refusées (pair malveillant ou désynchronisé)
+
+FRAME_HEADER = struct.Struct('!HB')  # Longueur de la charge utile, type
+# Case de départ, case d'arrivée, pièce de promotion, numéro du coup, hash Zobrist de la
+# position obtenue, temps restant du joueur qui vient de jouer puis de son adversaire,
+# instant d'envoi (time.monotonic() de l'expéditeur)
+MOVE_LAYOUT = struct.Struct('!BBBIQddd')
+PING_LAYOUT = struct.Struct('!d')  # Instant d'envoi du ping (horloge de l'expéditeur)
+# Instant d'envoi du ping (renvoyé tel quel), instants de réception et de réponse (horloge du pair)
+PONG_LAYOUT = struct.Struct('!ddd')
+# Numéro du dernier coup, plateau (64 octets), trait, droits de roque, prise en passant, échecs,
+# drapeaux d'horloge, couleur active, couleur tombée au temps, temps restants blancs/noirs, incrément
+STATE_LAYOUT = struct.Struct('!I64sBBBBBBBddd')
+
+PROMOTIONS = 'QRBN'
+SQUARE_CODES = ('--',) + tuple(PIECE_CODES)  # Octet d'une case -> code de pièce
+SQUARE_BYTES = {code: value for value, code in enumerate(SQUARE_CODES)}
+KING_BYTES = tuple((color, bytes((SQUARE_BYTES[color + 'K'],))) for color in 'wb')
+COLOR_BYTES = {None: 0, 'w': 1, 'b': 2}
+BYTE_COLORS = {value: color for color, value in COLOR_BYTES.items()}
+CASTLING_ORDER = (('w', 'kingside'), ('w', 'queenside'), ('b', 'kingside'), ('b', 'queenside'))
+NO_SQUARE = 255
+
+# Indicateurs de l'octet d'horloge
+CLOCK_PRESENT = 1
+CLOCK_RUNNING = 2
+CLOCK_GAME_OVER = 4
+
+
+class ProtocolError(ValueError):
+    """Trame invalide reçue d'un pair"""
+
+
+def _frame(message_type, payload):
+    if len(payload) > MAX_PAYLOAD:
+        raise ProtocolError(f"Message trop long ({len(payload)} octets)")
+    return FRAME_HEADER.pack(len(payload), message_type) + payload
+
+
+def _text(value):
+    """Encode un texte court: longueur sur un octet puis UTF-8"""
+    data = value.encode('utf-8')
+    if len(data) > 255:
+        raise ProtocolError("Texte trop long")
+    return bytes((len(data),)) + data
+
+
+def _read_text(payload, offset):
+    if offset >= len(payload):
+        raise ProtocolError("Texte tronqué")
+    length = payload[offset]
+    end = offset + 1 + length
+    if end > len(payload):
+        raise ProtocolError("Texte tronqué")
+    try:
+        return str(payload[offset + 1:end], 'utf-8'), end
+    except UnicodeDecodeError:
+        raise ProtocolError("Texte UTF-8 invalide") from None
+
+
+def _square(pos):
+    return NO_SQUARE if pos is None else pos[0] * 8 + pos[1]
+
+
+def _position(value):
+    if value == NO_SQUARE:
+        return None
+    if value >= 64:
+        raise ProtocolError(f"Case invalide: {value}")
+    return divmod(value, 8)
+
+
+# --- Encodage ----------------------------------------------------------------
+
+def encode_move(start, end, promotion='Q', sequence=0, checksum=0, time_left=0.0, opponent_time=0.0, sent_at=0.0):
+    """Trame d'un coup avec son numéro et le hash de la position obtenue (39 octets de charge utile)"""
+    return _frame(MOVE, MOVE_LAYOUT.pack(_square(start), _square(end), PROMOTIONS.index(promotion),
+                                         sequence, checksum, time_left, opponent_time, sent_at))
+
+
+def encode_ping(sent_at):
+    """Trame de ping horodatée par l'expéditeur"""
+    return _frame(PING, PING_LAYOUT.pack(sent_at))
+
+
+def encode_pong(ping_sent_at, received_at, replied_at):
+    """Trame de réponse à un ping, avec les instants de réception et de réponse du pair"""
+    return _frame(PONG, PONG_LAYOUT.pack(ping_sent_at, received_at, replied_at))
+
+
+def encode_snapshot_request():
+    """Trame de demande d'état complet"""
+    return _frame(SNAPSHOT_REQUEST, b'')
+
+
+def encode_chat(text):
+    """Trame d'un message de chat"""
+    return _frame(CHAT, text.encode('utf-8'))
+
+
+def encode_join(game_id):
+    """Trame de demande pour rejoindre une partie du serveur"""
+    return _frame(JOIN, _text(game_id))
+
+
+def encode_watch(game_id):
+    """Trame de demande pour suivre une partie du serveur en spectateur"""
+    return _frame(WATCH, _text(game_id))
+
+
+def encode_joined(game_id, color):
+    """Trame de réponse du serveur: couleur attribuée, ou None si la partie est complète"""
+    return _frame(JOINED, bytes((COLOR_BYTES[color],)) + _text(game_id))
+
+
+def encode_game_state(game, sequence=0):
+    """Trame de l'état complet d'une partie (plateau, trait, droits, horloge, statut) après sequence coups"""
+    board = bytes([SQUARE_BYTES[piece] for row in game.board for piece in row])
+    castling = 0
+    for bit, (color, side) in enumerate(CASTLING_ORDER):
+        if game.castling_rights[color][side]:
+            castling |= 1 << bit
+    in_check = (1 if game.in_check['w'] else 0) | (2 if game.in_check['b'] else 0)
+
+    clock = game.clock
+    clock_flags, active_color, timeout_color = 0, None, None
+    white_time = black_time = increment = 0.0
+    if clock:
+        clock_flags = CLOCK_PRESENT | (CLOCK_RUNNING if clock.running else 0) | (CLOCK_GAME_OVER if clock.game_over else 0)
+        active_color, timeout_color = clock.active_color, clock.timeout_color
+        # Temps restants à l'instant de l'envoi: le pair fait repartir l'horloge active à la réception
+        white_time, black_time, increment = clock.remaining('w'), clock.remaining('b'), clock.increment
+
+    payload = STATE_LAYOUT.pack(sequence, board, COLOR_BYTES[game.turn], castling, _square(game.en_passant_target),
+                                in_check, clock_flags, COLOR_BYTES[active_color], COLOR_BYTES[timeout_color],
+                                white_time, black_time, increment)
+    payload += _text(game.game_status) + _text(game.time_mode if clock else '')
+    return _frame(GAME_STATE, payload)
+
+
+# --- Décodage ----------------------------------------------------------------
+
+def _color(value, allow_none=True):
+    if value not in BYTE_COLORS or (value == 0 and not allow_none):
+        raise ProtocolError(f"Couleur invalide: {value}")
+    return BYTE_COLORS[value]
+
+
+def decode_move(payload):
+    if len(payload) != MOVE_LAYOUT.size:
+        raise ProtocolError("Taille de coup invalide")
+    start, end, promotion, sequence, checksum, time_left, opponent_time, sent_at = MOVE_LAYOUT.unpack(payload)
+    if start >= 64 or end >= 64 or promotion >= len(PROMOTIONS):
+        raise ProtocolError("Coup invalide")
+    if not (math.isfinite(time_left) and time_left >= 0 and math.isfinite(opponent_time) and opponent_time >= 0
+            and math.isfinite(sent_at)):
+        raise ProtocolError("Temps d'horloge invalide")
+    return {"type": "move", "start": divmod(start, 8), "end": divmod(end, 8), "promotion": PROMOTIONS[promotion],
+            "sequence": sequence, "checksum": checksum, "time_left": time_left, "opponent_time": opponent_time,
+            "sent_at": sent_at}
+
+
+def decode_ping(payload):
+    if len(payload) != PING_LAYOUT.size:
+        raise ProtocolError("Taille de ping invalide")
+    sent_at, = PING_LAYOUT.unpack(payload)
+    if not math.isfinite(sent_at):
+        raise ProtocolError("Horodatage invalide")
+    return {"type": "ping", "sent_at": sent_at}
+
+
+def decode_pong(payload):
+    if len(payload) != PONG_LAYOUT.size:
+        raise ProtocolError("Taille de pong invalide")
+    ping_sent_at, received_at, replied_at = PONG_LAYOUT.unpack(payload)
+    if not all(math.isfinite(value) for value in (ping_sent_at, received_at, replied_at)):
+        raise ProtocolError("Horodatage invalide")
+    return {"type": "pong", "ping_sent_at": ping_sent_at, "received_at": received_at, "replied_at": replied_at}
+
+
+def decode_game_state(payload):
+    if len(payload) < STATE_LAYOUT.size:
+        raise ProtocolError("État de partie tronqué")
+    (sequence, board_bytes, turn, castling, en_passant, in_check, clock_flags, active_color, timeout_color,
+     white_time, black_time, increment) = STATE_LAYOUT.unpack_from(payload)
+    try:
+        board = [[SQUARE_CODES[value] for value in board_bytes[row:row + 8]] for row in range(0, 64, 8)]
+    except IndexError:
+        raise ProtocolError("Pièce invalide sur le plateau") from None
+    king_positions = {}
+    for color, king in KING_BYTES:
+        sq = board_bytes.find(king)
+        if sq < 0 or board_bytes.find(king, sq + 1) >= 0:
+            raise ProtocolError("Il faut exactement un roi de chaque couleur")
+        king_positions[color] = divmod(sq, 8)
+    if not all(math.isfinite(value) and value >= 0 for value in (white_time, black_time, increment)):
+        raise ProtocolError("Temps d'horloge invalide")
+
+    game_status, offset = _read_text(payload, STATE_LAYOUT.size)
+    time_mode, offset = _read_text(payload, offset)
+    if offset != len(payload):
+        raise ProtocolError("Octets en trop dans l'état de partie")
+
+    castling_rights = {'w': {}, 'b': {}}
+    for bit, (color, side) in enumerate(CASTLING_ORDER):
+        castling_rights[color][side] = bool(castling & (1 << bit))
+
+    message = {
+        "type": "game_state",
+        "sequence": sequence,
+        "board": board,
+        "turn": _color(turn, allow_none=False),
+        "king_positions": king_positions,
+        "castling_rights": castling_rights,
+        "en_passant_target": _position(en_passant),
+        "in_check": {'w': bool(in_check & 1), 'b': bool(in_check & 2)},
+        "game_status": game_status,
+    }
+    if clock_flags & CLOCK_PRESENT:
+        message["clock"] = {
+            "time_left": {'w': white_time, 'b': black_time},
+            "active_color": _color(active_color),
+            "increment": increment,
+            "running": bool(clock_flags & CLOCK_RUNNING),
+            "game_over": bool(clock_flags & CLOCK_GAME_OVER),
+            "timeout_color": _color(timeout_color),
+        }
+        message["time_mode"] = time_mode
+    return message
+
+
+def decode_chat(payload):
+    try:
+        return {"type": "chat", "message": str(payload, 'utf-8')}
+    except UnicodeDecodeError:
+        raise ProtocolError("Texte UTF-8 invalide") from None
+
+
+def decode_snapshot_request(payload):
+    if len(payload):
+        raise ProtocolError("Demande d'état invalide")
+    return {"type": "snapshot_request"}
+
+
+def decode_join(payload):
+    game_id, offset = _read_text(payload, 0)
+    if offset != len(payload) or not game_id:
+        raise ProtocolError("Identifiant de partie invalide")
+    return {"type": "join", "game_id": game_id}
+
+
+def decode_watch(payload):
+    message = decode_join(payload)
+    message["type"] = "watch"
+    return message
+
+
+def decode_joined(payload):
+    if not len(payload):
+        raise ProtocolError("Réponse de connexion vide")
+    game_id, offset = _read_text(payload, 1)
+    if offset != len(payload):
+        raise ProtocolError("Octets en trop dans la réponse de connexion")
+    return {"type": "joined", "color": _color(payload[0]), "game_id": game_id}
+
+
+DECODERS = {MOVE: decode_move, GAME_STATE: decode_game_state, CHAT: decode_chat,
+            SNAPSHOT_REQUEST: decode_snapshot_request, JOIN: decode_join, JOINED: decode_joined,
+            WATCH: decode_watch, PING: decode_ping, PONG: decode_pong}
+
+
+def decode(message_type, payload):
+    """Décode la charge utile d'une trame en message (dictionnaire)"""
+    decoder = DECODERS.get(message_type)
+    if decoder is None:
+        raise ProtocolError(f"Type de message inconnu: {message_type}")
+    return decoder(payload)
+
+
+class FrameBuffer:
+    """
+    Tampon de réception réutilisé: les octets reçus sont écrits dans free_space()
+    puis feed() décode les trames complètes
+
+    Une lecture peut contenir plusieurs trames ou une trame partielle: les octets
+    restants sont gardés en début de tampon pour la lecture suivante.
+    """
+    def __init__(self, buffer_size=2 * (FRAME_HEADER.size + MAX_PAYLOAD)):
+        self.buffer = bytearray(buffer_size)
+        self.view = memoryview(self.buffer)
+        self.filled = 0
+
+    def free_space(self):
+        """Vue sur la partie libre du tampon (pour recv_into ou asyncio.BufferedProtocol)"""
+        return self.view[self.filled:]
+
+    def feed(self, received):
+        """
+        Prend en compte received octets écrits dans free_space() et renvoie les messages complets décodés
+
+        Raises:
+            ProtocolError: Trame invalide
+        """
+        self.filled += received
+        messages = []
+        offset = 0
+        view = self.view
+        while self.filled - offset >= FRAME_HEADER.size:
+            length, message_type = FRAME_HEADER.unpack_from(self.buffer, offset)
+            if length > MAX_PAYLOAD:
+                raise ProtocolError(f"Trame trop longue ({length} octets)")
+            end = offset + FRAME_HEADER.size + length
+            if end > self.filled:
+                break
+            messages.append(decode(message_type, view[offset + FRAME_HEADER.size:end]))
+            offset = end
+
+        # Garde la trame incomplète en début de tampon
+        if offset:
+            remaining = self.filled - offset
+            self.buffer[:remaining] = bytes(view[offset:self.filled])
+            self.filled = remaining
+        return messages
+
+
+class FrameReader:
+    """Lit les trames d'un socket bloquant avec recv_into dans un FrameBuffer"""
+    def __init__(self, sock):
+        self.sock = sock
+        self.frames = FrameBuffer()
+
+    def read(self):
+        """
+        Bloque jusqu'à la réception de données et renvoie les messages complets décodés
+
+        Raises:
+            ConnectionError: Le pair a fermé la connexion
+            ProtocolError: Trame invalide
+            socket.timeout: Aucun octet reçu avant le délai du socket
+        """
+        received = self.sock.recv_into(self.frames.free_space())
+        if not received:
+            raise ConnectionError("Connexion fermée par le pair")
+        return self.frames.feed(received)
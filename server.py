@@ -0,0 +1,516 @@
+# server.py
+# Serveur de parties asyncio: un processus héberge de nombreuses parties à deux joueurs.
+# Chaque partie est validée par un ChessGame sans interface; les clients utilisent
+# NetworkServerClient (network.py) ou ChessGame.join_game(host, port, game_id).
+# Les spectateurs (NetworkSpectator ou ChessGame.watch_game) reçoivent chaque coup relayé.
+# Avec --workers N, un répartiteur lit la demande de connexion et confie le socket au
+# processus chargé de la partie: les deux joueurs d'une partie sont toujours sur le même.
+#
+# Exemples:
+#   python server.py --port 5555
+#   python server.py --port 5555 --workers 4
+#   python load_test.py --games 5000        # lance ce serveur et mesure la latence de relais
+import argparse
+import asyncio
+import gc
+import multiprocessing
+import socket
+import sys
+import time
+import zlib
+
+import protocol
+from chess_game import ChessGame
+from network import ClockSync
+
+# Octets en attente d'envoi au-delà desquels un spectateur est considéré en retard: il ne
+# reçoit plus les coups et sera remis à jour par un état complet quand son socket se videra
+SPECTATOR_HIGH_WATER = 64 * 1024
+# Tampon d'envoi du noyau par spectateur (sans limite, il grandit jusqu'à plusieurs Mo et
+# masque un spectateur qui ne lit plus)
+SPECTATOR_SEND_BUFFER = 64 * 1024
+# Ramasse-miettes cyclique: une collecte de génération 2 parcourt tous les objets suivis et
+# bloquait la boucle plusieurs centaines de millisecondes avec des milliers de parties. Les
+# objets des parties (plateau, historique, annulations) vivent jusqu'à la fin de la partie et ne
+# forment pas de cycle: ils sont gelés (gc.freeze) dès leur création puis toutes les
+# GC_FREEZE_INTERVAL secondes, si bien que les collectes ne parcourent que les objets récents
+GC_THRESHOLDS = (700, 10, 100)  # Génération 2 plus rare que par défaut (10)
+GC_FREEZE_INTERVAL = 1.0
+
+
+class ServerGame:
+    """Une partie hébergée: l'arbitre ChessGame, les connexions des deux joueurs et les spectateurs"""
+    def __init__(self, game_id, time_mode):
+        self.game_id = game_id
+        self.game = ChessGame()
+        self.game.prefetch_moves = False
+        # Échéances des horloges sur la boucle du serveur: aucun coût par partie entre deux coups
+        self.game.timers = asyncio.get_running_loop()
+        self.game.setup_clock(time_mode)
+        self.game.clock.on_timeout = self.on_timeout
+        self.players = {'w': None, 'b': None}
+        self.spectators = set()
+        self.sequence = 0  # Nombre de coups joués
+        self.spectator_frame = None  # (séquence, trame) de l'état complet partagé par les spectateurs
+
+    def snapshot(self):
+        """Trame de l'état complet de la partie"""
+        return protocol.encode_game_state(self.game, self.sequence)
+
+    def spectator_snapshot(self):
+        """
+        État complet pour les spectateurs, encodé une fois par coup
+
+        Les horloges peuvent dater du dernier coup: le spectateur est resynchronisé au coup suivant.
+        """
+        if self.spectator_frame is None or self.spectator_frame[0] != self.sequence:
+            self.spectator_frame = (self.sequence, self.snapshot())
+        return self.spectator_frame[1]
+
+    def on_timeout(self, color):
+        """Drapeau tombé: l'arbitre termine la partie et envoie l'état final à tous"""
+        if self.game.game_status != 'Playing':
+            return
+        self.game.check_game_over()
+        for player in self.players.values():
+            if player:
+                player.send(self.snapshot())
+        self.broadcast(self.spectator_snapshot())
+
+    def close(self):
+        """
+        Annule l'échéance et casse le cycle partie -> horloge -> on_timeout: la partie, gelée
+        par gc.freeze(), est libérée par le comptage de références sans le ramasse-miettes
+        """
+        clock = self.game.clock
+        if clock:
+            clock.stop()
+            clock.on_timeout = None
+
+    def broadcast(self, frame):
+        """Écrit la même trame (déjà encodée) sur le socket de chaque spectateur"""
+        for spectator in self.spectators:
+            spectator.relay(frame)
+
+    def opponent(self, color):
+        return self.players['b' if color == 'w' else 'w']
+
+
+class PlayerConnection(asyncio.BufferedProtocol):
+    """Connexion d'un joueur, lue avec un FrameBuffer réutilisé"""
+    def __init__(self, server, received=b''):
+        """
+        Args:
+            server: GameServer auquel transmettre les messages
+            received: Octets déjà lus sur la connexion par le répartiteur (demande de connexion)
+        """
+        self.server = server
+        self.frames = protocol.FrameBuffer()
+        self.transport = None
+        self.server_game = None
+        self.color = None
+        self.received = received
+        self.spectating = False
+        self.writing_paused = False
+        self.behind = False  # Spectateur qui a manqué des coups
+        self.sync = ClockSync()  # Délai et décalage d'horloge du joueur, mesurés par les pings du serveur
+
+    def connection_made(self, transport):
+        self.transport = transport
+        sock = transport.get_extra_info('socket')
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if self.received:
+            # Rejoue les octets lus par le répartiteur avant toute nouvelle lecture
+            received, self.received = self.received, b''
+            self.frames.free_space()[:len(received)] = received
+            self.buffer_updated(len(received))
+
+    def get_buffer(self, sizehint):
+        return self.frames.free_space()
+
+    def buffer_updated(self, nbytes):
+        try:
+            messages = self.frames.feed(nbytes)
+        except protocol.ProtocolError as e:
+            print(f"Message invalide reçu, déconnexion: {e}")
+            self.transport.close()
+            return
+        arrived_at = time.monotonic()
+        for message in messages:
+            message["arrived_at"] = arrived_at  # Fin du temps de réflexion d'un coup reçu
+            self.server.handle_message(self, message)
+
+    def connection_lost(self, exc):
+        self.server.leave(self)
+
+    def pause_writing(self):
+        self.writing_paused = True
+
+    def resume_writing(self):
+        self.writing_paused = False
+        if self.behind and self.server_game is not None:
+            self.behind = False
+            self.server.catch_up(self)
+
+    def send(self, frame):
+        if not self.transport.is_closing():
+            self.transport.write(frame)
+
+    def send_ping(self):
+        """Mesure périodique du délai aller-retour du joueur (l'horloge du serveur fait foi)"""
+        now = time.monotonic()
+        if self.sync.ping_due(now):
+            self.send(protocol.encode_ping(now))
+
+    def relay(self, frame):
+        """Envoie un coup à un spectateur, ou le saute si son socket ne suit plus"""
+        if self.writing_paused:
+            self.behind = True
+        else:
+            self.send(frame)
+
+
+class GameServer:
+    """Parties en cours, indexées par identifiant; les joueurs sont appariés par identifiant de partie"""
+    def __init__(self, time_mode='Blitz'):
+        self.time_mode = time_mode
+        self.games = {}
+        self.moves = 0
+        self.rejected = 0
+        self.move_time = 0.0  # Temps cumulé de validation et de relais des coups (secondes)
+        self.catch_ups = 0  # États complets envoyés à des spectateurs en retard
+
+    def handle_message(self, player, message):
+        """Aiguille un message reçu d'un joueur"""
+        message_type = message["type"]
+        if message_type == "join":
+            self.join(player, message["game_id"])
+        elif message_type == "watch":
+            self.watch(player, message["game_id"])
+        elif message_type == "pong":
+            player.sync.add(message["ping_sent_at"], message["received_at"], message["replied_at"],
+                            message["arrived_at"])
+        elif player.server_game is None:
+            return
+        elif player.spectating:
+            # Un spectateur ne peut que redemander l'état de la partie
+            if message_type == "snapshot_request":
+                player.send(player.server_game.spectator_snapshot())
+        elif message_type == "move":
+            self.play(player, message)
+        elif message_type == "snapshot_request":
+            player.send(player.server_game.snapshot())
+        elif message_type == "chat":
+            opponent = player.server_game.opponent(player.color)
+            if opponent:
+                opponent.send(protocol.encode_chat(message["message"]))
+
+    def get_game(self, game_id):
+        """Renvoie la partie, créée au premier arrivant (joueur ou spectateur)"""
+        server_game = self.games.get(game_id)
+        if server_game is None:
+            server_game = self.games[game_id] = ServerGame(game_id, self.time_mode)
+        return server_game
+
+    def join(self, player, game_id):
+        """Place le joueur dans la partie et démarre l'horloge à deux"""
+        if player.server_game is not None:
+            return
+        server_game = self.get_game(game_id)
+        color = next((color for color in ('w', 'b') if server_game.players[color] is None), None)
+        player.send(protocol.encode_joined(game_id, color))
+        if color is None:
+            return
+        server_game.players[color] = player
+        player.server_game = server_game
+        player.color = color
+        player.send_ping()  # Premier échantillon avant le premier coup
+
+        # Partie et connexion vivent jusqu'à la fin de la partie: hors du ramasse-miettes sans
+        # attendre le gel périodique (des milliers d'arrivées par seconde au démarrage)
+        gc.freeze()
+
+        if server_game.opponent(color) is not None:
+            server_game.game.start_game()
+            for other in server_game.players.values():
+                other.send(server_game.snapshot())
+            server_game.spectator_frame = None
+            server_game.broadcast(server_game.spectator_snapshot())
+        else:
+            player.send(server_game.snapshot())
+
+    def play(self, player, message):
+        """Valide le coup avec l'arbitre, le relaie à l'adversaire, renvoie l'état complet en cas de désaccord"""
+        start_time = time.perf_counter()
+        server_game = player.server_game
+        game = server_game.game
+        start, end = message["start"], message["end"]
+        if (not game.game_started or game.game_status != 'Playing' or game.turn != player.color
+                or message["sequence"] != server_game.sequence + 1 or not game.is_legal_move(start, end)):
+            self.rejected += 1
+            player.send(server_game.snapshot())
+            return
+
+        # Temps de réflexion compté jusqu'à la réception de la trame, moins le temps de
+        # transmission mesuré par les pings (comme Network.apply_move chez l'hôte d'une partie directe)
+        clock = game.clock
+        elapsed = None
+        if clock and clock.running:
+            elapsed = max(0.0, message["arrived_at"] - clock.last_update
+                          - player.sync.transit_credit(message["sent_at"], message["arrived_at"]))
+        if not game.move_piece(start, end, message["promotion"], elapsed=elapsed):
+            # Coup arrivé après la chute du drapeau (réseau lu avant les échéances de la boucle):
+            # refusé, on_timeout a envoyé l'état final aux joueurs et aux spectateurs
+            self.rejected += 1
+            return
+        server_game.sequence += 1
+        checksum = game.get_position_hash()
+        if checksum != message["checksum"]:
+            # Le joueur n'a pas la même position que l'arbitre: il reçoit l'état complet
+            player.send(server_game.snapshot())
+
+        # L'horloge de l'arbitre fait foi pour les temps restants
+        time_left = clock.time_left[player.color] if clock else 0.0
+        opponent_time = clock.time_left[game.turn] if clock else 0.0
+        frame = protocol.encode_move(start, end, message["promotion"], server_game.sequence, checksum,
+                                     time_left, opponent_time, time.monotonic())
+        opponent = server_game.opponent(player.color)
+        if opponent:
+            opponent.send(frame)
+        server_game.broadcast(frame)
+        player.send_ping()
+        self.moves += 1
+        self.move_time += time.perf_counter() - start_time
+
+    def watch(self, player, game_id):
+        """Abonne un spectateur à la partie et lui envoie l'état courant"""
+        if player.server_game is not None:
+            return
+        server_game = self.get_game(game_id)
+        server_game.spectators.add(player)
+        player.server_game = server_game
+        player.spectating = True
+        # Au-delà de cette quantité en attente, pause_writing() met le spectateur en retard
+        player.transport.set_write_buffer_limits(high=SPECTATOR_HIGH_WATER)
+        gc.freeze()
+        sock = player.transport.get_extra_info('socket')
+        if sock is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SPECTATOR_SEND_BUFFER)
+        player.send(server_game.spectator_snapshot())
+
+    def catch_up(self, spectator):
+        """Remet à jour un spectateur en retard par l'état complet au lieu des coups manqués"""
+        self.catch_ups += 1
+        spectator.send(spectator.server_game.spectator_snapshot())
+
+    def leave(self, player):
+        """Retire le joueur ou le spectateur; la partie est supprimée quand tout le monde est parti"""
+        server_game = player.server_game
+        if server_game is None:
+            return
+        if player.spectating:
+            server_game.spectators.discard(player)
+        else:
+            server_game.players[player.color] = None
+        player.server_game = None
+        if not any(server_game.players.values()) and not server_game.spectators:
+            server_game.close()
+            del self.games[server_game.game_id]
+
+    async def report(self, interval, label=''):
+        """Affiche périodiquement le nombre de parties, le débit et le coût moyen d'un coup"""
+        last_moves = 0
+        while True:
+            await asyncio.sleep(interval)
+            moves = self.moves - last_moves
+            last_moves = self.moves
+            average = self.move_time / self.moves * 1e6 if self.moves else 0
+            spectators = sum(len(server_game.spectators) for server_game in self.games.values())
+            print(f"{label}{len(self.games)} parties, {spectators} spectateurs, {moves / interval:.0f} coups/s, "
+                  f"{average:.0f} µs par coup, {self.rejected} coups refusés, "
+                  f"{self.catch_ups} rattrapages", flush=True)
+
+
+def configure_gc():
+    """
+    Ramasse-miettes d'un processus de parties: objets du démarrage gelés, seuils relevés et
+    gel périodique des objets des parties (voir GC_THRESHOLDS)
+
+    Les objets gelés restent libérés par le comptage de références: une partie supprimée
+    (ServerGame.close casse son seul cycle) rend sa mémoire.
+    """
+    gc.collect()
+    gc.freeze()
+    gc.set_threshold(*GC_THRESHOLDS)
+    return asyncio.get_running_loop().create_task(_freeze_periodically())
+
+
+async def _freeze_periodically():
+    """Gèle les objets créés depuis le dernier passage (coups joués, parties arrivées)"""
+    while True:
+        await asyncio.sleep(GC_FREEZE_INTERVAL)
+        gc.freeze()
+
+
+async def serve(host='', port=5555, time_mode='Blitz', stats_interval=0):
+    """Lance le serveur de parties jusqu'à son annulation"""
+    configure_gc()
+    loop = asyncio.get_running_loop()
+    game_server = GameServer(time_mode)
+    server = await loop.create_server(lambda: PlayerConnection(game_server), host or None, port,
+                                      reuse_address=True, backlog=4096)
+    if stats_interval:
+        loop.create_task(game_server.report(stats_interval))
+    print(f"Serveur de parties démarré sur le port {port}...", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+# --- Répartition sur plusieurs processus -------------------------------------
+#
+# SO_REUSEPORT répartit les connexions selon les adresses, pas selon la partie: les deux
+# joueurs d'une partie arriveraient sur des processus différents. Le répartiteur lit donc
+# la demande de connexion (JOIN ou WATCH), choisit le processus à partir de l'identifiant de partie
+# et lui transmet le descripteur du socket (SCM_RIGHTS); les coups ne passent ensuite plus
+# par le répartiteur.
+
+HANDOFF_SIZE = 2 * (protocol.FRAME_HEADER.size + protocol.MAX_PAYLOAD)  # Octets lus avant transmission
+JOIN_TIMEOUT = 10.0  # Délai pour recevoir la demande de connexion (secondes)
+
+
+def worker_for(game_id, workers):
+    """Index du processus chargé d'une partie (indépendant du processus qui le calcule)"""
+    return zlib.crc32(game_id.encode('utf-8')) % workers
+
+
+async def _read_join(loop, sock):
+    """Lit la première trame d'une connexion; renvoie (message, octets lus) ou (None, b'')"""
+    data = b''
+    header = protocol.FRAME_HEADER
+    while True:
+        chunk = await loop.sock_recv(sock, HANDOFF_SIZE - len(data))
+        if not chunk:
+            return None, b''
+        data += chunk
+        if len(data) < header.size:
+            continue
+        length, message_type = header.unpack_from(data)
+        if length > protocol.MAX_PAYLOAD:
+            raise protocol.ProtocolError(f"Trame trop longue ({length} octets)")
+        if len(data) >= header.size + length:
+            return protocol.decode(message_type, memoryview(data)[header.size:header.size + length]), data
+
+
+async def _hand_off(loop, sock, channels):
+    """Confie une connexion au processus de sa partie, ou la ferme si elle ne commence pas par JOIN/WATCH"""
+    try:
+        message, data = await asyncio.wait_for(_read_join(loop, sock), JOIN_TIMEOUT)
+        if message is not None and message["type"] in ("join", "watch"):
+            channel = channels[worker_for(message["game_id"], len(channels))]
+            socket.send_fds(channel, [data], [sock.fileno()])
+    except (OSError, asyncio.TimeoutError, protocol.ProtocolError) as e:
+        print(f"Connexion refusée par le répartiteur: {e}")
+    finally:
+        sock.close()
+
+
+async def dispatch(host, port, channels):
+    """Accepte les connexions et les répartit entre les processus jusqu'à annulation"""
+    loop = asyncio.get_running_loop()
+    listener = socket.create_server((host, port), backlog=4096)
+    listener.setblocking(False)
+    print(f"Serveur de parties démarré sur le port {port} ({len(channels)} processus)...", flush=True)
+    with listener:
+        while True:
+            sock, _ = await loop.sock_accept(listener)
+            sock.setblocking(False)
+            loop.create_task(_hand_off(loop, sock, channels))
+
+
+async def serve_worker(channel, time_mode, stats_interval, label=''):
+    """Héberge les parties des connexions reçues du répartiteur, jusqu'à sa fermeture"""
+    configure_gc()
+    loop = asyncio.get_running_loop()
+    game_server = GameServer(time_mode)
+    closed = loop.create_future()
+
+    def receive():
+        try:
+            data, fds, _, _ = socket.recv_fds(channel, HANDOFF_SIZE, 1)
+        except BlockingIOError:
+            return
+        if not data and not fds:
+            # Répartiteur arrêté
+            loop.remove_reader(channel.fileno())
+            closed.set_result(None)
+            return
+        for fd in fds:
+            sock = socket.socket(fileno=fd)
+            loop.create_task(loop.connect_accepted_socket(
+                lambda received=data: PlayerConnection(game_server, received), sock))
+
+    channel.setblocking(False)
+    loop.add_reader(channel.fileno(), receive)
+    if stats_interval:
+        loop.create_task(game_server.report(stats_interval, label))
+    await closed
+
+
+def _run_worker(index, channel, inherited, time_mode, stats_interval):
+    """Point d'entrée d'un processus de parties"""
+    for other in inherited:
+        other.close()
+    try:
+        asyncio.run(serve_worker(channel, time_mode, stats_interval, f"[processus {index}] "))
+    except KeyboardInterrupt:
+        pass
+
+
+def serve_sharded(host='', port=5555, time_mode='Blitz', stats_interval=0, workers=2):
+    """Lance workers processus de parties et le répartiteur dans le processus courant"""
+    # SOCK_SEQPACKET garde chaque transmission (octets lus + descripteur) d'un seul tenant
+    pairs = [socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET) for _ in range(workers)]
+    channels = [parent for parent, _ in pairs]
+    processes = []
+    for index, (_, child) in enumerate(pairs):
+        process = multiprocessing.Process(target=_run_worker, daemon=True,
+                                          args=(index, child, channels, time_mode, stats_interval))
+        process.start()
+        processes.append(process)
+        child.close()
+    try:
+        asyncio.run(dispatch(host, port, channels))
+    finally:
+        for channel in channels:
+            channel.close()
+        for process in processes:
+            process.join(1)
+            if process.is_alive():
+                process.terminate()
+
+
+def main(argv=None):
+    """Point d'entrée en ligne de commande"""
+    parser = argparse.ArgumentParser(description="Serveur asyncio hébergeant de nombreuses parties")
+    parser.add_argument('--host', default='', help="Adresse d'écoute (toutes par défaut)")
+    parser.add_argument('--port', type=int, default=5555, help="Port d'écoute (5555 par défaut)")
+    parser.add_argument('--time-mode', default='Blitz', choices=['Blitz', 'Rapide', 'Standard'],
+                        help="Cadence des parties (Blitz par défaut)")
+    parser.add_argument('--stats-interval', type=float, default=0,
+                        help="Affiche les statistiques toutes les N secondes (0 = jamais)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Nombre de processus de parties (1 par défaut: pas de répartiteur)")
+    args = parser.parse_args(argv)
+    try:
+        if args.workers > 1:
+            serve_sharded(args.host, args.port, args.time_mode, args.stats_interval, args.workers)
+        else:
+            asyncio.run(serve(args.host, args.port, args.time_mode, args.stats_interval))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,77 @@
+# startup_benchmark.py
+# Temps jusqu'à la première image: lance main.py dans un nouveau processus (démarrage à froid
+# de Python, pygame, polices et images) et attend qu'il signale l'affichage du menu.
+#
+# Exemples:
+#   python startup_benchmark.py                   # 10 lancements avec le pack d'images existant
+#   python startup_benchmark.py --cold --runs 5   # pack supprimé avant chaque lancement
+#   python startup_benchmark.py --headless        # sans écran (pilotes SDL factices)
+import argparse
+import glob
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import assets
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def remove_packs():
+    """Supprime les packs d'images pour forcer leur régénération"""
+    for path in glob.glob(os.path.join(ROOT, assets.IMAGE_DIR, 'pieces-*.pack')):
+        os.remove(path)
+
+
+def time_to_first_frame(headless=False, timeout=30):
+    """Lance le jeu et renvoie le temps (secondes) jusqu'à sa première image, ou None"""
+    env = dict(os.environ)
+    if headless:
+        env['SDL_VIDEODRIVER'] = 'dummy'
+        env['SDL_AUDIODRIVER'] = 'dummy'
+    start_time = time.perf_counter()
+    process = subprocess.Popen([sys.executable, 'main.py', '--first-frame'], cwd=ROOT, env=env,
+                               stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    elapsed = None
+    for line in process.stdout:
+        if line.startswith('first-frame'):
+            elapsed = time.perf_counter() - start_time
+            break
+    try:
+        process.wait(timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+    return elapsed
+
+
+def main(argv=None):
+    """Point d'entrée en ligne de commande"""
+    parser = argparse.ArgumentParser(description="Mesure du temps jusqu'à la première image")
+    parser.add_argument('--runs', type=int, default=10, help="Nombre de lancements (10 par défaut)")
+    parser.add_argument('--cold', action='store_true',
+                        help="Supprime le pack d'images avant chaque lancement (premier démarrage)")
+    parser.add_argument('--headless', action='store_true', help="Utilise les pilotes SDL factices")
+    args = parser.parse_args(argv)
+
+    times = []
+    for run in range(args.runs):
+        if args.cold:
+            remove_packs()
+        elapsed = time_to_first_frame(args.headless)
+        if elapsed is None:
+            print(f"  lancement {run + 1}: pas de première image")
+            return 1
+        times.append(elapsed)
+        print(f"  lancement {run + 1}: {elapsed * 1000:.1f} ms")
+
+    print(f"Première image ({'pack régénéré' if args.cold else 'pack existant'}): "
+          f"min {min(times) * 1000:.1f} ms, médiane {statistics.median(times) * 1000:.1f} ms, "
+          f"max {max(times) * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,26 @@
+# text_cache.py
+# Surfaces de texte déjà rendues, partagées par le plateau, l'horloge et le chat: un texte
+# inchangé (chiffres de l'horloge, lignes du chat, statut, menus) est blitté sans être re-rendu.
+import collections
+
+MAX_SURFACES = 256
+
+_surfaces = collections.OrderedDict()  # (police, texte, couleur) -> surface, du plus ancien au plus récent
+
+
+def render(font, text, color):
+    """Renvoie le texte rendu (anticrénelé) par la police, depuis le cache si possible"""
+    key = (font, text, color)
+    surface = _surfaces.get(key)
+    if surface is not None:
+        _surfaces.move_to_end(key)
+        return surface
+    surface = _surfaces[key] = font.render(text, True, color)
+    if len(_surfaces) > MAX_SURFACES:
+        _surfaces.popitem(last=False)
+    return surface
+
+
+def clear():
+    """Vide le cache (polices recréées, changement de taille)"""
+    _surfaces.clear()
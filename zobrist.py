@@ -0,0 +1,48 @@
+# zobrist.py
+# Hachage Zobrist 64 bits des positions: plateau, trait, droits de roque et prise en passant.
+# Les clés sont tirées d'un générateur à graine fixe pour que l'hôte, le client et les
+# processus de calcul obtiennent le même hash pour la même position.
+import random
+
+_random = random.Random(0x5EEDC0DE)
+
+
+def _key():
+    return _random.getrandbits(64)
+
+
+PIECE_KEYS = {color + piece_type: [_key() for _ in range(64)]
+              for color in 'wb' for piece_type in ('p', 'N', 'B', 'R', 'Q', 'K')}
+SIDE_KEY = _key()  # Appliquée quand les noirs ont le trait
+CASTLING_KEYS = {color: {'kingside': _key(), 'queenside': _key()} for color in 'wb'}
+EN_PASSANT_KEYS = [_key() for _ in range(8)]  # Une clé par colonne
+
+
+def square_key(piece, row, col):
+    """Clé d'une pièce sur une case (0 pour une case vide)"""
+    if piece == '--':
+        return 0
+    return PIECE_KEYS[piece][row * 8 + col]
+
+
+def state_key(turn, castling_rights, en_passant_target):
+    """Clé combinée du trait, des droits de roque et de la case de prise en passant"""
+    key = SIDE_KEY if turn == 'b' else 0
+    for color, sides in castling_rights.items():
+        for side, allowed in sides.items():
+            if allowed:
+                key ^= CASTLING_KEYS[color][side]
+    if en_passant_target:
+        key ^= EN_PASSANT_KEYS[en_passant_target[1]]
+    return key
+
+
+def compute_hash(board, turn, castling_rights, en_passant_target):
+    """Calcule entièrement le hash d'une position au format ChessGame"""
+    key = state_key(turn, castling_rights, en_passant_target)
+    for row in range(8):
+        for col in range(8):
+            piece = board[row][col]
+            if piece != '--':
+                key ^= PIECE_KEYS[piece][row * 8 + col]
+    return key